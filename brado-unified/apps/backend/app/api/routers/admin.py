@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from datetime import date
+from itertools import chain
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from ...auth import require_admin_api_key
 from ...jobs.orchestrator import JobOrchestrator
@@ -36,8 +38,8 @@ def ingest_expenses(from_date: date = Query(default=date(2018, 1, 1), alias="fro
 
 
 @router.post("/reconcile/all")
-def reconcile_all() -> dict:
-    return JobOrchestrator().reconcile_all()
+def reconcile_all(incremental: bool = Query(default=False)) -> dict:
+    return JobOrchestrator().reconcile_all(incremental=incremental)
 
 
 @router.get("/reconcile/latest")
@@ -45,6 +47,11 @@ def reconcile_latest() -> dict:
     return JobOrchestrator().latest_reconcile_report()
 
 
+@router.get("/graph/stats")
+def graph_stats(refresh: bool = Query(default=False)) -> dict:
+    return JobOrchestrator().graph_stats(refresh=refresh)
+
+
 @router.get("/job_state")
 def job_state(limit: int = Query(default=20, ge=1, le=100), offset: int = Query(default=0, ge=0)) -> dict:
     return JobOrchestrator().list_job_state(limit=limit, offset=offset)
@@ -53,3 +60,26 @@ def job_state(limit: int = Query(default=20, ge=1, le=100), offset: int = Query(
 @router.post("/profiles/refresh")
 def refresh_profiles(limit_payloads: int = Query(default=500, ge=1, le=2000)) -> dict:
     return JobOrchestrator().refresh_political_profiles(limit_payloads=limit_payloads)
+
+
+@router.get("/batches/{batch_id}/proof/{raw_payload_id}")
+def batch_proof(batch_id: str, raw_payload_id: str) -> dict:
+    try:
+        return JobOrchestrator().batch_proof(batch_id, raw_payload_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/batches/{batch_id}/export")
+def export_batch(batch_id: str) -> StreamingResponse:
+    lines = JobOrchestrator().export_batch(batch_id)
+    try:
+        # The header line is produced before streaming starts so a missing batch is still a 404.
+        header = next(lines)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return StreamingResponse(
+        chain([header], lines),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="batch-{batch_id}.ndjson"'},
+    )
@@ -41,8 +41,61 @@ def ingest_expenses(from_value: str = typer.Option("2018-01-01", "--from")) -> N
 
 
 @app.command("reconcile:all")
-def reconcile_all() -> None:
-    typer.echo(JobOrchestrator().reconcile_all())
+def reconcile_all(
+    incremental: bool = typer.Option(False, "--incremental", help="Only re-check domains/years touched since the last report"),
+) -> None:
+    typer.echo(JobOrchestrator().reconcile_all(incremental=incremental))
+
+
+@app.command("graph:check-plans")
+def graph_check_plans() -> None:
+    result = JobOrchestrator().check_graph_plans()
+    typer.echo(result)
+    if result["status"] != "ok":
+        raise typer.Exit(code=1)
+
+
+@app.command("raw:archive")
+def raw_archive(
+    older_than_days: int = typer.Option(None, "--older-than-days", help="Default: RAW_ARCHIVE_AFTER_DAYS"),
+    limit: int = typer.Option(None, "--limit"),
+) -> None:
+    typer.echo(JobOrchestrator().archive_raw(older_than_days=older_than_days, limit=limit))
+
+
+@app.command("raw:rebuild-stats")
+def raw_rebuild_stats() -> None:
+    typer.echo(JobOrchestrator().rebuild_raw_stats())
+
+
+@app.command("raw:rebuild-merkle")
+def raw_rebuild_merkle() -> None:
+    result = JobOrchestrator().rebuild_merkle_nodes()
+    typer.echo(result)
+    if result["failed"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("verify:batches")
+def verify_batches(
+    since: str = typer.Option(None, "--since", help="Only batches finished on/after this date (YYYY-MM-DD)"),
+    workers: int = typer.Option(None, "--workers", help="Default: CPU count"),
+    threads: bool = typer.Option(False, "--threads", help="Use a thread pool instead of processes"),
+) -> None:
+    result = JobOrchestrator().verify_batches(since=_parse_date(since) if since else None, workers=workers, use_threads=threads)
+    typer.echo(result)
+    if result["status"] != "ok":
+        raise typer.Exit(code=1)
+
+
+@app.command("graph:replay-dlq")
+def graph_replay_dlq(limit: int = typer.Option(None, "--limit")) -> None:
+    typer.echo(JobOrchestrator().replay_graph_dlq(limit=limit))
+
+
+@app.command("graph:stats")
+def graph_stats(refresh: bool = typer.Option(False, "--refresh", help="Recompute even if the graph version is unchanged")) -> None:
+    typer.echo(JobOrchestrator().graph_stats(refresh=refresh))
 
 
 @app.command("test:smoke-real")
@@ -60,5 +113,15 @@ def interview_refresh_profiles(limit_payloads: int = typer.Option(500, "--limit-
     typer.echo(JobOrchestrator().refresh_political_profiles(limit_payloads=limit_payloads))
 
 
+@app.command("vcr:pack")
+def vcr_pack(
+    src: str = typer.Option(..., "--src", help="Directory with one <sha256>.json cassette per request"),
+    dest: str = typer.Option(..., "--dest", help="Directory that will hold responses.pack/responses.idx"),
+) -> None:
+    from .ingest.camara.vcr_pack import convert_directory_to_pack
+
+    typer.echo({"packed": convert_directory_to_pack(src, dest), "dest": dest})
+
+
 if __name__ == "__main__":
     app()
@@ -15,6 +15,15 @@ class Settings:
     neo4j_uri: str
     neo4j_user: str
     neo4j_password: str
+    neo4j_write_batch_size: int
+    neo4j_max_pool_size: int
+    neo4j_max_connection_lifetime_seconds: float
+    neo4j_connection_acquisition_timeout_seconds: float
+    graph_write_queue_size: int
+    graph_write_max_retries: int
+    graph_write_backoff_seconds: float
+    graph_raw_refs_keep: int
+    reconcile_max_workers: int
 
     admin_api_key: str
     admin_rate_limit_per_minute: int
@@ -25,14 +34,30 @@ class Settings:
     camara_max_rps: float
     camara_max_concurrency: int
     camara_max_retries: int
+    camara_http2: bool
+    camara_aimd_min_rps: float
+    camara_aimd_decrease_factor: float
+    camara_aimd_increase_rps: float
+    camara_aimd_cooldown_seconds: float
+    camara_cache_ttls: tuple[tuple[str, float], ...]
+    camara_cache_max_entries: int
+    ingest_pipeline_fetch_workers: int
+    ingest_pipeline_graph_workers: int
+    ingest_pipeline_queue_size: int
+    ingest_checkpoint_every: int
     camara_proposicoes_static_url_template: str
     camara_votacoes_static_url_template: str
     camara_votacoes_votos_static_url_template: str
     camara_expenses_dataset_url_template: str
     camara_expenses_dataset_separator: str
+    camara_dataset_cache_dir: str
+    camara_dataset_revalidate_seconds: int
 
     vcr_mode: str
     vcr_dir: str
+    vcr_backend: str
+    raw_archive_dir: str
+    raw_archive_after_days: int
 
     anchor_provider: str
     interview_target_questions: int
@@ -45,6 +70,16 @@ class Settings:
     api_v1_rate_limit_per_minute: int
 
 
+def _parse_ttls(raw: str) -> tuple[tuple[str, float], ...]:
+    ttls: list[tuple[str, float]] = []
+    for item in raw.split(","):
+        pattern, sep, ttl = item.strip().rpartition("=")
+        if not sep or not pattern.strip():
+            continue
+        ttls.append((pattern.strip(), float(ttl)))
+    return tuple(ttls)
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings(
@@ -55,6 +90,15 @@ def get_settings() -> Settings:
         neo4j_uri=os.getenv("NEO4J_URI", "bolt://neo4j:7687"),
         neo4j_user=os.getenv("NEO4J_USER", "neo4j"),
         neo4j_password=os.getenv("NEO4J_PASSWORD", "neo4j_password"),
+        neo4j_write_batch_size=int(os.getenv("NEO4J_WRITE_BATCH_SIZE", "500")),
+        neo4j_max_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+        neo4j_max_connection_lifetime_seconds=float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME_SECONDS", "3600")),
+        neo4j_connection_acquisition_timeout_seconds=float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS", "60")),
+        graph_write_queue_size=int(os.getenv("GRAPH_WRITE_QUEUE_SIZE", "64")),
+        graph_write_max_retries=int(os.getenv("GRAPH_WRITE_MAX_RETRIES", "5")),
+        graph_write_backoff_seconds=float(os.getenv("GRAPH_WRITE_BACKOFF_SECONDS", "0.5")),
+        graph_raw_refs_keep=int(os.getenv("GRAPH_RAW_REFS_KEEP", "8")),
+        reconcile_max_workers=int(os.getenv("RECONCILE_MAX_WORKERS", "4")),
         admin_api_key=os.getenv("ADMIN_API_KEY", "change-me"),
         admin_rate_limit_per_minute=int(os.getenv("ADMIN_RATE_LIMIT_PER_MINUTE", "120")),
         camara_base_url=os.getenv("CAMARA_BASE_URL", "https://dadosabertos.camara.leg.br/api/v2"),
@@ -63,6 +107,17 @@ def get_settings() -> Settings:
         camara_max_rps=float(os.getenv("CAMARA_MAX_RPS", "3")),
         camara_max_concurrency=int(os.getenv("CAMARA_MAX_CONCURRENCY", "4")),
         camara_max_retries=int(os.getenv("CAMARA_MAX_RETRIES", "4")),
+        camara_http2=os.getenv("CAMARA_HTTP2", "true").lower() in {"1", "true", "yes", "on"},
+        camara_aimd_min_rps=float(os.getenv("CAMARA_AIMD_MIN_RPS", "0.2")),
+        camara_aimd_decrease_factor=float(os.getenv("CAMARA_AIMD_DECREASE_FACTOR", "0.5")),
+        camara_aimd_increase_rps=float(os.getenv("CAMARA_AIMD_INCREASE_RPS", "0.05")),
+        camara_aimd_cooldown_seconds=float(os.getenv("CAMARA_AIMD_COOLDOWN_SECONDS", "1.0")),
+        camara_cache_ttls=_parse_ttls(os.getenv("CAMARA_CACHE_TTLS", "")),
+        camara_cache_max_entries=int(os.getenv("CAMARA_CACHE_MAX_ENTRIES", "1024")),
+        ingest_pipeline_fetch_workers=int(os.getenv("INGEST_PIPELINE_FETCH_WORKERS", "2")),
+        ingest_pipeline_graph_workers=int(os.getenv("INGEST_PIPELINE_GRAPH_WORKERS", "4")),
+        ingest_pipeline_queue_size=int(os.getenv("INGEST_PIPELINE_QUEUE_SIZE", "256")),
+        ingest_checkpoint_every=int(os.getenv("INGEST_CHECKPOINT_EVERY", "0")),
         camara_proposicoes_static_url_template=os.getenv(
             "CAMARA_PROPOSICOES_STATIC_URL_TEMPLATE",
             "https://dadosabertos.camara.leg.br/arquivos/proposicoes/json/proposicoes-{year}.json",
@@ -77,17 +132,18 @@ def get_settings() -> Settings:
         ),
         camara_expenses_dataset_url_template=os.getenv("CAMARA_EXPENSES_DATASET_URL_TEMPLATE", ""),
         camara_expenses_dataset_separator=os.getenv("CAMARA_EXPENSES_DATASET_SEPARATOR", ","),
+        camara_dataset_cache_dir=os.getenv("CAMARA_DATASET_CACHE_DIR", "data/dataset-cache"),
+        camara_dataset_revalidate_seconds=int(os.getenv("CAMARA_DATASET_REVALIDATE_SECONDS", "3600")),
         vcr_mode=os.getenv("VCR_MODE", "off"),
         vcr_dir=os.getenv("VCR_DIR", "backend/tests/fixtures/vcr"),
+        vcr_backend=os.getenv("VCR_BACKEND", "dir").lower(),
+        raw_archive_dir=os.getenv("RAW_ARCHIVE_DIR", "data/raw-archive"),
+        raw_archive_after_days=int(os.getenv("RAW_ARCHIVE_AFTER_DAYS", "180")),
         anchor_provider=os.getenv("ANCHOR_PROVIDER", "composite"),
         interview_target_questions=int(os.getenv("INTERVIEW_TARGET_QUESTIONS", "40")),
         interview_min_questions_for_finish=int(os.getenv("INTERVIEW_MIN_QUESTIONS_FOR_FINISH", "20")),
         interview_anonymization_salt=os.getenv("INTERVIEW_ANONYMIZATION_SALT", "replace-me"),
-        cors_allow_origins=tuple(
-            origin.strip()
-            for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",")
-            if origin.strip()
-        ),
+        cors_allow_origins=tuple(origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if origin.strip()),
         api_v1_auth_required=os.getenv("API_V1_AUTH_REQUIRED", "false").lower() in {"1", "true", "yes", "on"},
         api_v1_jwt_secret=os.getenv("API_V1_JWT_SECRET", "change-me-v1-token-secret"),
         api_v1_jwt_ttl_seconds=int(os.getenv("API_V1_JWT_TTL_SECONDS", "3600")),
@@ -14,6 +14,19 @@ class MetricsRegistry:
     request_latency_bucket: dict[tuple[str, str, float], int] = field(default_factory=lambda: defaultdict(int))
     request_latency_count: dict[tuple[str, str], int] = field(default_factory=lambda: defaultdict(int))
     request_latency_sum: dict[tuple[str, str], float] = field(default_factory=lambda: defaultdict(float))
+    camara_effective_rps: dict[tuple[str, int], float] = field(default_factory=dict)
+    camara_throttle_events_total: dict[tuple[str, int], int] = field(default_factory=lambda: defaultdict(int))
+    camara_dedup_total: dict[tuple[str, str], int] = field(default_factory=lambda: defaultdict(int))
+    ingest_stage_items_total: dict[tuple[str, str], int] = field(default_factory=lambda: defaultdict(int))
+    ingest_stage_busy_seconds_total: dict[tuple[str, str], float] = field(default_factory=lambda: defaultdict(float))
+    ingest_stage_queue_depth: dict[tuple[str, str], int] = field(default_factory=dict)
+    graph_write_queue_depth: int = 0
+    graph_write_retries_total: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    graph_dead_letters_total: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    neo4j_drivers_created_total: int = 0
+    neo4j_sessions_total: int = 0
+    neo4j_sessions_active: int = 0
+    neo4j_pool_connections: dict[str, int] = field(default_factory=dict)
     lock: Lock = field(default_factory=Lock)
 
     def observe_request(self, *, method: str, route: str, status: int, latency_seconds: float) -> None:
@@ -32,6 +45,60 @@ class MetricsRegistry:
                     self.request_latency_bucket[(method, route, bucket)] += 1
             self.request_latency_bucket[(method, route, float("inf"))] += 1
 
+    def set_camara_effective_rps(self, client: str, rps: float, *, source: int = 0) -> None:
+        """Rate of one bucket (``source``); the exported gauge is the sum over the live buckets of ``client``."""
+        with self.lock:
+            self.camara_effective_rps[(client, source)] = rps
+
+    def forget_camara_effective_rps(self, client: str, source: int = 0) -> None:
+        with self.lock:
+            self.camara_effective_rps.pop((client, source), None)
+
+    def observe_camara_throttle(self, client: str, status: int) -> None:
+        with self.lock:
+            self.camara_throttle_events_total[(client, status)] += 1
+
+    def observe_camara_dedup(self, client: str, kind: str) -> None:
+        with self.lock:
+            self.camara_dedup_total[(client, kind)] += 1
+
+    def observe_ingest_stage(self, pipeline: str, stage: str, seconds: float) -> None:
+        with self.lock:
+            self.ingest_stage_items_total[(pipeline, stage)] += 1
+            self.ingest_stage_busy_seconds_total[(pipeline, stage)] += seconds
+
+    def set_ingest_queue_depth(self, pipeline: str, stage: str, depth: int) -> None:
+        with self.lock:
+            self.ingest_stage_queue_depth[(pipeline, stage)] = depth
+
+    def set_graph_write_queue_depth(self, depth: int) -> None:
+        with self.lock:
+            self.graph_write_queue_depth = depth
+
+    def observe_graph_write_retry(self, operation: str) -> None:
+        with self.lock:
+            self.graph_write_retries_total[operation] += 1
+
+    def observe_graph_dead_letters(self, operation: str, count: int) -> None:
+        with self.lock:
+            self.graph_dead_letters_total[operation] += count
+
+    def observe_neo4j_driver_created(self) -> None:
+        with self.lock:
+            self.neo4j_drivers_created_total += 1
+
+    def observe_neo4j_session(self, *, opened: bool) -> None:
+        with self.lock:
+            if opened:
+                self.neo4j_sessions_total += 1
+                self.neo4j_sessions_active += 1
+            else:
+                self.neo4j_sessions_active -= 1
+
+    def set_neo4j_pool_connections(self, in_use: int, idle: int) -> None:
+        with self.lock:
+            self.neo4j_pool_connections = {"in_use": in_use, "idle": idle}
+
     def render_prometheus_text(self) -> str:
         with self.lock:
             lines = [
@@ -39,9 +106,7 @@ class MetricsRegistry:
                 "# TYPE brado_http_requests_total counter",
             ]
             for (method, route, status_class), value in sorted(self.request_total.items()):
-                lines.append(
-                    f'brado_http_requests_total{{method="{method}",route="{route}",status_class="{status_class}"}} {value}'
-                )
+                lines.append(f'brado_http_requests_total{{method="{method}",route="{route}",status_class="{status_class}"}} {value}')
 
             lines.extend(
                 [
@@ -67,17 +132,113 @@ class MetricsRegistry:
                     )
                 lines.append(
                     f'brado_http_request_latency_seconds_bucket{{method="{method}",route="{route}",le="+Inf"}} '
-                    f'{self.request_latency_bucket[(method, route, float("inf"))]}'
+                    f"{self.request_latency_bucket[(method, route, float('inf'))]}"
                 )
                 lines.append(
                     f'brado_http_request_latency_seconds_sum{{method="{method}",route="{route}"}} '
-                    f'{self.request_latency_sum[(method, route)]}'
+                    f"{self.request_latency_sum[(method, route)]}"
                 )
                 lines.append(
                     f'brado_http_request_latency_seconds_count{{method="{method}",route="{route}"}} '
-                    f'{self.request_latency_count[(method, route)]}'
+                    f"{self.request_latency_count[(method, route)]}"
                 )
 
+            lines.extend(
+                [
+                    "# HELP brado_camara_effective_rps Current adaptive request rate towards the Camara API",
+                    "# TYPE brado_camara_effective_rps gauge",
+                ]
+            )
+            effective_rps: dict[str, float] = defaultdict(float)
+            for (client, _source), value in self.camara_effective_rps.items():
+                effective_rps[client] += value
+            for client, value in sorted(effective_rps.items()):
+                lines.append(f'brado_camara_effective_rps{{client="{client}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_camara_throttle_events_total Throttling responses (429/503) received from the Camara API",
+                    "# TYPE brado_camara_throttle_events_total counter",
+                ]
+            )
+            for (client, status), value in sorted(self.camara_throttle_events_total.items()):
+                lines.append(f'brado_camara_throttle_events_total{{client="{client}",status="{status}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_camara_dedup_total Camara GETs served without a new upstream call (cache or single-flight)",
+                    "# TYPE brado_camara_dedup_total counter",
+                ]
+            )
+            for (client, kind), value in sorted(self.camara_dedup_total.items()):
+                lines.append(f'brado_camara_dedup_total{{client="{client}",kind="{kind}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_ingest_stage_items_total Items processed by each ingestion pipeline stage",
+                    "# TYPE brado_ingest_stage_items_total counter",
+                ]
+            )
+            for (pipeline, stage), value in sorted(self.ingest_stage_items_total.items()):
+                lines.append(f'brado_ingest_stage_items_total{{pipeline="{pipeline}",stage="{stage}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_ingest_stage_busy_seconds_total Time spent inside each ingestion pipeline stage",
+                    "# TYPE brado_ingest_stage_busy_seconds_total counter",
+                ]
+            )
+            for (pipeline, stage), value in sorted(self.ingest_stage_busy_seconds_total.items()):
+                lines.append(f'brado_ingest_stage_busy_seconds_total{{pipeline="{pipeline}",stage="{stage}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_ingest_stage_queue_depth Items waiting in front of each ingestion pipeline stage",
+                    "# TYPE brado_ingest_stage_queue_depth gauge",
+                ]
+            )
+            for (pipeline, stage), value in sorted(self.ingest_stage_queue_depth.items()):
+                lines.append(f'brado_ingest_stage_queue_depth{{pipeline="{pipeline}",stage="{stage}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_graph_write_queue_depth Graph write batches waiting for the write-behind thread",
+                    "# TYPE brado_graph_write_queue_depth gauge",
+                    f"brado_graph_write_queue_depth {self.graph_write_queue_depth}",
+                    "# HELP brado_graph_write_retries_total Graph write batches retried after a transient Neo4j error",
+                    "# TYPE brado_graph_write_retries_total counter",
+                ]
+            )
+            for operation, value in sorted(self.graph_write_retries_total.items()):
+                lines.append(f'brado_graph_write_retries_total{{operation="{operation}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_graph_dead_letters_total Graph records parked in graph_dead_letters",
+                    "# TYPE brado_graph_dead_letters_total counter",
+                ]
+            )
+            for operation, value in sorted(self.graph_dead_letters_total.items()):
+                lines.append(f'brado_graph_dead_letters_total{{operation="{operation}"}} {value}')
+
+            lines.extend(
+                [
+                    "# HELP brado_neo4j_drivers_created_total Neo4j drivers created by this process (expected: 1)",
+                    "# TYPE brado_neo4j_drivers_created_total counter",
+                    f"brado_neo4j_drivers_created_total {self.neo4j_drivers_created_total}",
+                    "# HELP brado_neo4j_sessions_total Neo4j sessions opened on the shared driver",
+                    "# TYPE brado_neo4j_sessions_total counter",
+                    f"brado_neo4j_sessions_total {self.neo4j_sessions_total}",
+                    "# HELP brado_neo4j_sessions_active Neo4j sessions currently open",
+                    "# TYPE brado_neo4j_sessions_active gauge",
+                    f"brado_neo4j_sessions_active {self.neo4j_sessions_active}",
+                    "# HELP brado_neo4j_pool_connections Connections in the shared Neo4j pool",
+                    "# TYPE brado_neo4j_pool_connections gauge",
+                ]
+            )
+            for state, value in sorted(self.neo4j_pool_connections.items()):
+                lines.append(f'brado_neo4j_pool_connections{{state="{state}"}} {value}')
+
         return "\n".join(lines) + "\n"
 
 
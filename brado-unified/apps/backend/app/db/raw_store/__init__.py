@@ -1,21 +1,69 @@
 from __future__ import annotations
 
 import json
-from datetime import date, datetime, timezone
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import UTC, date, datetime
+from functools import partial
 from typing import Any
 from urllib.parse import urlencode
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import joinedload
 
-from ..sql.models import Anchor, BatchItem, IngestionBatch, RawPayload
-from ...proof.hashing import sha256_json_canonical
-from ...proof.merkle import build_merkle
 from ...proof.anchor import anchor_root
+from ...proof.hashing import sha256_json_canonical
+from ...proof.merkle import MerkleFrontier
+from ..sql.models import Anchor, BatchItem, HttpValidator, IngestionBatch, MerkleNode, RawBlob, RawPayload
+from .archive import RawArchive, archive_cold_blobs, read_archived_body
+from .proofs import inclusion_proof, iter_batch_export, rebuild_merkle_nodes, rebuild_missing_merkle_nodes
+from .stats import StatKey, add_stat, expected_items, rebuild_payload_stats, write_stats
+from .validators import StoredValidators, ValidatorStore
+from .verify import verify_batches
+
+__all__ = [
+    "RawArchive",
+    "RawStore",
+    "StoredValidators",
+    "ValidatorStore",
+    "archive_cold_blobs",
+    "expected_items",
+    "inclusion_proof",
+    "iter_batch_export",
+    "read_archived_body",
+    "rebuild_merkle_nodes",
+    "rebuild_missing_merkle_nodes",
+    "rebuild_payload_stats",
+    "verify_batches",
+]
+
+
+# Pending ORM rows are flushed in chunks rather than once per payload.
+_FLUSH_EVERY = 500
+# Bound on blob hashes remembered as already stored (only saves a no-op upsert).
+_KNOWN_BLOBS_MAX = 200_000
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
 
 
 class RawStore:
-    def __init__(self, session):
+    def __init__(self, session, validators: ValidatorStore | None = None):
         self.session = session
+        self.validators = validators
+        # Per-batch leaf counters and member raw ids, seeded once per batch instead of counted per insert.
+        self._next_leaf: dict[str, int] = {}
+        self._members: dict[str, set[str]] = {}
+        self._frontiers: dict[str, MerkleFrontier] = {}
+        self._node_rows: list[dict[str, Any]] = []
+        self._unflushed = 0
+        self._validator_rows: dict[str, dict[str, Any]] = {}
+        # While validators are held (see ``hold_validators``) captured rows wait here instead of being written.
+        self._held_validators: list[dict[str, Any]] | None = None
+        self._known_blobs: set[str] = set()
+        # Per-(domain, year, endpoint, status) tallies, written with the payload rows they describe.
+        self._stats: dict[StatKey, list[int]] = {}
 
     def start_batch(self, source: str, batch_type: str, range_start: date | None = None, range_end: date | None = None) -> IngestionBatch:
         batch = IngestionBatch(
@@ -28,6 +76,9 @@ class RawStore:
         )
         self.session.add(batch)
         self.session.flush()
+        self._next_leaf[batch.id] = 0
+        self._members[batch.id] = set()
+        self._frontiers[batch.id] = MerkleFrontier()
         return batch
 
     def add_payload(
@@ -41,61 +92,317 @@ class RawStore:
         body_json: Any,
         source: str = "camara",
     ) -> RawPayload:
-        sha = sha256_json_canonical(body_json)
-        query = urlencode(sorted(params.items())) if params else ""
-        url = endpoint if not query else f"{endpoint}?{query}"
+        validator_key = self.validators.key(endpoint, params) if self.validators is not None else None
+        if http_status == 304 and validator_key is not None:
+            previous = self._reference_previous(batch, validator_key)
+            if previous is not None:
+                return previous
 
-        raw = RawPayload(
-            source=source,
-            endpoint=endpoint,
-            params_json=params,
-            primary_key_value=primary_key,
-            fetched_at=datetime.now(timezone.utc),
-            http_status=http_status,
-            url=url,
-            sha256=sha,
-            body_json=body_json,
-            batch_id=batch.id,
-        )
+        row, item = self._rows(batch, endpoint, params, primary_key, http_status, body_json, source)
+        self._ensure_blobs({row["sha256"]: body_json})
+        raw = RawPayload(**row)
         self.session.add(raw)
+        self.session.add(BatchItem(**item))
+        self._pending(1)
+        if validator_key is not None:
+            self._remember_validators(validator_key, endpoint, raw.id, http_status)
+        return raw
+
+    def add_payloads(self, *, batch: IngestionBatch, payloads: Sequence[dict[str, Any]], source: str = "camara") -> list[str]:
+        """Insert many payloads (dicts with ``add_payload``'s keyword arguments) with one executemany per table.
+
+        Returns the raw payload id for each input, in order; 304s resolve to the
+        payload they reference, like ``add_payload``.
+        """
         self.session.flush()
+        raw_rows: list[dict[str, Any]] = []
+        item_rows: list[dict[str, Any]] = []
+        blobs: dict[str, Any] = {}
+        raw_ids: list[str] = []
+        for payload in payloads:
+            endpoint = payload["endpoint"]
+            params = payload.get("params") or {}
+            http_status = int(payload["http_status"])
+            validator_key = self.validators.key(endpoint, params) if self.validators is not None else None
+            if http_status == 304 and validator_key is not None:
+                previous = self._reference_previous(batch, validator_key)
+                if previous is not None:
+                    raw_ids.append(previous.id)
+                    continue
+            row, item = self._rows(
+                batch,
+                endpoint,
+                params,
+                payload.get("primary_key"),
+                http_status,
+                payload["body_json"],
+                payload.get("source", source),
+            )
+            raw_rows.append(row)
+            item_rows.append(item)
+            blobs[row["sha256"]] = payload["body_json"]
+            raw_ids.append(row["id"])
+            if validator_key is not None:
+                self._remember_validators(validator_key, endpoint, row["id"], http_status)
 
-        next_leaf = self.session.scalar(
-            select(func.count(BatchItem.id)).where(BatchItem.batch_id == batch.id)
-        )
-        item = BatchItem(
-            batch_id=batch.id,
-            raw_payload_id=raw.id,
-            item_sha256=sha,
-            leaf_index=int(next_leaf or 0),
-        )
-        self.session.add(item)
-        batch.item_count = int(batch.item_count or 0) + 1
+        if raw_rows:
+            self._ensure_blobs(blobs)
+            self.session.execute(insert(RawPayload), raw_rows)
+            self.session.execute(insert(BatchItem), item_rows)
+        self._write_validators()
+        self._write_nodes()
+        write_stats(self.session, self._stats)
+        return raw_ids
+
+    def get_body(self, raw_payload_id: str) -> Any | None:
+        """Body of a raw payload, read from the hot table or, once archived, from the cold tier."""
+        raw = self.session.get(RawPayload, raw_payload_id, options=[joinedload(RawPayload.blob)])
+        return raw.body_json if raw is not None else None
+
+    def flush(self) -> None:
         self.session.flush()
-        return raw
+        self._unflushed = 0
+        self._write_validators()
+        self._write_nodes()
+        write_stats(self.session, self._stats)
 
-    def finish_batch(self, batch: IngestionBatch, metadata: dict[str, Any] | None = None) -> IngestionBatch:
-        leaves = [
-            row[0]
-            for row in self.session.execute(
+    def _pending(self, count: int) -> None:
+        self._unflushed += count
+        if self._unflushed >= _FLUSH_EVERY:
+            self.flush()
+
+    def _rows(
+        self,
+        batch: IngestionBatch,
+        endpoint: str,
+        params: dict[str, Any],
+        primary_key: str | None,
+        http_status: int,
+        body_json: Any,
+        source: str,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        sha = sha256_json_canonical(body_json)
+        query = urlencode(sorted(params.items())) if params else ""
+        raw_id = _new_id()
+        row = {
+            "id": raw_id,
+            "source": source,
+            "endpoint": endpoint,
+            "params_json": params,
+            "primary_key_value": primary_key,
+            "fetched_at": datetime.now(UTC),
+            "http_status": http_status,
+            "url": endpoint if not query else f"{endpoint}?{query}",
+            "sha256": sha,
+            "batch_id": batch.id,
+        }
+        item = {
+            "id": _new_id(),
+            "batch_id": batch.id,
+            "raw_payload_id": raw_id,
+            "item_sha256": sha,
+            "leaf_index": self._take_leaf(batch, sha),
+        }
+        self._batch_members(batch).add(raw_id)
+        add_stat(self._stats, endpoint, params, http_status, body_json)
+        return row, item
+
+    def _take_leaf(self, batch: IngestionBatch, item_sha256: str) -> int:
+        frontier = self._frontier(batch)
+        leaf = self._next_leaf[batch.id]
+        self._next_leaf[batch.id] = leaf + 1
+        batch.item_count = int(batch.item_count or 0) + 1
+        frontier.add(item_sha256, partial(self._remember_node, batch.id))
+        batch.merkle_frontier = frontier.to_bytes()
+        return leaf
+
+    def _frontier(self, batch: IngestionBatch) -> MerkleFrontier:
+        frontier = self._frontiers.get(batch.id)
+        if frontier is not None:
+            return frontier
+        # Batch started elsewhere (another RawStore or process): count its leaves once and resume its frontier.
+        count = int(self.session.scalar(select(func.count(BatchItem.id)).where(BatchItem.batch_id == batch.id)) or 0)
+        self._next_leaf[batch.id] = count
+        frontier = None
+        if int(batch.item_count or 0) == count and (count == 0 or batch.merkle_frontier is not None):
+            try:
+                frontier = MerkleFrontier.from_bytes(count, batch.merkle_frontier)
+            except ValueError:
+                frontier = None
+        if frontier is None:
+            # Batches written before the frontier existed: replay their leaves once, streamed, re-deriving the stored nodes.
+            frontier = MerkleFrontier()
+            self._node_rows = [row for row in self._node_rows if row["batch_id"] != batch.id]
+            self.session.execute(delete(MerkleNode).where(MerkleNode.batch_id == batch.id))
+            remember = partial(self._remember_node, batch.id)
+            leaves = self.session.execute(
                 select(BatchItem.item_sha256)
                 .where(BatchItem.batch_id == batch.id)
                 .order_by(BatchItem.leaf_index.asc())
-            ).all()
-        ]
+                .execution_options(yield_per=10_000)
+            )
+            for (item_sha256,) in leaves:
+                frontier.add(item_sha256, remember)
+        self._frontiers[batch.id] = frontier
+        return frontier
+
+    def _batch_members(self, batch: IngestionBatch) -> set[str]:
+        members = self._members.get(batch.id)
+        if members is None:
+            members = self._members[batch.id] = set(
+                self.session.scalars(select(BatchItem.raw_payload_id).where(BatchItem.batch_id == batch.id)).all()
+            )
+        return members
+
+    def _remember_node(self, batch_id: str, level: int, position: int, digest: bytes) -> None:
+        self._node_rows.append({"batch_id": batch_id, "level": level, "position": position, "digest": digest})
+
+    def _write_nodes(self) -> None:
+        if not self._node_rows:
+            return
+        rows, self._node_rows = self._node_rows, []
+        self.session.execute(insert(MerkleNode), rows)
 
-        merkle = build_merkle(leaves)
-        batch.merkle_root = merkle["root"]
-        batch.finished_at = datetime.now(timezone.utc)
+    def _reference_previous(self, batch: IngestionBatch, validator_key: str) -> RawPayload | None:
+        """Record a 304 as a new leaf pointing at the unchanged RawPayload instead of storing a copy."""
+        stored = self.validators.previous(validator_key)
+        raw = self.session.get(RawPayload, stored.raw_payload_id) if stored is not None else None
+        if raw is None:
+            return None
+        members = self._batch_members(batch)
+        if raw.id in members:
+            return raw
+        members.add(raw.id)
+        self.session.add(
+            BatchItem(
+                batch_id=batch.id,
+                raw_payload_id=raw.id,
+                item_sha256=raw.sha256,
+                leaf_index=self._take_leaf(batch, raw.sha256),
+            )
+        )
+        self._pending(1)
+        return raw
+
+    def _remember_validators(self, validator_key: str, endpoint: str, raw_id: str, http_status: int) -> None:
+        captured = self.validators.take_captured(validator_key)
+        if captured is None or http_status != 200:
+            return
+        etag, last_modified = captured
+        row = {
+            "request_key": validator_key,
+            "endpoint": endpoint,
+            "etag": etag,
+            "last_modified": last_modified,
+            "raw_payload_id": raw_id,
+        }
+        if self._held_validators is not None:
+            self._held_validators.append(row)
+        else:
+            self._validator_rows[validator_key] = row
+
+    def hold_validators(self, hold: bool = True) -> None:
+        """Keep newly captured validators out of flushes until they are handed to ``release_validators``.
+
+        A stored validator turns the next fetch of the same request into a 304, which skips the graph
+        upsert, so it may only be committed once the payload's rows reached the graph. Rows still held
+        when holding stops are dropped.
+        """
+        self._held_validators = [] if hold else None
+
+    def take_held_validators(self) -> list[dict[str, Any]]:
+        rows = self._held_validators or []
+        if self._held_validators is not None:
+            self._held_validators = []
+        return rows
+
+    def release_validators(self, rows: Iterable[dict[str, Any]]) -> None:
+        for row in rows:
+            self._validator_rows[row["request_key"]] = row
+
+    def _ensure_blobs(self, blobs: dict[str, Any]) -> None:
+        """Store each body once under its sha256; identical re-ingested bodies cost no new row."""
+        new = {sha: body for sha, body in blobs.items() if sha not in self._known_blobs}
+        if not new:
+            return
+        dialect_insert = self._dialect_insert()
+        if dialect_insert is not None:
+            stmt = dialect_insert(RawBlob)
+            # Existing hot blobs are left alone; an archived one (NULL body) is re-warmed.
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[RawBlob.sha256],
+                set_={"body_json": stmt.excluded.body_json},
+                where=RawBlob.body_json.is_(None),
+            )
+            self.session.execute(stmt, [{"sha256": sha, "body_json": body} for sha, body in new.items()])
+        else:
+            for sha, body in new.items():
+                blob = self.session.get(RawBlob, sha)
+                if blob is None:
+                    self.session.add(RawBlob(sha256=sha, body_json=body))
+                elif blob.body_json is None:
+                    blob.body_json = body
+            self.session.flush()
+        if len(self._known_blobs) + len(new) > _KNOWN_BLOBS_MAX:
+            self._known_blobs.clear()
+        self._known_blobs.update(new)
+
+    def _dialect_insert(self) -> Any | None:
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return None
+        return dialect_insert
+
+    def _write_validators(self) -> None:
+        """Upsert captured validators in one statement; their raw payloads must already be flushed."""
+        if not self._validator_rows:
+            return
+        rows = list(self._validator_rows.values())
+        self._validator_rows.clear()
+        dialect_insert = self._dialect_insert()
+        if dialect_insert is None:
+            for row in rows:
+                self.session.merge(HttpValidator(**row))
+            self.session.flush()
+            return
+        stmt = dialect_insert(HttpValidator)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[HttpValidator.request_key],
+            set_={
+                "endpoint": stmt.excluded.endpoint,
+                "etag": stmt.excluded.etag,
+                "last_modified": stmt.excluded.last_modified,
+                "raw_payload_id": stmt.excluded.raw_payload_id,
+                "updated_at": func.now(),
+            },
+        )
+        self.session.execute(stmt, rows)
+
+    def finish_batch(self, batch: IngestionBatch, metadata: dict[str, Any] | None = None) -> IngestionBatch:
+        self.flush()
+        # Same root as build_merkle over the ordered item_sha256 values, from the O(log n) frontier.
+        root = self._frontier(batch).root(partial(self._remember_node, batch.id))
+        self._write_nodes()
+        batch.merkle_root = root
+        batch.finished_at = datetime.now(UTC)
         batch.status = "success"
         if metadata is not None:
             batch.notes = json.dumps(metadata, ensure_ascii=True)
 
         anchor_entry = anchor_root(
             entry_type=f"camara:{batch.batch_type}",
-            root=merkle["root"],
+            root=root,
             batch_id=batch.id,
-            metadata={"batch": batch.batch_type, "range_start": str(batch.range_start), "range_end": str(batch.range_end), **(metadata or {})},
+            metadata={
+                "batch": batch.batch_type,
+                "range_start": str(batch.range_start),
+                "range_end": str(batch.range_end),
+                **(metadata or {}),
+            },
             session=self.session,
         )
 
@@ -110,8 +417,12 @@ class RawStore:
         return batch
 
     def fail_batch(self, batch: IngestionBatch, notes: str) -> None:
+        self._validator_rows.clear()
+        self._node_rows = [row for row in self._node_rows if row["batch_id"] != batch.id]
+        # Payloads of the failed batch stay stored, so their tallies do too.
+        write_stats(self.session, self._stats)
         batch.status = "failed"
         batch.notes = notes
-        batch.finished_at = datetime.now(timezone.utc)
+        batch.finished_at = datetime.now(UTC)
         self.session.add(batch)
         self.session.flush()
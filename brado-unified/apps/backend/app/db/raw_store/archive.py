@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, exists, null, select, update
+
+from ...core.config import get_settings
+from ...proof.hashing import sha256_json_canonical
+from ..sql.models import RawBlob, RawBlobArchive, RawPayload
+
+try:  # zstd when available, gzip otherwise; the codec is part of each file name.
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+def _codec() -> tuple[str, Callable[[bytes], bytes]]:
+    if zstandard is not None:
+        return ".ndjson.zst", zstandard.ZstdCompressor(level=10).compress
+    return ".ndjson.gz", gzip.compress
+
+
+def _decompress(path: str, frame: bytes) -> bytes:
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+class RawArchive:
+    """Date-partitioned NDJSON archive files where every record is its own compressed frame.
+
+    Frames concatenate into a valid .zst/.gz stream, and an index row (path,
+    offset, length) lets a single body be read without decompressing the file.
+    """
+
+    def __init__(self, root: Path | str | None = None) -> None:
+        self.root = Path(root or get_settings().raw_archive_dir)
+
+    def write(self, partition: str, records: list[tuple[str, Any]]) -> list[tuple[str, str, int, int]]:
+        suffix, compress = _codec()
+        relpath = f"{partition}/blobs-{datetime.now(UTC):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}{suffix}"
+        path = self.root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entries: list[tuple[str, str, int, int]] = []
+        with path.open("wb") as fh:
+            for sha, body in records:
+                line = json.dumps({"sha256": sha, "body": body}, ensure_ascii=False, separators=(",", ":")) + "\n"
+                frame = compress(line.encode("utf-8"))
+                entries.append((sha, relpath, fh.tell(), len(frame)))
+                fh.write(frame)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return entries
+
+    def read(self, relpath: str, offset: int, length: int, sha256: str) -> Any:
+        with (self.root / relpath).open("rb") as fh:
+            fh.seek(offset)
+            frame = fh.read(length)
+        record = json.loads(_decompress(relpath, frame))
+        body = record.get("body")
+        if record.get("sha256") != sha256 or sha256_json_canonical(body) != sha256:
+            raise ValueError(f"archived blob {sha256} failed integrity check ({relpath}@{offset})")
+        return body
+
+
+def read_archived_body(session: Any, sha256: str, archive: RawArchive | None = None) -> Any | None:
+    if session is None:
+        return None
+    entry = session.get(RawBlobArchive, sha256)
+    if entry is None:
+        return None
+    return (archive or RawArchive()).read(entry.path, int(entry.offset), int(entry.length), sha256)
+
+
+def archive_cold_blobs(
+    session: Any,
+    *,
+    older_than_days: int | None = None,
+    limit: int | None = None,
+    chunk_size: int = 1000,
+    archive: RawArchive | None = None,
+) -> dict[str, Any]:
+    """Move bodies not fetched again within ``older_than_days`` into the archive and clear them from raw_blobs.
+
+    Each chunk is fsynced to disk before its index rows and NULLed bodies are
+    committed, so an interruption never leaves a body without a readable copy.
+    """
+    settings = get_settings()
+    days = settings.raw_archive_after_days if older_than_days is None else older_than_days
+    cutoff = datetime.now(UTC) - timedelta(days=days)
+    archive = archive or RawArchive()
+
+    recently_fetched = exists().where(RawPayload.sha256 == RawBlob.sha256, RawPayload.fetched_at >= cutoff)
+    query = (
+        select(RawBlob.sha256, RawBlob.body_json, RawBlob.created_at)
+        .where(RawBlob.body_json.is_not(None), ~recently_fetched)
+        .order_by(RawBlob.created_at)
+    )
+
+    archived = 0
+    files: set[str] = set()
+    seen: set[str] = set()
+    while True:
+        rows = session.execute(query.limit(min(chunk_size, limit - archived) if limit else chunk_size)).all()
+        if not rows:
+            break
+        partitions: dict[str, list[tuple[str, Any]]] = {}
+        for sha, body, created_at in rows:
+            partitions.setdefault(f"{created_at:%Y/%m}" if created_at else "undated", []).append((sha, body))
+        shas = [row[0] for row in rows]
+        if seen.intersection(shas):
+            raise RuntimeError("archived blobs were selected again; body_json was not cleared")
+        seen.update(shas)
+        # A blob re-ingested after archiving was re-warmed; its stale index row is replaced.
+        session.execute(delete(RawBlobArchive).where(RawBlobArchive.sha256.in_(shas)))
+        for partition, records in partitions.items():
+            entries = archive.write(partition, records)
+            session.add_all(RawBlobArchive(sha256=sha, path=path, offset=offset, length=length) for sha, path, offset, length in entries)
+            files.update(path for _sha, path, _offset, _length in entries)
+        session.execute(update(RawBlob).where(RawBlob.sha256.in_(shas)).values(body_json=null()))
+        session.commit()
+        archived += len(rows)
+        if limit and archived >= limit:
+            break
+
+    return {"archived": archived, "files": sorted(files), "older_than_days": days, "root": str(archive.root)}
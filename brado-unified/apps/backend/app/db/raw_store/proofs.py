@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy import and_, delete, insert, or_, select
+
+from ...proof.merkle import MerkleFrontier, proof_path
+from ..sql.models import BatchItem, IngestionBatch, MerkleNode, RawBlob, RawBlobArchive, RawPayload
+from .archive import RawArchive
+
+# Leaves exported per round trip; a power of two so every block is a whole subtree.
+_EXPORT_BLOCK = 4096
+# Leaves streamed and nodes inserted per round trip when a tree is rebuilt.
+_REBUILD_ROWS = 10_000
+
+
+def _finished_batch(session: Any, batch_id: str) -> IngestionBatch:
+    batch = session.get(IngestionBatch, batch_id)
+    if batch is None:
+        raise ValueError(f"batch not found: {batch_id}")
+    if not batch.merkle_root:
+        raise ValueError(f"batch {batch_id} has no merkle root (status={batch.status})")
+    if int(batch.item_count or 0) > 1 and session.scalar(select(MerkleNode.level).where(MerkleNode.batch_id == batch_id).limit(1)) is None:
+        # Batches finished before merkle_nodes existed: derive their tree once from the stored leaves.
+        rebuild_merkle_nodes(session, batch)
+    return batch
+
+
+def rebuild_merkle_nodes(session: Any, batch: IngestionBatch) -> int:
+    """Re-derive a finished batch's merkle_nodes from its batch_items, streamed in leaf order; returns the node count.
+
+    Raises ValueError, writing nothing, when the leaves do not reproduce the batch's merkle_root.
+    """
+    frontier = MerkleFrontier()
+    nodes: list[dict[str, Any]] = []
+
+    def remember(level: int, position: int, digest: bytes) -> None:
+        nodes.append({"batch_id": batch.id, "level": level, "position": position, "digest": digest})
+
+    leaves = session.execute(
+        select(BatchItem.item_sha256)
+        .where(BatchItem.batch_id == batch.id)
+        .order_by(BatchItem.leaf_index.asc())
+        .execution_options(yield_per=_REBUILD_ROWS)
+    )
+    for (item_sha256,) in leaves:
+        frontier.add(item_sha256, remember)
+    if frontier.root(remember) != batch.merkle_root:
+        raise ValueError(f"batch {batch.id}: stored leaves do not reproduce merkle_root; run verify:batches")
+    session.execute(delete(MerkleNode).where(MerkleNode.batch_id == batch.id))
+    for start in range(0, len(nodes), _REBUILD_ROWS):
+        session.execute(insert(MerkleNode), nodes[start : start + _REBUILD_ROWS])
+    return len(nodes)
+
+
+def rebuild_missing_merkle_nodes(session: Any) -> dict[str, Any]:
+    """Backfill merkle_nodes for every finished batch with two or more leaves and no stored nodes."""
+    stored = select(MerkleNode.batch_id).where(MerkleNode.batch_id == IngestionBatch.id).exists()
+    batches = session.scalars(
+        select(IngestionBatch).where(IngestionBatch.merkle_root.is_not(None), IngestionBatch.item_count > 1, ~stored)
+    ).all()
+    rebuilt: list[str] = []
+    failed: dict[str, str] = {}
+    nodes = 0
+    for batch in batches:
+        try:
+            nodes += rebuild_merkle_nodes(session, batch)
+        except ValueError as exc:
+            failed[batch.id] = str(exc)
+            continue
+        rebuilt.append(batch.id)
+        session.commit()
+    return {"batches": len(rebuilt), "nodes": nodes, "failed": failed}
+
+
+def _batch_header(batch: IngestionBatch) -> dict[str, Any]:
+    return {
+        "batch_id": batch.id,
+        "batch_type": batch.batch_type,
+        "merkle_root": batch.merkle_root,
+        "leaf_count": int(batch.item_count or 0),
+        "anchor_id": batch.anchor_id,
+        "algorithm": "sha256",
+        "duplicated_last_if_odd": True,
+    }
+
+
+def _load_nodes(session: Any, batch_id: str, wanted: dict[int, tuple[int, int]]) -> dict[tuple[int, int], str]:
+    """Stored nodes with ``level: (first, last)`` position ranges, keyed by (level, position) as hex."""
+    if not wanted:
+        return {}
+    condition = or_(*(and_(MerkleNode.level == level, MerkleNode.position.between(first, last)) for level, (first, last) in wanted.items()))
+    rows = session.execute(
+        select(MerkleNode.level, MerkleNode.position, MerkleNode.digest).where(MerkleNode.batch_id == batch_id, condition)
+    )
+    return {(int(level), int(position)): bytes(digest).hex() for level, position, digest in rows}
+
+
+def _proof(width: int, leaf_index: int, nodes: dict[tuple[int, int], str]) -> list[dict[str, str]]:
+    steps: list[dict[str, str]] = []
+    for level, position in proof_path(width, leaf_index):
+        digest = nodes.get((level, position))
+        if digest is None:
+            raise ValueError(f"merkle node ({level}, {position}) is not stored")
+        steps.append({"side": "left" if position < leaf_index >> level else "right", "hash": digest})
+    return steps
+
+
+def inclusion_proof(session: Any, batch_id: str, raw_payload_id: str) -> dict[str, Any]:
+    """Sibling hashes from the payload's leaf up to the batch root, read from the stored tree levels."""
+    batch = _finished_batch(session, batch_id)
+    item = session.execute(
+        select(BatchItem.leaf_index, BatchItem.item_sha256).where(
+            BatchItem.batch_id == batch_id, BatchItem.raw_payload_id == raw_payload_id
+        )
+    ).first()
+    if item is None:
+        raise ValueError(f"raw payload {raw_payload_id} is not in batch {batch_id}")
+    leaf_index, item_sha256 = int(item[0]), item[1]
+    width = int(batch.item_count or 0)
+    path = proof_path(width, leaf_index)
+
+    nodes = _load_nodes(session, batch_id, {level: (position, position) for level, position in path if level > 0})
+    leaf_siblings = [position for level, position in path if level == 0]
+    if leaf_siblings:
+        sibling = session.scalar(
+            select(BatchItem.item_sha256).where(BatchItem.batch_id == batch_id, BatchItem.leaf_index == leaf_siblings[0])
+        )
+        if sibling is not None:
+            nodes[(0, leaf_siblings[0])] = sibling
+    return {
+        **_batch_header(batch),
+        "raw_payload_id": raw_payload_id,
+        "leaf_index": leaf_index,
+        "item_sha256": item_sha256,
+        "proof": _proof(width, leaf_index, nodes),
+    }
+
+
+def iter_batch_export(
+    session: Any, batch_id: str, *, block_size: int = _EXPORT_BLOCK, archive: RawArchive | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield a header record and then one record per leaf (payload, sha256, leaf_index, proof), in leaf order.
+
+    Leaves are read one aligned block at a time, together with the stored nodes
+    inside the block and the handful of siblings above it, so memory stays
+    bounded by the block size regardless of the batch size.
+    """
+    if block_size < 2 or block_size & (block_size - 1):
+        raise ValueError("block_size must be a power of two")
+    batch = _finished_batch(session, batch_id)
+    width = int(batch.item_count or 0)
+    yield {"type": "batch", **_batch_header(batch)}
+
+    block_levels = block_size.bit_length() - 1
+    archive = archive or RawArchive()
+    for start in range(0, width, block_size):
+        end = min(start + block_size, width)
+        rows = session.execute(
+            select(
+                BatchItem.leaf_index,
+                BatchItem.item_sha256,
+                BatchItem.raw_payload_id,
+                RawPayload.url,
+                RawPayload.fetched_at,
+                RawBlob.body_json,
+                RawBlobArchive.path,
+                RawBlobArchive.offset,
+                RawBlobArchive.length,
+            )
+            .join(RawPayload, RawPayload.id == BatchItem.raw_payload_id)
+            .join(RawBlob, RawBlob.sha256 == RawPayload.sha256)
+            .outerjoin(RawBlobArchive, RawBlobArchive.sha256 == RawBlob.sha256)
+            .where(BatchItem.batch_id == batch_id, BatchItem.leaf_index >= start, BatchItem.leaf_index < end)
+            .order_by(BatchItem.leaf_index.asc())
+        ).all()
+
+        # Inside the block every level is a contiguous range; above it all leaves share one sibling per level.
+        wanted = {level: (start >> level, (end - 1) >> level) for level in range(1, block_levels)}
+        wanted.update({level: (position, position) for level, position in proof_path(width, start) if level >= block_levels})
+        nodes = _load_nodes(session, batch_id, wanted)
+        nodes.update({(0, int(row.leaf_index)): row.item_sha256 for row in rows})
+
+        for row in rows:
+            body = row.body_json
+            if body is None and row.path is not None:
+                body = archive.read(row.path, int(row.offset), int(row.length), row.item_sha256)
+            yield {
+                "type": "item",
+                "raw_payload_id": row.raw_payload_id,
+                "leaf_index": int(row.leaf_index),
+                "sha256": row.item_sha256,
+                "url": row.url,
+                "fetched_at": row.fetched_at.isoformat() if row.fetched_at else None,
+                "proof": _proof(width, int(row.leaf_index), nodes),
+                "payload": body,
+            }
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy import delete, func, select
+
+from ..sql.models import RawBlob, RawBlobArchive, RawPayload, RawPayloadStat
+from .archive import RawArchive
+
+# Path segments carrying an id (deputado, votação "2265603-43", dataset year) collapse into one template.
+_ID_SEGMENT = re.compile(r"\d")
+_REBUILD_ROWS = 5_000
+
+StatKey = tuple[str, int, str, int]
+
+
+def endpoint_template(endpoint: str) -> str:
+    """``/deputados/204554/despesas`` -> ``/deputados/{id}/despesas``."""
+    return "/".join("{id}" if _ID_SEGMENT.search(segment) else segment for segment in endpoint.split("/"))
+
+
+def stat_key(endpoint: str, params: dict[str, Any] | None, http_status: int) -> StatKey:
+    template = endpoint_template(endpoint)
+    segments = [segment for segment in template.split("/") if segment and segment != "{id}"]
+    params = params or {}
+    try:
+        year = int(params.get("ano") or params.get("year") or 0)
+    except (TypeError, ValueError):
+        year = 0
+    return (segments[-1] if segments else "", year, template, int(http_status or 0))
+
+
+def count_items(body: Any) -> int:
+    """Records in a Câmara response: the length of ``dados`` when it is a list, 1 for a single record, else 0."""
+    dados = body.get("dados") if isinstance(body, dict) else None
+    if isinstance(dados, list):
+        return len(dados)
+    return 1 if isinstance(dados, dict) else 0
+
+
+def add_stat(tallies: dict[StatKey, list[int]], endpoint: str, params: dict[str, Any] | None, http_status: int, body: Any) -> None:
+    tally = tallies.setdefault(stat_key(endpoint, params, http_status), [0, 0])
+    tally[0] += 1
+    tally[1] += count_items(body)
+
+
+def write_stats(session: Any, tallies: dict[StatKey, list[int]]) -> None:
+    """Add the tallies to raw_payload_stats with one upsert (increments, not overwrites)."""
+    if not tallies:
+        return
+    rows = [
+        {"domain": domain, "year": year, "endpoint": endpoint, "http_status": status, "payloads": payloads, "items": items}
+        for (domain, year, endpoint, status), (payloads, items) in sorted(tallies.items())
+    ]
+    tallies.clear()
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for row in rows:
+            stat = session.get(RawPayloadStat, (row["domain"], row["year"], row["endpoint"], row["http_status"]))
+            if stat is None:
+                session.add(RawPayloadStat(**row))
+            else:
+                stat.payloads += row["payloads"]
+                stat.items += row["items"]
+        session.flush()
+        return
+    stmt = dialect_insert(RawPayloadStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RawPayloadStat.domain, RawPayloadStat.year, RawPayloadStat.endpoint, RawPayloadStat.http_status],
+        set_={
+            "payloads": RawPayloadStat.payloads + stmt.excluded["payloads"],
+            "items": RawPayloadStat.items + stmt.excluded["items"],
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(stmt, rows)
+
+
+def expected_items(session: Any, endpoint: str, *, http_status: int = 200) -> dict[int, int]:
+    """Stored item counts per year for one endpoint template, in a single primary-key range query."""
+    rows = session.execute(
+        select(RawPayloadStat.year, func.sum(RawPayloadStat.items))
+        .where(RawPayloadStat.domain == stat_key(endpoint, None, http_status)[0])
+        .where(RawPayloadStat.endpoint == endpoint_template(endpoint), RawPayloadStat.http_status == http_status)
+        .group_by(RawPayloadStat.year)
+    )
+    return {int(year): int(total or 0) for year, total in rows}
+
+
+def rebuild_payload_stats(session: Any, *, archive: RawArchive | None = None) -> dict[str, Any]:
+    """Recompute raw_payload_stats from every stored payload (archived bodies included); for upgrades and repairs."""
+    archive = archive or RawArchive()
+    session.execute(delete(RawPayloadStat))
+    tallies: dict[StatKey, list[int]] = {}
+    payloads = 0
+    rows = session.execute(
+        select(
+            RawPayload.endpoint,
+            RawPayload.params_json,
+            RawPayload.http_status,
+            RawBlob.body_json,
+            RawBlob.sha256,
+            RawBlobArchive.path,
+            RawBlobArchive.offset,
+            RawBlobArchive.length,
+        )
+        .join(RawBlob, RawBlob.sha256 == RawPayload.sha256)
+        .outerjoin(RawBlobArchive, RawBlobArchive.sha256 == RawBlob.sha256)
+        .execution_options(yield_per=_REBUILD_ROWS)
+    )
+    for row in rows:
+        body = row.body_json
+        if body is None and row.path is not None:
+            body = archive.read(row.path, int(row.offset), int(row.length), row.sha256)
+        add_stat(tallies, row.endpoint, row.params_json, int(row.http_status or 0), body)
+        payloads += 1
+    groups = len(tallies)
+    write_stats(session, tallies)
+    return {"payloads": payloads, "groups": groups}
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+from sqlalchemy.orm import joinedload
+
+from ..sql.models import HttpValidator, RawPayload
+
+
+@dataclass(frozen=True)
+class StoredValidators:
+    etag: str | None
+    last_modified: str | None
+    raw_payload_id: str
+
+
+class ValidatorStore:
+    """HTTP validators (ETag/Last-Modified) per endpoint+params, shared by CamaraClient and RawStore.
+
+    The client reads it from worker threads, so lookups go through short-lived
+    sessions of their own and are memoized; only rows committed by previous
+    runs are ever used to build conditional requests.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any] | None = None) -> None:
+        if session_factory is None:
+            from ..sql import SessionLocal
+
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        self._lock = Lock()
+        self._known: dict[str, StoredValidators | None] = {}
+        self._captured: dict[str, tuple[str | None, str | None]] = {}
+
+    @staticmethod
+    def key(endpoint: str, params: dict[str, Any] | None) -> str:
+        payload = json.dumps({"endpoint": endpoint, "params": params or {}}, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def previous(self, key: str) -> StoredValidators | None:
+        with self._lock:
+            if key in self._known:
+                return self._known[key]
+        with self._session_factory() as session:
+            row = session.get(HttpValidator, key)
+            stored = StoredValidators(row.etag, row.last_modified, row.raw_payload_id) if row else None
+        with self._lock:
+            self._known[key] = stored
+        return stored
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        stored = self.previous(key)
+        if stored is None:
+            return {}
+        headers: dict[str, str] = {}
+        if stored.etag:
+            headers["If-None-Match"] = stored.etag
+        if stored.last_modified:
+            headers["If-Modified-Since"] = stored.last_modified
+        return headers
+
+    def previous_body(self, key: str) -> Any | None:
+        stored = self.previous(key)
+        if stored is None:
+            return None
+        with self._session_factory() as session:
+            raw = session.get(RawPayload, stored.raw_payload_id, options=[joinedload(RawPayload.blob)])
+            return raw.body_json if raw is not None else None
+
+    def capture(self, key: str, etag: str | None, last_modified: str | None) -> None:
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._captured[key] = (etag, last_modified)
+
+    def take_captured(self, key: str) -> tuple[str | None, str | None] | None:
+        with self._lock:
+            return self._captured.pop(key, None)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import UTC, date, datetime
+from datetime import time as dt_time
+from typing import Any
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from ...proof.merkle import MerkleFrontier, merkle_root
+from ..sql.models import Anchor, BatchItem, IngestionBatch
+
+# Leaves fetched per round trip of the server-side cursor.
+_STREAM_ROWS = 50_000
+# Leaves hashed per task; a power of two, so every full shard is one subtree of the batch tree.
+_SHARD_LEAVES = 1 << 18
+_engines: dict[str, Any] = {}
+
+
+def _engine(database_url: str) -> Any:
+    # One engine per worker process (or thread pool), created lazily after fork.
+    engine = _engines.get(database_url)
+    if engine is None:
+        engine = _engines[database_url] = create_engine(database_url, future=True, pool_pre_ping=True)
+    return engine
+
+
+def verify_leaf_range(database_url: str, batch_id: str, first: int, last: int | None) -> dict[str, Any]:
+    """Hash the leaves of one batch with leaf_index in [first, last), streamed in leaf order; ``last=None`` is open-ended."""
+    started = time.perf_counter()
+    frontier = MerkleFrontier()
+    gap: int | None = None
+    query = select(BatchItem.leaf_index, BatchItem.item_sha256).where(BatchItem.batch_id == batch_id, BatchItem.leaf_index >= first)
+    if last is not None:
+        query = query.where(BatchItem.leaf_index < last)
+    with Session(_engine(database_url)) as session:
+        rows = session.execute(query.order_by(BatchItem.leaf_index.asc()).execution_options(yield_per=_STREAM_ROWS))
+        for leaf_index, item_sha256 in rows:
+            if gap is None and leaf_index != first + frontier.count:
+                gap = first + frontier.count
+            frontier.add(item_sha256)
+    return {
+        "first": first,
+        "leaves": frontier.count,
+        "root": frontier.root(),
+        "gap": gap,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _batch_result(batch_id: str, expected_root: str, item_count: int, shards: list[dict[str, Any]], shard_leaves: int) -> dict[str, Any]:
+    """Join the shard results of one batch into the batch root and its problems.
+
+    Every shard but the last covers a full, aligned subtree of ``shard_leaves`` leaves, so its root is the
+    tree's node at that height. The last shard's root is lifted to the same height by pairing it with itself,
+    as the tree does at an odd right edge, and ``merkle_root`` over the shard roots finishes the tree.
+    """
+    shards = sorted(shards, key=lambda shard: shard["first"])
+    leaves = sum(shard["leaves"] for shard in shards)
+    gap: int | None = None
+    for index, shard in enumerate(shards):
+        if shard["gap"] is not None:
+            gap = shard["gap"]
+            break
+        if index < len(shards) - 1 and shard["leaves"] != shard_leaves:
+            gap = shard["first"] + shard["leaves"]
+            break
+    # A broken sequence or surplus leaves past the last aligned shard leave no well-defined tree to compare.
+    root: str | None = None
+    if gap is None and (len(shards) == 1 or shards[-1]["leaves"] <= shard_leaves):
+        roots = [shard["root"] for shard in shards]
+        if len(roots) > 1:
+            height = shard_leaves.bit_length() - 1
+            for _ in range(height - (shards[-1]["leaves"] - 1).bit_length()):
+                roots[-1] = merkle_root([roots[-1], roots[-1]])
+        root = merkle_root(roots) if len(roots) > 1 else roots[0]
+    problems = []
+    if gap is not None:
+        problems.append(f"leaf_index sequence broken at {gap}")
+    if leaves != item_count:
+        problems.append(f"item_count {item_count} != {leaves} stored leaves")
+    if root is not None and root != expected_root:
+        problems.append("merkle_root mismatch")
+    return {
+        "batch_id": batch_id,
+        "leaves": leaves,
+        "computed_root": root,
+        "expected_root": expected_root,
+        "problems": problems,
+        "seconds": round(sum(shard["seconds"] for shard in shards), 3),
+    }
+
+
+def verify_batches(
+    session: Any,
+    database_url: str,
+    *,
+    since: date | None = None,
+    workers: int | None = None,
+    use_threads: bool = False,
+    shard_leaves: int = _SHARD_LEAVES,
+) -> dict[str, Any]:
+    """Re-verify every finished batch (or those finished since ``since``) against merkle_root and its anchor.
+
+    Each batch is cut into aligned ranges of ``shard_leaves`` leaves spread over a process pool, so one huge
+    batch keeps every worker busy; each worker streams its range with a server-side cursor so memory stays
+    flat, and the subtree roots are joined per batch.
+    """
+    if shard_leaves < 1 or shard_leaves & (shard_leaves - 1):
+        raise ValueError(f"shard_leaves must be a power of two, got {shard_leaves}")
+    query = (
+        select(IngestionBatch.id, IngestionBatch.merkle_root, IngestionBatch.item_count, Anchor.root)
+        .outerjoin(Anchor, Anchor.id == IngestionBatch.anchor_id)
+        .where(IngestionBatch.merkle_root.is_not(None))
+        # Largest batches first so one long batch does not start last.
+        .order_by(IngestionBatch.item_count.desc())
+    )
+    if since is not None:
+        query = query.where(IngestionBatch.finished_at >= datetime.combine(since, dt_time.min, tzinfo=UTC))
+    batches = session.execute(query).all()
+
+    started = time.perf_counter()
+    mismatches: list[dict[str, Any]] = []
+    leaves = 0
+    workers = max(1, workers or os.cpu_count() or 1)
+    pool: Executor = ThreadPoolExecutor(max_workers=workers) if use_threads else ProcessPoolExecutor(max_workers=workers)
+    pending: dict[str, int] = {}
+    shards: dict[str, list[dict[str, Any]]] = {}
+    with pool:
+        futures = {}
+        for batch_id, _root, item_count, _anchor in batches:
+            firsts = range(0, max(1, int(item_count or 0)), shard_leaves)
+            pending[batch_id], shards[batch_id] = len(firsts), []
+            for first in firsts:
+                # The last range is open-ended so leaves stored past item_count are still counted.
+                last = first + shard_leaves if first + shard_leaves < int(item_count or 0) else None
+                futures[pool.submit(verify_leaf_range, database_url, batch_id, first, last)] = batch_id
+        by_id = {
+            batch_id: (expected_root, int(item_count or 0), anchor_root) for batch_id, expected_root, item_count, anchor_root in batches
+        }
+        for future in as_completed(futures):
+            batch_id = futures[future]
+            shards[batch_id].append(future.result())
+            pending[batch_id] -= 1
+            if pending[batch_id]:
+                continue
+            expected_root, item_count, anchor_root = by_id[batch_id]
+            result = _batch_result(batch_id, expected_root, item_count, shards.pop(batch_id), shard_leaves)
+            if anchor_root is not None and anchor_root != result["expected_root"]:
+                result["problems"].append("anchor root mismatch")
+            leaves += result["leaves"]
+            if result["problems"]:
+                mismatches.append(result)
+
+    seconds = time.perf_counter() - started
+    return {
+        "status": "ok" if not mismatches else "mismatch",
+        "batches": len(batches),
+        "leaves": leaves,
+        "seconds": round(seconds, 3),
+        "leaves_per_second": round(leaves / seconds, 1) if seconds > 0 else None,
+        "since": since.isoformat() if since else None,
+        "mismatches": sorted(mismatches, key=lambda item: item["batch_id"]),
+    }
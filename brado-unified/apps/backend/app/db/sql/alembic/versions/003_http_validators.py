@@ -0,0 +1,23 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "003_http_validators"
+down_revision = "002_political_interview_core"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "http_validators",
+        sa.Column("request_key", sa.CHAR(length=64), primary_key=True, nullable=False),
+        sa.Column("endpoint", sa.String(length=255), nullable=False),
+        sa.Column("etag", sa.String(length=255), nullable=True),
+        sa.Column("last_modified", sa.String(length=64), nullable=True),
+        sa.Column("raw_payload_id", sa.String(length=36), sa.ForeignKey("raw_payloads.id"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("http_validators")
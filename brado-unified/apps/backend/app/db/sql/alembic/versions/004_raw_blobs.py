@@ -0,0 +1,37 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "004_raw_blobs"
+down_revision = "003_http_validators"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "raw_blobs",
+        sa.Column("sha256", sa.CHAR(length=64), primary_key=True, nullable=False),
+        sa.Column("body_json", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # One blob per distinct sha256; every version with that hash has the same canonical body.
+    op.execute(
+        """
+        INSERT INTO raw_blobs (sha256, body_json)
+        SELECT r.sha256, r.body_json
+        FROM raw_payloads r
+        JOIN (SELECT sha256, MIN(id) AS id FROM raw_payloads GROUP BY sha256) first_version ON first_version.id = r.id
+        """
+    )
+    op.create_index("ix_raw_payload_sha256", "raw_payloads", ["sha256"], unique=False)
+    op.create_foreign_key("fk_raw_payloads_raw_blobs", "raw_payloads", "raw_blobs", ["sha256"], ["sha256"])
+    op.drop_column("raw_payloads", "body_json")
+
+
+def downgrade() -> None:
+    op.add_column("raw_payloads", sa.Column("body_json", sa.JSON(), nullable=True))
+    op.execute("UPDATE raw_payloads SET body_json = (SELECT b.body_json FROM raw_blobs b WHERE b.sha256 = raw_payloads.sha256)")
+    op.alter_column("raw_payloads", "body_json", nullable=False)
+    op.drop_constraint("fk_raw_payloads_raw_blobs", "raw_payloads", type_="foreignkey")
+    op.drop_index("ix_raw_payload_sha256", table_name="raw_payloads")
+    op.drop_table("raw_blobs")
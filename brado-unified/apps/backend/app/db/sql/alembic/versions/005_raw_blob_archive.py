@@ -0,0 +1,25 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "005_raw_blob_archive"
+down_revision = "004_raw_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column("raw_blobs", "body_json", existing_type=sa.JSON(), nullable=True)
+    op.create_table(
+        "raw_blob_archive",
+        sa.Column("sha256", sa.CHAR(length=64), sa.ForeignKey("raw_blobs.sha256"), primary_key=True, nullable=False),
+        sa.Column("path", sa.String(length=512), nullable=False),
+        sa.Column("offset", sa.BigInteger(), nullable=False),
+        sa.Column("length", sa.Integer(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    # Fails while archived blobs exist: copy their bodies back into raw_blobs first.
+    op.drop_table("raw_blob_archive")
+    op.alter_column("raw_blobs", "body_json", existing_type=sa.JSON(), nullable=False)
@@ -0,0 +1,16 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "006_merkle_frontier"
+down_revision = "005_raw_blob_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing running batches have no frontier; RawStore rebuilds it from batch_items on first use.
+    op.add_column("ingestion_batches", sa.Column("merkle_frontier", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_batches", "merkle_frontier")
@@ -0,0 +1,21 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "007_merkle_nodes"
+down_revision = "006_merkle_frontier"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "merkle_nodes",
+        sa.Column("batch_id", sa.String(length=36), sa.ForeignKey("ingestion_batches.id"), primary_key=True, nullable=False),
+        sa.Column("level", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("position", sa.BigInteger(), primary_key=True, nullable=False),
+        sa.Column("digest", sa.LargeBinary(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("merkle_nodes")
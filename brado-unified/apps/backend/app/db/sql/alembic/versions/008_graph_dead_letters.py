@@ -0,0 +1,27 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "008_graph_dead_letters"
+down_revision = "007_merkle_nodes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "graph_dead_letters",
+        sa.Column("id", sa.String(length=36), primary_key=True, nullable=False),
+        sa.Column("operation", sa.String(length=64), nullable=False),
+        sa.Column("node_json", sa.JSON(), nullable=False),
+        sa.Column("raw_ref", sa.String(length=36), nullable=True),
+        sa.Column("error", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("replayed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_graph_dead_letters_pending", "graph_dead_letters", ["replayed_at", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_graph_dead_letters_pending", table_name="graph_dead_letters")
+    op.drop_table("graph_dead_letters")
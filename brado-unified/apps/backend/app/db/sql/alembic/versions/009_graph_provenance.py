@@ -0,0 +1,23 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "009_graph_provenance"
+down_revision = "008_graph_dead_letters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "graph_provenance",
+        sa.Column("node_id", sa.String(length=128), nullable=False),
+        sa.Column("raw_payload_id", sa.String(length=36), nullable=False),
+        sa.Column("seen_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("node_id", "raw_payload_id"),
+    )
+    op.create_index("ix_graph_provenance_raw_payload_id", "graph_provenance", ["raw_payload_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_graph_provenance_raw_payload_id", table_name="graph_provenance")
+    op.drop_table("graph_provenance")
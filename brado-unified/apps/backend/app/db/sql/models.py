@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from typing import Any
 
 from sqlalchemy import (
     CHAR,
     JSON,
+    BigInteger,
     Column,
     Date,
     DateTime,
@@ -13,12 +14,13 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
     func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
 
 from . import Base
 
@@ -27,6 +29,29 @@ def _uuid() -> str:
     return str(uuid.uuid4())
 
 
+class RawBlob(Base):
+    """Payload body stored once per content hash; raw_payloads rows reference it by sha256."""
+
+    __tablename__ = "raw_blobs"
+
+    sha256 = Column(CHAR(64), primary_key=True, nullable=False)
+    # NULL once the body has moved to the compressed cold tier (see raw_blob_archive).
+    body_json = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class RawBlobArchive(Base):
+    """Location of an archived blob: one independently compressed frame inside a partition file."""
+
+    __tablename__ = "raw_blob_archive"
+
+    sha256 = Column(CHAR(64), ForeignKey("raw_blobs.sha256"), primary_key=True, nullable=False)
+    path = Column(String(512), nullable=False)
+    offset = Column(BigInteger, nullable=False)
+    length = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
 class RawPayload(Base):
     __tablename__ = "raw_payloads"
 
@@ -38,20 +63,54 @@ class RawPayload(Base):
     fetched_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     http_status = Column(Integer, nullable=False)
     url = Column(Text, nullable=False)
-    sha256 = Column(CHAR(64), nullable=False)
-    body_json = Column(JSON, nullable=False)
+    sha256 = Column(CHAR(64), ForeignKey("raw_blobs.sha256"), nullable=False)
     batch_id = Column(String(36), ForeignKey("ingestion_batches.id"), nullable=False)
 
     batch = relationship("IngestionBatch", back_populates="raw_payloads")
     batch_items = relationship("BatchItem", back_populates="raw_payload", cascade="all, delete-orphan")
+    # Loaded on demand: batch, proof and 304 paths load payloads without needing the body. Readers that do
+    # (get_body, bulk listings) ask for it with joinedload/selectinload.
+    blob = relationship("RawBlob", lazy="select")
 
     __table_args__ = (
         UniqueConstraint("source", "endpoint", "primary_key", "fetched_at", name="uq_raw_payload_version"),
         Index("ix_raw_payload_source_endpoint", "source", "endpoint"),
         Index("ix_raw_payload_batch_id", "batch_id"),
         Index("ix_raw_payload_fetched_at", "fetched_at"),
+        Index("ix_raw_payload_sha256", "sha256"),
     )
 
+    @property
+    def body_json(self) -> Any:
+        blob = self.blob
+        if blob is None:
+            return None
+        if blob.body_json is not None:
+            return blob.body_json
+        from ..raw_store.archive import read_archived_body
+
+        return read_archived_body(object_session(self), blob.sha256)
+
+    @body_json.setter
+    def body_json(self, value: Any) -> None:
+        # Convenience for one-off inserts; RawStore writes blobs itself with ON CONFLICT DO NOTHING.
+        self.blob = RawBlob(sha256=self.sha256, body_json=value)
+
+
+class RawPayloadStat(Base):
+    """Running tallies of stored raw payloads per (domain, year, endpoint template, HTTP status), kept by RawStore."""
+
+    __tablename__ = "raw_payload_stats"
+
+    domain = Column(String(64), primary_key=True, nullable=False)
+    # 0 when the request carried no year (ano/year) parameter.
+    year = Column(Integer, primary_key=True, nullable=False)
+    endpoint = Column(String(255), primary_key=True, nullable=False)
+    http_status = Column(Integer, primary_key=True, nullable=False)
+    payloads = Column(BigInteger, nullable=False, default=0)
+    items = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
 
 class IngestionBatch(Base):
     __tablename__ = "ingestion_batches"
@@ -66,6 +125,8 @@ class IngestionBatch(Base):
     status = Column(String(32), nullable=False, default="running")
     item_count = Column(Integer, nullable=False, default=0)
     merkle_root = Column(CHAR(64), nullable=True)
+    # Pending node digests of the incremental Merkle tree over the item_count leaves (see MerkleFrontier).
+    merkle_frontier = Column(LargeBinary, nullable=True)
     anchor_id = Column(String(36), ForeignKey("anchors.id"), nullable=True)
     notes = Column(Text, nullable=True)
 
@@ -93,6 +154,57 @@ class BatchItem(Base):
     )
 
 
+class MerkleNode(Base):
+    """Internal node of a batch's Merkle tree (levels >= 1; level 0 is batch_items.item_sha256)."""
+
+    __tablename__ = "merkle_nodes"
+
+    batch_id = Column(String(36), ForeignKey("ingestion_batches.id"), primary_key=True, nullable=False)
+    level = Column(Integer, primary_key=True, nullable=False)
+    position = Column(BigInteger, primary_key=True, nullable=False)
+    digest = Column(LargeBinary, nullable=False)
+
+
+class GraphDeadLetter(Base):
+    """Graph write that failed after retries, kept for ``graph:replay-dlq``."""
+
+    __tablename__ = "graph_dead_letters"
+
+    id = Column(String(36), primary_key=True, default=_uuid, nullable=False)
+    operation = Column(String(64), nullable=False)
+    node_json = Column(JSON, nullable=False)
+    raw_ref = Column(String(36), nullable=True)
+    error = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    replayed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (Index("ix_graph_dead_letters_pending", "replayed_at", "created_at"),)
+
+
+class GraphProvenance(Base):
+    """Every raw payload a graph node was written from; the node itself only keeps the most recent refs."""
+
+    __tablename__ = "graph_provenance"
+
+    node_id = Column(String(128), primary_key=True, nullable=False)
+    raw_payload_id = Column(String(36), primary_key=True, nullable=False)
+    seen_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (Index("ix_graph_provenance_raw_payload_id", "raw_payload_id"),)
+
+
+class HttpValidator(Base):
+    __tablename__ = "http_validators"
+
+    request_key = Column(CHAR(64), primary_key=True, nullable=False)
+    endpoint = Column(String(255), nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    raw_payload_id = Column(String(36), ForeignKey("raw_payloads.id"), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
 class Anchor(Base):
     __tablename__ = "anchors"
 
@@ -1,3 +1,16 @@
+from .driver import Neo4jClient, close_driver, get_driver
+from .stats import collect_graph_stats
+from .write_behind import GraphWriteQueue, node_provenance, record_provenance, replay_dead_letters
 from .writer import Neo4jWriter
 
-__all__ = ["Neo4jWriter"]
+__all__ = [
+    "GraphWriteQueue",
+    "Neo4jClient",
+    "Neo4jWriter",
+    "close_driver",
+    "collect_graph_stats",
+    "get_driver",
+    "node_provenance",
+    "record_provenance",
+    "replay_dead_letters",
+]
@@ -10,4 +10,17 @@ CONSTRAINTS = [
     "CREATE CONSTRAINT unique_party IF NOT EXISTS FOR (n:Party) REQUIRE n.id IS UNIQUE",
     "CREATE CONSTRAINT unique_state IF NOT EXISTS FOR (n:State) REQUIRE n.id IS UNIQUE",
     "CREATE CONSTRAINT unique_committee IF NOT EXISTS FOR (n:Committee) REQUIRE n.id IS UNIQUE",
+    "CREATE CONSTRAINT unique_graph_meta IF NOT EXISTS FOR (n:GraphMeta) REQUIRE n.id IS UNIQUE",
+]
+
+# Range indexes behind the reconcile filters and the writer's lookups by foreign id; year/ano are
+# compared as IN [int, str] because API rows carry ints and dataset fallbacks carry strings.
+INDEXES = [
+    "CREATE RANGE INDEX bill_ano IF NOT EXISTS FOR (n:Bill) ON (n.ano)",
+    "CREATE RANGE INDEX expense_year IF NOT EXISTS FOR (n:Expense) ON (n.year)",
+    "CREATE RANGE INDEX expense_person_id IF NOT EXISTS FOR (n:Expense) ON (n.personId)",
+    "CREATE RANGE INDEX vote_event_data_hora_registro IF NOT EXISTS FOR (n:VoteEvent) ON (n.dataHoraRegistro)",
+    "CREATE RANGE INDEX vote_event_bill_id IF NOT EXISTS FOR (n:VoteEvent) ON (n.billId)",
+    "CREATE RANGE INDEX vote_action_vote_event_id IF NOT EXISTS FOR (n:VoteAction) ON (n.voteEventId)",
+    "CREATE RANGE INDEX vote_action_person_id IF NOT EXISTS FOR (n:VoteAction) ON (n.personId)",
 ]
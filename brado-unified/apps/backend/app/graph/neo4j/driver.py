@@ -1,17 +1,116 @@
 from __future__ import annotations
 
+import atexit
+import os
+from threading import Lock
+from typing import Any
+
 from neo4j import GraphDatabase
 
 from ...core.config import get_settings
+from ...core.observability.metrics import metrics_registry
+
+_lock = Lock()
+_shared: SharedDriver | None = None
+_shared_pid: int | None = None
+_atexit_registered = False
+
+
+def _pool_snapshot(driver: Any) -> tuple[int, int] | None:
+    """(in use, idle) connections of the driver's pool; best effort, the pool is not public API."""
+    pool = getattr(driver, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return None
+    try:
+        all_connections = [connection for per_address in list(connections.values()) for connection in list(per_address)]
+    except RuntimeError:  # resized by another thread mid-copy; the next session updates it
+        return None
+    in_use = sum(1 for connection in all_connections if getattr(connection, "in_use", False))
+    return in_use, len(all_connections) - in_use
+
+
+class _TrackedSession:
+    def __init__(self, owner: SharedDriver, session: Any) -> None:
+        self._owner = owner
+        self._session = session
+
+    def __enter__(self) -> Any:
+        session = self._session.__enter__()
+        metrics_registry.observe_neo4j_session(opened=True)
+        return session
+
+    def __exit__(self, *exc: Any) -> Any:
+        try:
+            return self._session.__exit__(*exc)
+        finally:
+            metrics_registry.observe_neo4j_session(opened=False)
+            self._owner.report_pool()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class SharedDriver:
+    """Process-wide driver; ``session()`` is tracked for metrics and ``close()`` from callers is a no-op."""
+
+    def __init__(self, driver: Any) -> None:
+        self._driver = driver
+
+    def session(self, **kwargs: Any) -> _TrackedSession:
+        return _TrackedSession(self, self._driver.session(**kwargs))
+
+    def report_pool(self) -> None:
+        snapshot = _pool_snapshot(self._driver)
+        if snapshot is not None:
+            metrics_registry.set_neo4j_pool_connections(*snapshot)
+
+    def close(self) -> None:
+        # Shared by every client in the process; only close_driver() shuts it down.
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._driver, name)
+
+
+def get_driver() -> SharedDriver:
+    """The process-wide pooled driver, created on first use (and again in a forked child)."""
+    global _shared, _shared_pid, _atexit_registered
+    with _lock:
+        if _shared is None or _shared_pid != os.getpid():
+            # A driver inherited through fork shares sockets with the parent and must not be reused.
+            settings = get_settings()
+            _shared = SharedDriver(
+                GraphDatabase.driver(
+                    settings.neo4j_uri,
+                    auth=(settings.neo4j_user, settings.neo4j_password),
+                    max_connection_pool_size=settings.neo4j_max_pool_size,
+                    max_connection_lifetime=settings.neo4j_max_connection_lifetime_seconds,
+                    connection_acquisition_timeout=settings.neo4j_connection_acquisition_timeout_seconds,
+                )
+            )
+            _shared_pid = os.getpid()
+            metrics_registry.observe_neo4j_driver_created()
+            if not _atexit_registered:
+                atexit.register(close_driver)
+                _atexit_registered = True
+        return _shared
+
+
+def close_driver() -> None:
+    """Close the shared driver's pool; safe to call more than once (API shutdown, atexit)."""
+    global _shared, _shared_pid
+    with _lock:
+        shared, owner_pid = _shared, _shared_pid
+        _shared = _shared_pid = None
+    if shared is not None and owner_pid == os.getpid():
+        shared._driver.close()
 
 
 class Neo4jClient:
-    def __init__(self) -> None:
-        settings = get_settings()
-        self.driver = GraphDatabase.driver(
-            settings.neo4j_uri,
-            auth=(settings.neo4j_user, settings.neo4j_password),
-        )
+    def __init__(self, driver: Any | None = None) -> None:
+        self.driver = driver or get_driver()
 
     def close(self) -> None:
-        self.driver.close()
+        # The pooled driver outlives the client; see close_driver().
+        return None
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+# Operators that read every node of a label (or of the whole store) instead of an index or the count store.
+LABEL_SCAN_OPERATORS = frozenset(
+    {
+        "AllNodesScan",
+        "NodeByLabelScan",
+        "UnionNodeByLabelsScan",
+        "IntersectionNodeByLabelsScan",
+        "SubtractionNodeByLabelsScan",
+        "PartitionedAllNodesScan",
+        "PartitionedNodeByLabelScan",
+    }
+)
+
+
+def plan_operators(plan: Mapping[str, Any] | None) -> list[str]:
+    """Operator names of an EXPLAIN plan, depth first, without the ``@neo4j`` runtime suffix."""
+    if not plan:
+        return []
+    operators = [str(plan.get("operatorType", "")).split("@", 1)[0]]
+    for child in plan.get("children") or []:
+        operators.extend(plan_operators(child))
+    return operators
+
+
+def label_scans(driver: Any, queries: Mapping[str, tuple[str, dict[str, Any]]]) -> dict[str, list[str]]:
+    """EXPLAIN each named query and return those whose plan contains a label scan, with the offending operators."""
+    offenders: dict[str, list[str]] = {}
+    with driver.session() as session:
+        for name, (query, params) in queries.items():
+            plan = session.run(f"EXPLAIN {query}", **params).consume().plan
+            scans = [operator for operator in plan_operators(plan) if operator in LABEL_SCAN_OPERATORS]
+            if scans:
+                offenders[name] = scans
+    return offenders
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+GRAPH_META_ID = "graph"
+UNIQUE_LABELS = ("Person", "Bill", "VoteEvent", "VoteAction", "Expense", "Organization", "Party", "State")
+
+# Run in its own transaction once per write-behind flush, checkpoint wait, close or dead-letter replay (not per chunk),
+# so the version can lag the data by at most the writes still in flight.
+BUMP_GRAPH_VERSION = """
+MERGE (m:GraphMeta {id: $meta_id})
+SET m.version = coalesce(m.version, 0) + 1,
+    m.updatedAt = $now
+"""
+
+READ_GRAPH_META = """
+OPTIONAL MATCH (m:GraphMeta {id: $meta_id})
+RETURN coalesce(m.version, 0) AS version, m.stats AS stats, m.statsVersion AS statsVersion
+"""
+
+STORE_GRAPH_STATS = """
+MERGE (m:GraphMeta {id: $meta_id})
+SET m.stats = $stats,
+    m.statsVersion = $version,
+    m.statsComputedAt = $now
+"""
+
+# Every reconcile counter in one round trip. Node totals come from the count store; orphans are counted per
+# node (walked through the uniqueness or billId index, each checked against its own degree), so a node with two
+# links cannot hide one without; per-year groupings and duplicate scans use the range/uniqueness indexes.
+# None of the subqueries reads a label.
+_DUPLICATES = "\n".join(
+    f"CALL {{ MATCH (n:{label}) WHERE n.id IS NOT NULL WITH n.id AS id, count(*) AS c WHERE c > 1 "
+    f"RETURN count(*) AS duplicates_{label.lower()} }}"
+    for label in UNIQUE_LABELS
+)
+GRAPH_STATS = f"""
+CALL {{ MATCH (n:Person) RETURN count(n) AS persons }}
+CALL {{ MATCH (n:VoteAction) RETURN count(n) AS vote_actions }}
+CALL {{ MATCH (n:Expense) RETURN count(n) AS expenses }}
+CALL {{
+    MATCH (va:VoteAction) WHERE va.id IS NOT NULL AND NOT EXISTS {{ (va)-[:IN_EVENT]->() }}
+    RETURN count(va) AS vote_actions_without_event
+}}
+CALL {{
+    MATCH (va:VoteAction) WHERE va.id IS NOT NULL AND NOT EXISTS {{ ()-[:CAST]->(va) }}
+    RETURN count(va) AS vote_actions_without_person
+}}
+CALL {{
+    MATCH (e:Expense) WHERE e.id IS NOT NULL AND NOT EXISTS {{ ()-[:HAS_EXPENSE]->(e) }}
+    RETURN count(e) AS expenses_without_person
+}}
+CALL {{
+    MATCH (v:VoteEvent) WHERE v.billId IS NOT NULL AND NOT EXISTS {{ (v)-[:ON_BILL]->(:Bill {{id: v.billId}}) }}
+    RETURN count(v) AS vote_events_without_bill
+}}
+CALL {{
+    MATCH (e:Expense) USING INDEX e:Expense(year) WHERE e.year IN $years
+    MATCH (p:Person)-[:HAS_EXPENSE]->(e)
+    RETURN count(DISTINCT p) AS expense_people
+}}
+CALL {{ MATCH (b:Bill) WHERE b.ano IS NOT NULL WITH toString(b.ano) AS year, count(*) AS c RETURN collect([year, c]) AS bills_by_year }}
+CALL {{
+    MATCH (v:VoteEvent) WHERE v.dataHoraRegistro IS NOT NULL
+    WITH left(v.dataHoraRegistro, 4) AS year, count(*) AS c
+    RETURN collect([year, c]) AS votes_by_year
+}}
+CALL {{ MATCH (e:Expense) WHERE e.year IS NOT NULL WITH toString(e.year) AS year, count(*) AS c RETURN collect([year, c]) AS expenses_by_year }}
+{_DUPLICATES}
+RETURN *
+"""
+
+COUNTERS = (
+    "persons",
+    "vote_actions",
+    "expenses",
+    "vote_actions_without_event",
+    "vote_actions_without_person",
+    "expenses_without_person",
+    "vote_events_without_bill",
+    "expense_people",
+)
+BY_YEAR = ("bills_by_year", "votes_by_year", "expenses_by_year")
+# Part of every cached stats document; a cache written with other counters is recomputed.
+STATS_SCHEMA = 2
+
+
+def year_values(*years: int) -> list[Any]:
+    """Years as stored: ints from the API, strings from the dataset fallbacks."""
+    return [value for year in years for value in (year, str(year))]
+
+
+def _by_year(pairs: Any) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for year, count in pairs or []:
+        totals[str(year)] = totals.get(str(year), 0) + int(count)
+    return totals
+
+
+def collect_graph_stats(driver: Any, *, expense_years: Sequence[int], refresh: bool = False) -> dict[str, Any]:
+    """Reconcile counters for the whole graph, cached on the GraphMeta node until the graph version moves.
+
+    ``expense_people`` counts people with an expense in ``expense_years``; a cache built for other years is
+    recomputed. The version is read before computing, so a write racing the computation only makes the next
+    read recompute.
+    """
+    years = sorted(int(year) for year in expense_years)
+    with driver.session() as session:
+        meta = session.run(READ_GRAPH_META, meta_id=GRAPH_META_ID).single()
+        version = int(meta["version"] or 0) if meta is not None else 0
+        if not refresh and meta is not None and meta["stats"] and meta["statsVersion"] == version:
+            cached = json.loads(meta["stats"])
+            if cached.get("expense_years") == years and cached.get("schema") == STATS_SCHEMA:
+                return {**cached, "cached": True}
+
+        row = session.run(GRAPH_STATS, years=year_values(*years)).single()
+        stats: dict[str, Any] = {counter: int(row[counter] or 0) for counter in COUNTERS}
+        stats.update({name: _by_year(row[name]) for name in BY_YEAR})
+        stats["duplicates"] = {label: int(row[f"duplicates_{label.lower()}"] or 0) for label in UNIQUE_LABELS}
+        stats.update({"schema": STATS_SCHEMA, "expense_years": years, "version": version, "computed_at": datetime.now(UTC).isoformat()})
+        session.run(STORE_GRAPH_STATS, meta_id=GRAPH_META_ID, stats=json.dumps(stats), version=version, now=stats["computed_at"]).consume()
+    return {**stats, "cached": False}
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import logging
+import queue
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from threading import Condition, Lock, Thread
+from typing import Any
+
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+from sqlalchemy import select
+
+from ...core.config import get_settings
+from ...core.observability.metrics import metrics_registry
+from ...db.sql.models import GraphDeadLetter, GraphProvenance
+from .writer import Neo4jWriter, NodeRows
+
+logger = logging.getLogger("app.graph.write_behind")
+
+TRANSIENT_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+OPERATIONS = ("upsert_persons", "upsert_bills", "upsert_vote_events", "upsert_vote_actions", "upsert_expenses")
+# Labels that keep a bounded ``rawRefs`` ring; VoteAction/Expense carry their single rawRef on the node.
+PROVENANCE_OPERATIONS = ("upsert_persons", "upsert_bills", "upsert_vote_events")
+_STOP = object()
+
+
+def _default_session_factory() -> Any:
+    from ...db.sql import SessionLocal
+
+    return SessionLocal()
+
+
+def record_provenance(session: Any, rows: list[tuple[dict[str, Any], str | None]]) -> None:
+    """Add (node id, raw payload id) pairs to graph_provenance, ignoring pairs already recorded; the caller commits."""
+    pairs = {(node["id"], raw_ref) for node, raw_ref in rows if raw_ref}
+    if not pairs:
+        return
+    values = [{"node_id": node_id, "raw_payload_id": raw_ref} for node_id, raw_ref in sorted(pairs)]
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for value in values:
+            if session.get(GraphProvenance, (value["node_id"], value["raw_payload_id"])) is None:
+                session.add(GraphProvenance(**value))
+        return
+    session.execute(dialect_insert(GraphProvenance).on_conflict_do_nothing(), values)
+
+
+def node_provenance(session: Any, node_id: str, *, limit: int = 100) -> list[dict[str, Any]]:
+    """Raw payloads a node was written from, newest first."""
+    rows = session.execute(
+        select(GraphProvenance.raw_payload_id, GraphProvenance.seen_at)
+        .where(GraphProvenance.node_id == node_id)
+        .order_by(GraphProvenance.seen_at.desc(), GraphProvenance.raw_payload_id)
+        .limit(limit)
+    )
+    return [{"raw_payload_id": raw_payload_id, "seen_at": seen_at} for raw_payload_id, seen_at in rows]
+
+
+class GraphWriteQueue:
+    """Write-behind front for ``Neo4jWriter``: ingestion enqueues row batches and one background thread writes them.
+
+    Batches are written in FIFO order, so a vote event enqueued before its actions
+    is also committed first. Transient Neo4j errors are retried with exponential
+    backoff; a batch that still fails is parked in ``graph_dead_letters`` (split
+    into single rows first when the error is not transient, so one poison record
+    does not take its neighbours with it). Written rows are added to
+    ``graph_provenance`` (hot labels only). A full queue blocks the producer.
+
+    A batch that can be neither written nor parked (say the dead-letter insert
+    fails) is lost; the error is kept and raised by the next ``flush()`` or
+    ``close()``, so the ingestion batch fails instead of committing without it.
+    """
+
+    def __init__(
+        self,
+        writer: Neo4jWriter | None = None,
+        *,
+        session_factory: Callable[[], Any] | None = None,
+        maxsize: int | None = None,
+        max_retries: int | None = None,
+        backoff_seconds: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.writer = writer or Neo4jWriter()
+        self._session_factory = session_factory or _default_session_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize or settings.graph_write_queue_size))
+        self._max_retries = settings.graph_write_max_retries if max_retries is None else max_retries
+        self._backoff = settings.graph_write_backoff_seconds if backoff_seconds is None else backoff_seconds
+        self._lock = Lock()
+        self._lost: Exception | None = None
+        # Batches are numbered as they are enqueued; the writer thread acknowledges them in the same (FIFO) order.
+        self._submit_lock = Lock()
+        self._acked = Condition()
+        self.submitted = 0
+        self.acknowledged = 0
+        self.stats = {"batches": 0, "rows": 0, "retries": 0, "dead_lettered": 0}
+        self._thread = Thread(target=self._run, name="graph-write-behind", daemon=True)
+        self._thread.start()
+
+    def ensure_constraints(self) -> None:
+        self.writer.ensure_constraints()
+
+    def upsert_persons(self, rows: NodeRows) -> None:
+        self._submit("upsert_persons", rows)
+
+    def upsert_bills(self, rows: NodeRows) -> None:
+        self._submit("upsert_bills", rows)
+
+    def upsert_vote_events(self, rows: NodeRows) -> None:
+        self._submit("upsert_vote_events", rows)
+
+    def upsert_vote_actions(self, rows: NodeRows) -> None:
+        self._submit("upsert_vote_actions", rows)
+
+    def upsert_expenses(self, rows: NodeRows) -> None:
+        self._submit("upsert_expenses", rows)
+
+    def graph_stats(self) -> dict[str, int]:
+        """Queue counters merged with the writer's (unchanged nodes, dimension merges avoided)."""
+        with self._lock:
+            return {**getattr(self.writer, "stats", {}), **self.stats}
+
+    def flush(self) -> None:
+        """Block until every batch enqueued so far has been written or dead-lettered, then bump the graph version.
+
+        Raises if a batch was lost since the previous flush.
+        """
+        self._queue.join()
+        self._bump_version()
+        self._raise_lost()
+
+    def wait_for(self, seq: int) -> None:
+        """Block until batches up to ``seq`` (a ``submitted`` value) are written or dead-lettered; later ones keep flowing.
+
+        Raises like ``flush()`` if a batch was lost.
+        """
+        with self._acked:
+            self._acked.wait_for(lambda: self.acknowledged >= seq)
+        self._bump_version()
+        self._raise_lost()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._bump_version()
+        self.writer.close()
+        self._raise_lost()
+
+    def _raise_lost(self) -> None:
+        with self._lock:
+            lost, self._lost = self._lost, None
+        if lost is not None:
+            raise RuntimeError(f"graph write-behind lost a batch: {lost}") from lost
+
+    def _bump_version(self) -> None:
+        try:
+            self.writer.bump_version()
+        except Exception:  # cached graph stats only go stale until the next bump; never fail the flush for it
+            logger.exception("graph version bump failed")
+
+    def _submit(self, operation: str, rows: NodeRows) -> None:
+        rows = list(rows)
+        if not rows:
+            return
+        # Numbering and enqueueing together keeps the queue in sequence order across producer threads.
+        with self._submit_lock:
+            self.submitted += 1
+            self._queue.put((self.submitted, operation, rows))
+        metrics_registry.set_graph_write_queue_depth(self._queue.qsize())
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._deliver(*item[1:])
+            except Exception as exc:  # the writer thread must survive anything, or flush() would block forever
+                logger.exception("graph write-behind batch lost")
+                with self._lock:
+                    self._lost = self._lost or exc
+            finally:
+                if item is not _STOP:
+                    with self._acked:
+                        self.acknowledged = item[0]
+                        self._acked.notify_all()
+                self._queue.task_done()
+                metrics_registry.set_graph_write_queue_depth(self._queue.qsize())
+
+    def _deliver(self, operation: str, rows: list[tuple[dict[str, Any], str | None]]) -> None:
+        write = getattr(self.writer, operation)
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                write(rows)
+                self._count(batches=1, rows=len(rows))
+                self._provenance(operation, rows)
+                return
+            except TRANSIENT_ERRORS as exc:
+                if attempts > self._max_retries:
+                    self._park(operation, [(row, exc) for row in rows], attempts)
+                    return
+                self._count(retries=1)
+                metrics_registry.observe_graph_write_retry(operation)
+                time.sleep(self._backoff * 2 ** (attempts - 1))
+            except Exception as exc:
+                if len(rows) == 1:
+                    self._park(operation, [(rows[0], exc)], attempts)
+                    return
+                self._isolate(operation, rows)
+                return
+
+    def _isolate(self, operation: str, rows: list[tuple[dict[str, Any], str | None]]) -> None:
+        write = getattr(self.writer, operation)
+        failed: list[tuple[tuple[dict[str, Any], str | None], Exception]] = []
+        written: list[tuple[dict[str, Any], str | None]] = []
+        for row in rows:
+            try:
+                write([row])
+                written.append(row)
+            except Exception as exc:
+                failed.append((row, exc))
+        self._count(batches=1, rows=len(written))
+        self._provenance(operation, written)
+        self._park(operation, failed, 1)
+
+    def _provenance(self, operation: str, rows: list[tuple[dict[str, Any], str | None]]) -> None:
+        if operation not in PROVENANCE_OPERATIONS or not any(raw_ref for _node, raw_ref in rows):
+            return
+        session = self._session_factory()
+        try:
+            record_provenance(session, rows)
+            session.commit()
+        finally:
+            session.close()
+
+    def _park(self, operation: str, failed: list[tuple[tuple[dict[str, Any], str | None], Exception]], attempts: int) -> None:
+        if not failed:
+            return
+        session = self._session_factory()
+        try:
+            session.add_all(
+                GraphDeadLetter(
+                    operation=operation,
+                    node_json=node,
+                    raw_ref=raw_ref,
+                    error=f"{type(exc).__name__}: {exc}"[:4000],
+                    attempts=attempts,
+                )
+                for (node, raw_ref), exc in failed
+            )
+            session.commit()
+        finally:
+            session.close()
+        self._count(dead_lettered=len(failed))
+        metrics_registry.observe_graph_dead_letters(operation, len(failed))
+
+    def _count(self, **amounts: int) -> None:
+        with self._lock:
+            for key, amount in amounts.items():
+                self.stats[key] += amount
+
+
+def replay_dead_letters(session: Any, writer: Neo4jWriter, *, limit: int | None = None, chunk_size: int = 500) -> dict[str, Any]:
+    """Re-send pending dead letters oldest first; successes get ``replayed_at``, failures keep their row with the new error."""
+    query = select(GraphDeadLetter.id).where(GraphDeadLetter.replayed_at.is_(None)).order_by(GraphDeadLetter.created_at, GraphDeadLetter.id)
+    if limit is not None:
+        query = query.limit(limit)
+    # Ids are fixed up front so rows that fail again are not picked up twice in the same run.
+    pending = list(session.scalars(query))
+    replayed = failed = 0
+    for start in range(0, len(pending), chunk_size):
+        letters = session.scalars(select(GraphDeadLetter).where(GraphDeadLetter.id.in_(pending[start : start + chunk_size]))).all()
+        by_operation: dict[str, list[GraphDeadLetter]] = {}
+        for letter in letters:
+            by_operation.setdefault(letter.operation, []).append(letter)
+        now = datetime.now(UTC)
+        for operation, group in by_operation.items():
+            write = getattr(writer, operation) if operation in OPERATIONS else None
+            for letter in group:
+                try:
+                    if write is None:
+                        raise ValueError(f"unknown graph operation: {operation}")
+                    write([(letter.node_json, letter.raw_ref)])
+                    if operation in PROVENANCE_OPERATIONS:
+                        record_provenance(session, [(letter.node_json, letter.raw_ref)])
+                    letter.replayed_at = now
+                    replayed += 1
+                except Exception as exc:
+                    letter.error = f"{type(exc).__name__}: {exc}"[:4000]
+                    letter.attempts = int(letter.attempts or 0) + 1
+                    failed += 1
+        session.commit()
+    if replayed:
+        writer.bump_version()
+    return {"pending": len(pending), "replayed": replayed, "failed": failed}
@@ -1,161 +1,351 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
 from typing import Any
 
-from .constraints import CONSTRAINTS
+from ...core.config import get_settings
+from ...proof.hashing import sha256_json_canonical
+from .constraints import CONSTRAINTS, INDEXES
 from .driver import Neo4jClient
+from .stats import BUMP_GRAPH_VERSION, GRAPH_META_ID
+
+# (node, raw_ref) pairs, as produced by the normalizers plus the raw payload id they came from.
+NodeRows = Iterable[tuple[dict[str, Any], str | None]]
+
+# Only the $keep most recent refs stay on the node, so the membership check and the rewrite are
+# bounded; the full history lives in the SQL graph_provenance table.
+_RAW_REFS = """
+    CASE
+        WHEN row.raw_ref IS NULL OR row.raw_ref IN coalesce({var}.rawRefs, []) THEN coalesce({var}.rawRefs, [])[-$keep..]
+        ELSE (coalesce({var}.rawRefs, []) + row.raw_ref)[-$keep..]
+    END
+"""
+
+# Statements that store ``contentHash`` return the ids they stored it for. Where a node links to
+# another one that may not exist yet (VoteEvent, Person, Bill), the hash is only set once the link
+# is in place: a row whose endpoint is missing keeps its old hash and is rewritten on the next run.
+UPSERT_PERSONS = f"""
+UNWIND $rows AS row
+MERGE (p:Person {{id: row.id}})
+SET p += row.props,
+    p.contentHash = row.hash,
+    p.lastSeenAt = $now,
+    p.rawRefs = {_RAW_REFS.format(var="p")}
+RETURN p.id AS id
+"""
+
+# Party, State and Organization nodes are created by ENSURE_DIMENSIONS first, so links only MATCH them.
+LINK_PERSON_PARTIES = """
+UNWIND $rows AS row
+WITH row WHERE row.party_id IS NOT NULL
+MATCH (party:Party {id: row.party_id})
+MATCH (p:Person {id: row.id})
+MERGE (p)-[:MEMBER_OF]->(party)
+"""
+
+LINK_PERSON_STATES = """
+UNWIND $rows AS row
+WITH row WHERE row.state_id IS NOT NULL
+MATCH (s:State {id: row.state_id})
+MATCH (p:Person {id: row.id})
+MERGE (p)-[:REPRESENTS]->(s)
+"""
+
+UPSERT_BILLS = f"""
+UNWIND $rows AS row
+MERGE (b:Bill {{id: row.id}})
+SET b += row.props,
+    b.contentHash = row.hash,
+    b.lastSeenAt = $now,
+    b.rawRefs = {_RAW_REFS.format(var="b")}
+RETURN b.id AS id
+"""
+
+UPSERT_VOTE_EVENTS = f"""
+UNWIND $rows AS row
+MERGE (v:VoteEvent {{id: row.id}})
+SET v += row.props,
+    v.lastSeenAt = $now,
+    v.rawRefs = {_RAW_REFS.format(var="v")}
+"""
+
+LINK_VOTE_EVENT_BILLS = """
+UNWIND $rows AS row
+MATCH (v:VoteEvent {id: row.id})
+OPTIONAL MATCH (b:Bill {id: row.bill_id})
+WITH row, v, b WHERE row.bill_id IS NULL OR b IS NOT NULL
+FOREACH (_ IN CASE WHEN b IS NULL THEN [] ELSE [1] END | MERGE (v)-[:ON_BILL]->(b))
+SET v.contentHash = row.hash
+RETURN v.id AS id
+"""
+
+UPSERT_VOTE_ACTIONS = """
+UNWIND $rows AS row
+MERGE (va:VoteAction {id: row.id})
+SET va += row.props
+WITH row, va
+MATCH (v:VoteEvent {id: row.vote_event_id})
+MATCH (p:Person {id: row.person_id})
+MERGE (va)-[:IN_EVENT]->(v)
+MERGE (p)-[:CAST]->(va)
+SET va.contentHash = row.hash
+RETURN va.id AS id
+"""
+
+UPSERT_EXPENSES = """
+UNWIND $rows AS row
+MERGE (e:Expense {id: row.id})
+SET e += row.props
+WITH row, e
+MATCH (p:Person {id: row.person_id})
+MERGE (p)-[:HAS_EXPENSE]->(e)
+WITH row, e
+MATCH (o:Organization {id: row.organization_id})
+MERGE (e)-[:PAID_TO]->(o)
+SET e.contentHash = row.hash
+RETURN e.id AS id
+"""
+
+ENSURE_DIMENSIONS = """
+UNWIND $rows AS row
+MERGE (d:{label} {{id: row.id}})
+SET d += row.props
+"""
+
+# Dimension nodes referenced by each node label: (dimension label, id key, {property: row key}).
+DIMENSIONS: dict[str, list[tuple[str, str, dict[str, str]]]] = {
+    "Person": [("Party", "party_id", {"sigla": "party"}), ("State", "state_id", {"uf": "state"})],
+    "Expense": [("Organization", "organization_id", {"name": "supplier_name"})],
+}
+
+# ``label`` is always one of the node labels above, never caller input.
+FETCH_HASHES = """
+UNWIND $ids AS id
+MATCH (n:{label} {{id: id}})
+RETURN n.id AS id, n.contentHash AS hash
+"""
+
+TOUCH_LAST_SEEN = """
+UNWIND $ids AS id
+MATCH (n:{label} {{id: id}})
+SET n.lastSeenAt = $now
+"""
+
+
+def content_hash(node: dict[str, Any]) -> str:
+    """Canonical hash of the normalized node; the raw ref is left out so a re-fetch of the same content matches."""
+    return sha256_json_canonical(node)
+
+
+def _read_hashes(tx: Any, statement: str, ids: list[str]) -> dict[str, str | None]:
+    return {record["id"]: record["hash"] for record in tx.run(statement, ids=ids)}
+
+
+def _touch_chunk(tx: Any, statement: str, ids: list[str], now: str) -> None:
+    tx.run(statement, ids=ids, now=now).consume()
+
+
+def _write_chunk(
+    tx: Any,
+    statements: Sequence[str],
+    rows: list[dict[str, Any]],
+    now: str,
+    keep: int,
+    dimensions: Sequence[tuple[str, list[dict[str, Any]]]] = (),
+) -> set[str]:
+    """Write one chunk; returns the ids whose ``contentHash`` was stored (links in place)."""
+    for statement, dimension_rows in dimensions:
+        tx.run(statement, rows=dimension_rows).consume()
+    hashed: set[str] = set()
+    for statement in statements:
+        hashed.update(record["id"] for record in tx.run(statement, rows=rows, now=now, keep=keep))
+    return hashed
+
+
+def _bump_version(tx: Any, now: str) -> None:
+    tx.run(BUMP_GRAPH_VERSION, meta_id=GRAPH_META_ID, now=now).consume()
 
 
 class Neo4jWriter:
-    def __init__(self) -> None:
-        self.client = Neo4jClient()
+    """Graph upserts sent as ``UNWIND $rows`` statements, ``batch_size`` rows per write transaction.
+
+    Each node stores ``contentHash`` (see ``content_hash``) once its links exist. Rows
+    whose hash matches the stored one are not rewritten; labels that track ``lastSeenAt`` only get that
+    property touched, in bulk. Hashes seen during the writer's lifetime (one
+    ingestion run) are cached so repeated nodes cost no round trip at all.
+
+    Party, State and Organization nodes are merged once per run: ids already
+    ensured are remembered and only new ones are created, in bulk, ahead of the
+    link statements. ``stats["dimension_merges_avoided"]`` counts the rest.
+
+    Writes do not touch the GraphMeta version themselves (one hot node would serialize
+    every writer); the owner calls ``bump_version`` once per flush or batch.
+    """
+
+    def __init__(self, client: Neo4jClient | None = None, batch_size: int | None = None) -> None:
+        self.client = client or Neo4jClient()
+        settings = get_settings()
+        self.batch_size = max(1, batch_size or settings.neo4j_write_batch_size)
+        self.raw_refs_keep = max(1, settings.graph_raw_refs_keep)
+        self._hashes: dict[str, str | None] = {}
+        self._dimensions: set[str] = set()
+        self._unversioned = False
+        self.stats = {"written": 0, "unchanged": 0, "unlinked": 0, "dimension_merges": 0, "dimension_merges_avoided": 0}
 
     def close(self) -> None:
         self.client.close()
 
     def ensure_constraints(self) -> None:
         with self.client.driver.session() as session:
-            for statement in CONSTRAINTS:
+            for statement in [*CONSTRAINTS, *INDEXES]:
                 session.run(statement)
 
-    def upsert_person(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
-        now = datetime.now(timezone.utc).isoformat()
+    def _chunks(self, items: list[Any]) -> Iterable[list[Any]]:
+        for start in range(0, len(items), self.batch_size):
+            yield items[start : start + self.batch_size]
+
+    def _write(self, label: str, statements: Sequence[str], rows: list[dict[str, Any]], *, touch: bool = False) -> None:
+        if not rows:
+            return
+        now = datetime.now(UTC).isoformat()
         with self.client.driver.session() as session:
-            session.run(
-                """
-                MERGE (p:Person {id: $id})
-                SET p += $props,
-                    p.lastSeenAt = $now,
-                    p.rawRefs = CASE
-                        WHEN $raw_ref IS NULL THEN coalesce(p.rawRefs, [])
-                        WHEN p.rawRefs IS NULL THEN [$raw_ref]
-                        WHEN $raw_ref IN p.rawRefs THEN p.rawRefs
-                        ELSE p.rawRefs + $raw_ref
-                    END
-                """,
-                id=node["id"],
-                props=node,
-                now=now,
-                raw_ref=raw_ref,
-            )
-
-            if node.get("party"):
-                party_id = f"camara:party:{node['party']}"
-                session.run(
-                    """
-                    MERGE (party:Party {id:$party_id})
-                    SET party.sigla = $sigla
-                    WITH party
-                    MATCH (p:Person {id:$person_id})
-                    MERGE (p)-[:MEMBER_OF]->(party)
-                    """,
-                    party_id=party_id,
-                    sigla=node["party"],
-                    person_id=node["id"],
-                )
-
-            if node.get("state"):
-                state_id = f"camara:state:{node['state']}"
-                session.run(
-                    """
-                    MERGE (s:State {id:$state_id})
-                    SET s.uf = $uf
-                    WITH s
-                    MATCH (p:Person {id:$person_id})
-                    MERGE (p)-[:REPRESENTS]->(s)
-                    """,
-                    state_id=state_id,
-                    uf=node["state"],
-                    person_id=node["id"],
-                )
+            unknown = list({row["id"] for row in rows if row["id"] not in self._hashes})
+            for ids in self._chunks(unknown):
+                found = session.execute_read(_read_hashes, FETCH_HASHES.format(label=label), ids)
+                self._hashes.update((node_id, found.get(node_id)) for node_id in ids)
 
-    def upsert_bill(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
-        now = datetime.now(timezone.utc).isoformat()
+            changed = [row for row in rows if self._hashes[row["id"]] != row["hash"]]
+            unchanged = list({row["id"] for row in rows} - {row["id"] for row in changed})
+            for chunk in self._chunks(changed):
+                dimensions, ensured = self._new_dimensions(label, chunk)
+                # execute_write retries the whole chunk on transient errors.
+                hashed = session.execute_write(_write_chunk, statements, chunk, now, self.raw_refs_keep, dimensions)
+                # Rows left without their links keep no cached hash, so they are written again.
+                self._hashes.update((row["id"], row["hash"] if row["id"] in hashed else None) for row in chunk)
+                self.stats["unlinked"] += len({row["id"] for row in chunk} - hashed)
+                self._dimensions.update(ensured)
+            if touch:
+                for ids in self._chunks(unchanged):
+                    session.execute_write(_touch_chunk, TOUCH_LAST_SEEN.format(label=label), ids, now)
+        if changed:
+            self._unversioned = True
+        self.stats["written"] += len(changed)
+        self.stats["unchanged"] += len(rows) - len(changed)
+
+    def bump_version(self) -> None:
+        """Move the GraphMeta version once for everything written since the last call, invalidating cached stats."""
+        if not self._unversioned:
+            return
+        # Cleared first: a write landing meanwhile sets it again and is covered by the next bump.
+        self._unversioned = False
         with self.client.driver.session() as session:
-            session.run(
-                """
-                MERGE (b:Bill {id:$id})
-                SET b += $props,
-                    b.lastSeenAt = $now,
-                    b.rawRefs = CASE
-                        WHEN $raw_ref IS NULL THEN coalesce(b.rawRefs, [])
-                        WHEN b.rawRefs IS NULL THEN [$raw_ref]
-                        WHEN $raw_ref IN b.rawRefs THEN b.rawRefs
-                        ELSE b.rawRefs + $raw_ref
-                    END
-                """,
-                id=node["id"],
-                props=node,
-                now=now,
-                raw_ref=raw_ref,
-            )
+            session.execute_write(_bump_version, datetime.now(UTC).isoformat())
+
+    def _new_dimensions(self, label: str, rows: list[dict[str, Any]]) -> tuple[list[tuple[str, list[dict[str, Any]]]], set[str]]:
+        """ENSURE_DIMENSIONS statements for dimension ids not yet merged in this run, plus those ids."""
+        statements: list[tuple[str, list[dict[str, Any]]]] = []
+        ensured: set[str] = set()
+        for dimension, id_key, props in DIMENSIONS.get(label, []):
+            new: dict[str, dict[str, Any]] = {}
+            referenced = 0
+            for row in rows:
+                dimension_id = row.get(id_key)
+                if dimension_id is None:
+                    continue
+                referenced += 1
+                if dimension_id not in self._dimensions and dimension_id not in new:
+                    new[dimension_id] = {"id": dimension_id, "props": {prop: row.get(key) for prop, key in props.items()}}
+            if new:
+                statements.append((ENSURE_DIMENSIONS.format(label=dimension), list(new.values())))
+                ensured.update(new)
+            self.stats["dimension_merges"] += len(new)
+            self.stats["dimension_merges_avoided"] += referenced - len(new)
+        return statements, ensured
+
+    def upsert_persons(self, rows: NodeRows) -> None:
+        self._write(
+            "Person",
+            [UPSERT_PERSONS, LINK_PERSON_PARTIES, LINK_PERSON_STATES],
+            [
+                {
+                    "id": node["id"],
+                    "props": node,
+                    "hash": content_hash(node),
+                    "raw_ref": raw_ref,
+                    "party": node.get("party") or None,
+                    "party_id": f"camara:party:{node['party']}" if node.get("party") else None,
+                    "state": node.get("state") or None,
+                    "state_id": f"camara:state:{node['state']}" if node.get("state") else None,
+                }
+                for node, raw_ref in rows
+            ],
+            touch=True,
+        )
+
+    def upsert_bills(self, rows: NodeRows) -> None:
+        self._write(
+            "Bill",
+            [UPSERT_BILLS],
+            [{"id": node["id"], "props": node, "hash": content_hash(node), "raw_ref": raw_ref} for node, raw_ref in rows],
+            touch=True,
+        )
+
+    def upsert_vote_events(self, rows: NodeRows) -> None:
+        self._write(
+            "VoteEvent",
+            [UPSERT_VOTE_EVENTS, LINK_VOTE_EVENT_BILLS],
+            [
+                {"id": node["id"], "props": node, "hash": content_hash(node), "raw_ref": raw_ref, "bill_id": node.get("billId") or None}
+                for node, raw_ref in rows
+            ],
+            touch=True,
+        )
+
+    def upsert_vote_actions(self, rows: NodeRows) -> None:
+        self._write(
+            "VoteAction",
+            [UPSERT_VOTE_ACTIONS],
+            [
+                {
+                    "id": node["id"],
+                    "props": {**node, "rawRef": raw_ref},
+                    "hash": content_hash(node),
+                    "vote_event_id": node["voteEventId"],
+                    "person_id": node["personId"],
+                }
+                for node, raw_ref in rows
+            ],
+        )
+
+    def upsert_expenses(self, rows: NodeRows) -> None:
+        self._write(
+            "Expense",
+            [UPSERT_EXPENSES],
+            [
+                {
+                    "id": node["id"],
+                    "props": {**node, "rawRef": raw_ref},
+                    "hash": content_hash(node),
+                    "person_id": node["personId"],
+                    "organization_id": node["organizationId"],
+                    "supplier_name": node.get("supplierName"),
+                }
+                for node, raw_ref in rows
+            ],
+        )
+
+    def upsert_person(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
+        self.upsert_persons([(node, raw_ref)])
+
+    def upsert_bill(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
+        self.upsert_bills([(node, raw_ref)])
 
     def upsert_vote_event(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
-        now = datetime.now(timezone.utc).isoformat()
-        with self.client.driver.session() as session:
-            session.run(
-                """
-                MERGE (v:VoteEvent {id:$id})
-                SET v += $props,
-                    v.lastSeenAt = $now,
-                    v.rawRefs = CASE
-                        WHEN $raw_ref IS NULL THEN coalesce(v.rawRefs, [])
-                        WHEN v.rawRefs IS NULL THEN [$raw_ref]
-                        WHEN $raw_ref IN v.rawRefs THEN v.rawRefs
-                        ELSE v.rawRefs + $raw_ref
-                    END
-                """,
-                id=node["id"],
-                props=node,
-                now=now,
-                raw_ref=raw_ref,
-            )
-            if node.get("billId"):
-                session.run(
-                    """
-                    MATCH (v:VoteEvent {id:$vote_event_id})
-                    MATCH (b:Bill {id:$bill_id})
-                    MERGE (v)-[:ON_BILL]->(b)
-                    """,
-                    vote_event_id=node["id"],
-                    bill_id=node["billId"],
-                )
+        self.upsert_vote_events([(node, raw_ref)])
 
     def upsert_vote_action(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
-        with self.client.driver.session() as session:
-            session.run(
-                """
-                MERGE (va:VoteAction {id:$id})
-                SET va += $props
-                WITH va
-                MATCH (v:VoteEvent {id:$vote_event_id})
-                MATCH (p:Person {id:$person_id})
-                MERGE (va)-[:IN_EVENT]->(v)
-                MERGE (p)-[:CAST]->(va)
-                """,
-                id=node["id"],
-                props={**node, "rawRef": raw_ref},
-                vote_event_id=node["voteEventId"],
-                person_id=node["personId"],
-            )
+        self.upsert_vote_actions([(node, raw_ref)])
 
     def upsert_expense(self, node: dict[str, Any], raw_ref: str | None = None) -> None:
-        with self.client.driver.session() as session:
-            session.run(
-                """
-                MERGE (e:Expense {id:$id})
-                SET e += $props
-                WITH e
-                MATCH (p:Person {id:$person_id})
-                MERGE (p)-[:HAS_EXPENSE]->(e)
-                MERGE (o:Organization {id:$organization_id})
-                SET o.name = $supplier_name
-                MERGE (e)-[:PAID_TO]->(o)
-                """,
-                id=node["id"],
-                props={**node, "rawRef": raw_ref},
-                person_id=node["personId"],
-                organization_id=node["organizationId"],
-                supplier_name=node.get("supplierName"),
-            )
+        self.upsert_expenses([(node, raw_ref)])
@@ -1,3 +1,4 @@
+from .async_client import AsyncCamaraClient
 from .client import CamaraClient
 
-__all__ = ["CamaraClient"]
+__all__ = ["AsyncCamaraClient", "CamaraClient"]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from collections.abc import Sequence
+from typing import Any
+
+import httpx
+
+from ...core.config import get_settings
+from .client import adaptive_bucket, backoff_seconds, observe_throttling, open_vcr_store
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncCamaraClient:
+    def __init__(self, *, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        settings = get_settings()
+        self.base_url = settings.camara_base_url.rstrip("/")
+        self.timeout = settings.camara_timeout_seconds
+        self.max_rps = settings.camara_max_rps
+        self.max_concurrency = max(1, settings.camara_max_concurrency)
+        self.max_retries = settings.camara_max_retries
+        self._bucket = adaptive_bucket("async")
+        self._vcr = open_vcr_store()
+
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=settings.camara_http2 and _http2_available(),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=30.0,
+            ),
+            headers={
+                "User-Agent": settings.camara_user_agent,
+                "Accept": "application/json",
+            },
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> AsyncCamaraClient:
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.close()
+
+    async def _throttle(self) -> None:
+        await self._bucket.acquire_async()
+
+    async def get(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        *,
+        raise_for_status: bool = True,
+    ) -> tuple[int, dict[str, Any]]:
+        endpoint = endpoint if endpoint.startswith("/") else f"/{endpoint}"
+        url = f"{self.base_url}{endpoint}"
+
+        replay = self._vcr.maybe_load("GET", url, params)
+        if replay is not None:
+            return replay["status"], replay["body"]
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                await self._throttle()
+                response = await self.client.get(url, params=params)
+                retry_after = observe_throttling(self._bucket, "async", response)
+                body = response.json() if response.content else {}
+                if raise_for_status:
+                    response.raise_for_status()
+                self._vcr.maybe_save("GET", url, params, {"status": response.status_code, "body": body})
+                return response.status_code, body
+            except httpx.HTTPStatusError as exc:
+                status = exc.response.status_code if exc.response is not None else 0
+                if (not raise_for_status) or (status and status < 500 and status != 429):
+                    try:
+                        body = exc.response.json() if exc.response is not None and exc.response.content else {}
+                    except Exception:
+                        body = {}
+                    return status, body
+                if attempt >= self.max_retries:
+                    raise
+                if retry_after is None:
+                    await asyncio.sleep(backoff_seconds(attempt))
+            except (httpx.HTTPError, ValueError):
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(backoff_seconds(attempt))
+
+        raise RuntimeError("unreachable")
+
+    async def fetch_many(
+        self,
+        requests: Sequence[tuple[str, dict[str, Any] | None]],
+        *,
+        max_workers: int | None = None,
+        raise_for_status: bool = True,
+    ) -> list[tuple[int, dict[str, Any]]]:
+        if not requests:
+            return []
+
+        workers = max(1, min(max_workers or self.max_concurrency, self.max_concurrency, len(requests)))
+        semaphore = asyncio.Semaphore(workers)
+        per_request_timeout = max(5.0, float(self.timeout) * 2.0)
+
+        async def _one(endpoint: str, params: dict[str, Any] | None) -> tuple[int, dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.wait_for(self.get(endpoint, params, raise_for_status=raise_for_status), per_request_timeout)
+
+        tasks = [asyncio.ensure_future(_one(endpoint, params)) for endpoint, params in requests]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except TimeoutError as exc:
+            raise TimeoutError(f"fetch_many timeout after {per_request_timeout:.1f}s") from exc
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        self._vcr.close()
@@ -1,18 +1,68 @@
 from __future__ import annotations
 
 import hashlib
+import itertools
 import json
 import random
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import weakref
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from threading import Lock
-from typing import Any, Iterator, Sequence
-from urllib.parse import urlencode
+from typing import Any
 
 import httpx
 
 from ...core.config import get_settings
+from ...core.observability.metrics import metrics_registry
+from .dedup import ResponseCache, SingleFlight
+from .rate_limit import AdaptiveTokenBucket, parse_retry_after
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# Process-wide so that jobs and services holding separate clients still share upstream calls.
+_inflight = SingleFlight()
+_response_cache = ResponseCache()
+_bucket_sources = itertools.count(1)
+
+
+def request_key(method: str, url: str, params: dict[str, Any] | None) -> str:
+    payload = json.dumps({"method": method, "url": url, "params": params or {}}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def backoff_seconds(attempt: int) -> float:
+    return min(8.0, (2**attempt) + random.uniform(0, 0.3))
+
+
+def adaptive_bucket(client_label: str) -> AdaptiveTokenBucket:
+    settings = get_settings()
+    source = next(_bucket_sources)
+    bucket = AdaptiveTokenBucket(
+        settings.camara_max_rps,
+        capacity=max(1, settings.camara_max_concurrency),
+        min_rate=settings.camara_aimd_min_rps,
+        decrease_factor=settings.camara_aimd_decrease_factor,
+        increase_rps=settings.camara_aimd_increase_rps,
+        cooldown=settings.camara_aimd_cooldown_seconds,
+        on_rate_change=lambda rps: metrics_registry.set_camara_effective_rps(client_label, rps, source=source),
+    )
+    # Every client has its own bucket; the gauge sums the live ones, so a collected client's share leaves with it.
+    weakref.finalize(bucket, metrics_registry.forget_camara_effective_rps, client_label, source)
+    return bucket
+
+
+def observe_throttling(bucket: AdaptiveTokenBucket, client_label: str, response: httpx.Response) -> float | None:
+    """Feed a response into AIMD rate control and return its ``Retry-After`` (seconds), if throttled."""
+    if response.status_code not in THROTTLE_STATUSES:
+        if response.status_code < 400:
+            bucket.on_success()
+        return None
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    bucket.on_throttle(retry_after)
+    metrics_registry.observe_camara_throttle(client_label, response.status_code)
+    return retry_after
 
 
 class VCRStore:
@@ -23,8 +73,7 @@ class VCRStore:
         self.base.mkdir(parents=True, exist_ok=True)
 
     def _key(self, method: str, url: str, params: dict[str, Any] | None) -> str:
-        payload = json.dumps({"method": method, "url": url, "params": params or {}}, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return request_key(method, url, params)
 
     def maybe_load(self, method: str, url: str, params: dict[str, Any] | None) -> dict[str, Any] | None:
         if self.mode != "replay":
@@ -40,19 +89,33 @@ class VCRStore:
         path = self.base / f"{self._key(method, url, params)}.json"
         path.write_text(json.dumps(data, ensure_ascii=False, indent=2))
 
+    def close(self) -> None:
+        return None
+
+
+def open_vcr_store() -> Any:
+    """Return the VCR backend selected by ``VCR_BACKEND`` (``dir`` or ``pack``)."""
+    if get_settings().vcr_backend == "pack":
+        from .vcr_pack import PackVCRStore
+
+        return PackVCRStore()
+    return VCRStore()
+
 
 class CamaraClient:
-    def __init__(self) -> None:
+    def __init__(self, validators: Any | None = None) -> None:
         settings = get_settings()
         self.base_url = settings.camara_base_url.rstrip("/")
         self.timeout = settings.camara_timeout_seconds
         self.max_rps = settings.camara_max_rps
         self.max_concurrency = max(1, settings.camara_max_concurrency)
         self.max_retries = settings.camara_max_retries
-        self._last_req_at = 0.0
-        self._throttle_lock = Lock()
-        self._vcr = VCRStore()
+        self._bucket = adaptive_bucket("sync")
+        self._vcr = open_vcr_store()
         self._vcr_lock = Lock()
+        # Optional ValidatorStore-like object enabling conditional GETs (If-None-Match/If-Modified-Since).
+        self.validators = validators
+        _response_cache.configure(settings.camara_cache_ttls, settings.camara_cache_max_entries)
 
         self.client = httpx.Client(
             timeout=self.timeout,
@@ -63,13 +126,7 @@ class CamaraClient:
         )
 
     def _throttle(self) -> None:
-        with self._throttle_lock:
-            min_interval = 1.0 / max(self.max_rps, 0.1)
-            now = time.time()
-            wait = min_interval - (now - self._last_req_at)
-            if wait > 0:
-                time.sleep(wait)
-            self._last_req_at = time.time()
+        self._bucket.acquire()
 
     def get(
         self,
@@ -86,15 +143,57 @@ class CamaraClient:
         if replay is not None:
             return replay["status"], replay["body"]
 
+        key = request_key("GET", url, params)
+        cached = _response_cache.get(key)
+        if cached is not None:
+            metrics_registry.observe_camara_dedup("sync", "cache")
+            return cached
+        # A conditional leader may get a 304 and hand back a stored body; only callers sending the same validators
+        # may share that, so the store is part of the key (None for plain "200 or error" callers).
+        conditional = self.validators if self.validators is not None and self._vcr.mode == "off" else None
+        return _inflight.do(
+            (key, raise_for_status, conditional),
+            lambda: self._get_upstream(endpoint, url, params, key, raise_for_status),
+            on_shared=lambda: metrics_registry.observe_camara_dedup("sync", "singleflight"),
+        )
+
+    def _get_upstream(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict[str, Any] | None,
+        key: str,
+        raise_for_status: bool,
+    ) -> tuple[int, dict[str, Any]]:
+        validator_key = self.validators.key(endpoint, params) if self.validators is not None and self._vcr.mode == "off" else None
+        conditional = validator_key is not None
         for attempt in range(self.max_retries + 1):
+            retry_after = None
             try:
                 self._throttle()
-                response = self.client.get(url, params=params)
+                request_kwargs: dict[str, Any] = {"params": params}
+                if conditional:
+                    headers = self.validators.conditional_headers(validator_key)
+                    if headers:
+                        request_kwargs["headers"] = headers
+                response = self.client.get(url, **request_kwargs)
+                retry_after = observe_throttling(self._bucket, "sync", response)
+                if response.status_code == 304 and conditional:
+                    # Unchanged upstream: hand back the stored body so pagination and callers keep working.
+                    previous = self.validators.previous_body(validator_key)
+                    if previous is not None:
+                        return 304, previous
+                    conditional = False
+                    continue
                 body = response.json() if response.content else {}
                 if raise_for_status:
                     response.raise_for_status()
                 with self._vcr_lock:
                     self._vcr.maybe_save("GET", url, params, {"status": response.status_code, "body": body})
+                if response.status_code == 200:
+                    _response_cache.put(key, endpoint, (response.status_code, body))
+                    if validator_key is not None:
+                        self.validators.capture(validator_key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
                 return response.status_code, body
             except httpx.HTTPStatusError as exc:
                 status = exc.response.status_code if exc.response is not None else 0
@@ -106,17 +205,19 @@ class CamaraClient:
                     return status, body
                 if attempt >= self.max_retries:
                     raise
-                backoff = min(8.0, (2**attempt) + random.uniform(0, 0.3))
-                time.sleep(backoff)
+                # With Retry-After the bucket itself holds every caller until the deadline.
+                if retry_after is None:
+                    time.sleep(backoff_seconds(attempt))
             except (httpx.HTTPError, ValueError):
                 if attempt >= self.max_retries:
                     raise
-                backoff = min(8.0, (2**attempt) + random.uniform(0, 0.3))
-                time.sleep(backoff)
+                time.sleep(backoff_seconds(attempt))
 
         raise RuntimeError("unreachable")
 
-    def paginated(self, endpoint: str, params: dict[str, Any] | None = None, max_pages: int | None = None) -> Iterator[tuple[int, dict[str, Any], dict[str, Any]]]:
+    def paginated(
+        self, endpoint: str, params: dict[str, Any] | None = None, max_pages: int | None = None
+    ) -> Iterator[tuple[int, dict[str, Any], dict[str, Any]]]:
         current_params = dict(params or {})
         page = int(current_params.get("pagina", 1))
         yielded = 0
@@ -142,28 +243,68 @@ class CamaraClient:
         max_workers: int | None = None,
         raise_for_status: bool = True,
     ) -> list[tuple[int, dict[str, Any]]]:
+        return [
+            (status, body)
+            for _request, status, body in self.fetch_iter(
+                requests, max_workers=max_workers, raise_for_status=raise_for_status, ordered=True
+            )
+        ]
+
+    def fetch_iter(
+        self,
+        requests: Sequence[tuple[str, dict[str, Any] | None]],
+        *,
+        max_workers: int | None = None,
+        raise_for_status: bool | Callable[[tuple[str, dict[str, Any] | None]], bool] = True,
+        ordered: bool = False,
+    ) -> Iterator[tuple[tuple[str, dict[str, Any] | None], int, dict[str, Any]]]:
+        """Yield ``(request, status, body)`` as each request completes (or in request order if ``ordered``).
+
+        ``raise_for_status`` may be a per-request predicate. Raises ``TimeoutError`` when
+        nothing completes within the per-request timeout; requests not yet started are
+        cancelled, also when the caller stops iterating early.
+        """
         if not requests:
-            return []
+            return
+
+        def _raise_for(request: tuple[str, dict[str, Any] | None]) -> bool:
+            return raise_for_status(request) if callable(raise_for_status) else raise_for_status
 
         workers = max(1, min(max_workers or self.max_concurrency, self.max_concurrency, len(requests)))
         if workers == 1:
-            return [self.get(endpoint, params, raise_for_status=raise_for_status) for endpoint, params in requests]
+            for request in requests:
+                endpoint, params = request
+                status, body = self.get(endpoint, params, raise_for_status=_raise_for(request))
+                yield request, status, body
+            return
 
         per_request_timeout = max(5.0, float(self.timeout) * 2.0)
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            futures = [
-                pool.submit(self.get, endpoint, params, raise_for_status=raise_for_status)
-                for endpoint, params in requests
-            ]
-            results: list[tuple[int, dict[str, Any]]] = []
-            for future in futures:
-                try:
-                    results.append(future.result(timeout=per_request_timeout))
-                except FutureTimeoutError as exc:
-                    for pending in futures:
-                        pending.cancel()
-                    raise TimeoutError(f"fetch_many timeout after {per_request_timeout:.1f}s") from exc
-            return results
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                pool.submit(self.get, endpoint, params, raise_for_status=_raise_for((endpoint, params))): index
+                for index, (endpoint, params) in enumerate(requests)
+            }
+            pending = set(futures)
+            ready: dict[int, tuple[int, dict[str, Any]]] = {}
+            next_index = 0
+            while pending:
+                done, pending = wait(pending, timeout=per_request_timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError(f"fetch_many timeout after {per_request_timeout:.1f}s")
+                for future in sorted(done, key=futures.__getitem__):
+                    index = futures[future]
+                    status, body = future.result()
+                    if not ordered:
+                        yield requests[index], status, body
+                        continue
+                    ready[index] = (status, body)
+                while next_index in ready:
+                    status, body = ready.pop(next_index)
+                    yield requests[next_index], status, body
+                    next_index += 1
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def get_text(self, url: str, *, raise_for_status: bool = True) -> tuple[int, str]:
         with self._vcr_lock:
@@ -172,9 +313,11 @@ class CamaraClient:
             return int(replay["status"]), str(replay["text"])
 
         for attempt in range(self.max_retries + 1):
+            retry_after = None
             try:
                 self._throttle()
                 response = self.client.get(url)
+                retry_after = observe_throttling(self._bucket, "sync", response)
                 text = response.text
                 if raise_for_status:
                     response.raise_for_status()
@@ -187,15 +330,55 @@ class CamaraClient:
                     return status, exc.response.text if exc.response is not None else ""
                 if attempt >= self.max_retries:
                     raise
-                backoff = min(8.0, (2**attempt) + random.uniform(0, 0.3))
-                time.sleep(backoff)
+                if retry_after is None:
+                    time.sleep(backoff_seconds(attempt))
+            except httpx.HTTPError:
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_seconds(attempt))
+
+        raise RuntimeError("unreachable")
+
+    def download(self, url: str, dest: Path, *, headers: dict[str, str] | None = None) -> tuple[int, dict[str, str]]:
+        """Stream ``url`` into ``dest`` (written only on 200) and return the status and response headers.
+
+        Meant for the multi-hundred-MB yearly datasets: the body never sits in memory, and ``headers`` can
+        carry If-None-Match/If-Modified-Since so an unchanged file answers 304 without a body.
+        """
+        with self._vcr_lock:
+            replay = self._vcr.maybe_load("GET", url, None)
+        if replay is not None and "text" in replay:
+            status = int(replay["status"])
+            if status == 200:
+                dest.write_text(str(replay["text"]), encoding="utf-8")
+            return status, {}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._throttle()
+                with self.client.stream("GET", url, headers=headers or {}) as response:
+                    retry_after = observe_throttling(self._bucket, "sync", response)
+                    status = response.status_code
+                    if (status >= 500 or status == 429) and attempt < self.max_retries:
+                        if retry_after is None:
+                            time.sleep(backoff_seconds(attempt))
+                        continue
+                    if status == 200:
+                        with dest.open("wb") as fh:
+                            for chunk in response.iter_bytes():
+                                fh.write(chunk)
+                        if self._vcr.mode == "record":  # only recording reads the file back into memory
+                            with self._vcr_lock:
+                                self._vcr.maybe_save("GET", url, None, {"status": status, "text": dest.read_text(encoding="utf-8")})
+                    return status, dict(response.headers)
             except httpx.HTTPError:
                 if attempt >= self.max_retries:
                     raise
-                backoff = min(8.0, (2**attempt) + random.uniform(0, 0.3))
-                time.sleep(backoff)
+                time.sleep(backoff_seconds(attempt))
 
         raise RuntimeError("unreachable")
 
     def close(self) -> None:
         self.client.close()
+        with self._vcr_lock:
+            self._vcr.close()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Sequence
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from ...core.config import get_settings
+
+# Bump when the index layout changes; older entries are then downloaded and indexed again.
+_INDEX_VERSION = 1
+_ID_CHUNK = 500
+
+PROPOSICOES_DATE_KEYS = ("dataApresentacao", "data")
+PROPOSICOES_ID_KEYS = ("id", "idProposicao")
+VOTACOES_DATE_KEYS = ("data", "dataHoraRegistro", "dataVotacao", "dataHoraVotacao")
+VOTACOES_ID_KEYS = ("id", "idVotacao")
+VOTACOES_VOTOS_ID_KEYS = ("idVotacao", "id")
+
+
+def dataset_records(payload: Any) -> list[dict[str, Any]]:
+    """Rows of a static dataset file: a bare list, or the list under ``dados``/``data``."""
+    if isinstance(payload, list):
+        return [row for row in payload if isinstance(row, dict)]
+    if isinstance(payload, dict):
+        if isinstance(payload.get("dados"), list):
+            return [row for row in payload["dados"] if isinstance(row, dict)]
+        if isinstance(payload.get("data"), list):
+            return [row for row in payload["data"] if isinstance(row, dict)]
+    return []
+
+
+def coerce_date(value: Any) -> date | None:
+    if value in (None, ""):
+        return None
+    raw = str(value).strip()
+    if not raw:
+        return None
+    if "T" in raw:
+        raw = raw.split("T", 1)[0]
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+def _first(row: dict[str, Any], keys: Sequence[str]) -> Any:
+    return next((row[key] for key in keys if row.get(key)), None)
+
+
+def build_index(source: Path, dest: Path, *, date_keys: Sequence[str], id_keys: Sequence[str]) -> int:
+    """Parse a dataset file once into a SQLite table of rows (file order) indexed by day and id; returns the row count."""
+    with source.open("rb") as fh:
+        records = dataset_records(json.load(fh))
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    with closing(sqlite3.connect(tmp)) as conn:
+        conn.execute("CREATE TABLE records (seq INTEGER PRIMARY KEY, day TEXT, key TEXT, body TEXT NOT NULL)")
+        rows = []
+        for row in records:
+            day = coerce_date(_first(row, date_keys))
+            key = _first(row, id_keys)
+            rows.append((day.isoformat() if day else None, None if key is None else str(key), json.dumps(row, ensure_ascii=False)))
+        conn.executemany("INSERT INTO records (day, key, body) VALUES (?, ?, ?)", rows)
+        # Built after the bulk insert, which is much cheaper than maintaining them row by row.
+        conn.execute("CREATE INDEX ix_records_day ON records (day)")
+        conn.execute("CREATE INDEX ix_records_key ON records (key)")
+        conn.commit()
+    os.replace(tmp, dest)
+    return len(records)
+
+
+class DatasetIndex:
+    """One indexed yearly dataset; lookups read only the matching rows, in file order."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def between(self, start: date, end: date) -> list[dict[str, Any]]:
+        """Rows dated within [start, end], plus undated rows (which no window can exclude)."""
+        with closing(sqlite3.connect(self.path)) as conn:
+            rows = conn.execute(
+                "SELECT body FROM records WHERE day IS NULL OR day BETWEEN ? AND ? ORDER BY seq",
+                (start.isoformat(), end.isoformat()),
+            )
+            return [json.loads(body) for (body,) in rows]
+
+    def by_ids(self, ids: Iterable[Any]) -> list[dict[str, Any]]:
+        keys = sorted({str(value) for value in ids})
+        found: list[tuple[int, str]] = []
+        with closing(sqlite3.connect(self.path)) as conn:
+            for start in range(0, len(keys), _ID_CHUNK):
+                chunk = keys[start : start + _ID_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.extend(conn.execute(f"SELECT seq, body FROM records WHERE key IN ({placeholders})", chunk))
+        return [json.loads(body) for _seq, body in sorted(found)]
+
+
+class DatasetCache:
+    """Static Câmara datasets on local disk, keyed by URL.
+
+    Each file is downloaded once and parsed into a DatasetIndex. After that it is only revalidated with
+    If-None-Match/If-Modified-Since, and only once it is older than ``revalidate_after`` seconds, so the
+    weekly fallback windows of one year share a single download. When the upstream fails, a previously
+    indexed copy is served as ``stale``.
+    """
+
+    def __init__(self, client: Any, root: Path | str | None = None, *, revalidate_after: int | None = None) -> None:
+        settings = get_settings()
+        self.client = client
+        self.root = Path(root or settings.camara_dataset_cache_dir)
+        self.revalidate_after = settings.camara_dataset_revalidate_seconds if revalidate_after is None else revalidate_after
+
+    def index(self, url: str, *, date_keys: Sequence[str] = (), id_keys: Sequence[str] = ()) -> tuple[int, DatasetIndex | None, str]:
+        """(HTTP status, index or None, cache state: fresh, revalidated, downloaded, stale or unavailable)."""
+        entry = self.root / hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        meta_path, index_path = entry / "meta.json", entry / "index.sqlite"
+        spec = {"version": _INDEX_VERSION, "date_keys": list(date_keys), "id_keys": list(id_keys)}
+        meta = self._read_meta(meta_path)
+        cached = index_path.exists() and meta.get("url") == url and meta.get("spec") == spec
+        if cached and time.time() - float(meta.get("checked_at", 0)) < self.revalidate_after:
+            return 200, DatasetIndex(index_path), "fresh"
+
+        headers: dict[str, str] = {}
+        if cached and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if cached and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        entry.mkdir(parents=True, exist_ok=True)
+        part = entry / "download.part"
+        try:
+            try:
+                status, response_headers = self.client.download(url, part, headers=headers)
+            except httpx.HTTPError:  # timeout or dropped connection after the retries: same fallback as a 5xx
+                return 0, DatasetIndex(index_path) if cached else None, "stale" if cached else "unavailable"
+            if status == 304 and cached:
+                self._write_meta(meta_path, {**meta, "checked_at": time.time()})
+                return 200, DatasetIndex(index_path), "revalidated"
+            if status != 200:
+                return status, DatasetIndex(index_path) if cached else None, "stale" if cached else "unavailable"
+            try:
+                rows = build_index(part, index_path, date_keys=date_keys, id_keys=id_keys)
+            except ValueError:  # empty or truncated file: keep whatever was indexed before
+                return status, DatasetIndex(index_path) if cached else None, "stale" if cached else "unavailable"
+        finally:
+            part.unlink(missing_ok=True)
+
+        response_headers = {name.lower(): value for name, value in response_headers.items()}
+        self._write_meta(
+            meta_path,
+            {
+                "url": url,
+                "spec": spec,
+                "etag": response_headers.get("etag"),
+                "last_modified": response_headers.get("last-modified"),
+                "rows": rows,
+                "checked_at": time.time(),
+            },
+        )
+        return status, DatasetIndex(index_path), "downloaded"
+
+    @staticmethod
+    def _read_meta(path: Path) -> dict[str, Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_meta(path: Path, meta: dict[str, Any]) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, path)
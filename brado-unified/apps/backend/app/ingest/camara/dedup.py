@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from threading import Event, Lock
+from typing import Any
+
+
+@dataclass
+class _Call:
+    done: Event = field(default_factory=Event)
+    followers: int = 0
+    # Private snapshot of the leader's result: the leader's caller may mutate the object it got back.
+    shared: Any = None
+    error: BaseException | None = None
+
+
+def _clone_error(error: BaseException) -> BaseException:
+    """A fresh instance of ``error`` (same type, args and attributes) so each thread raises with its own traceback."""
+    clone = type(error).__new__(type(error), *error.args)
+    clone.args = error.args
+    if hasattr(error, "__dict__"):
+        clone.__dict__.update(error.__dict__)
+    return clone
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller runs ``fn``; callers arriving while it is in flight block
+    and receive a deep copy of its result (or a copy of its exception, chained
+    to the original).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], *, on_shared: Callable[[], None] | None = None) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            call.done.wait()
+            if on_shared is not None:
+                on_shared()
+            if call.error is not None:
+                raise _clone_error(call.error) from call.error
+            return copy.deepcopy(call.shared)
+
+        result = None
+        try:
+            result = fn()
+            return result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                followers = call.followers
+            # No follower can join once the key is gone; snapshot only when someone is waiting, before waking them.
+            if followers and call.error is None:
+                call.shared = copy.deepcopy(result)
+            call.done.set()
+
+
+class ResponseCache:
+    """Small in-process TTL cache for upstream GET responses, with per-endpoint TTLs."""
+
+    def __init__(
+        self, ttls: Sequence[tuple[str, float]] = (), max_entries: int = 1024, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.configure(ttls, max_entries)
+
+    def configure(self, ttls: Sequence[tuple[str, float]], max_entries: int) -> None:
+        with self._lock:
+            self.ttls = tuple((pattern, float(ttl)) for pattern, ttl in ttls if float(ttl) > 0)
+            self.max_entries = max(1, int(max_entries))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def ttl_for(self, endpoint: str) -> float:
+        for pattern, ttl in self.ttls:
+            if fnmatchcase(endpoint, pattern):
+                return ttl
+        return 0.0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, endpoint: str, value: Any) -> None:
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
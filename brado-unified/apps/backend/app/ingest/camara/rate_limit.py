@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+
+class TokenBucket:
+    """Token bucket shared by the sync and async Câmara clients.
+
+    Callers reserve a token under a short lock and sleep *outside* of it, so
+    concurrent workers wait in parallel instead of queueing behind one sleeper.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = Lock()
+        self.rate = max(float(rate), 0.1)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated_at = clock()
+
+    def _refill(self, now: float) -> None:
+        # ``_updated_at`` may lie ahead of ``now`` (a paused AdaptiveTokenBucket): nothing accrues before it.
+        if now > self._updated_at:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1.0
+            wait = max(0.0, self._updated_at - now)
+            if self._tokens >= 0:
+                return wait
+            return wait - self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    if not value:
+        return None
+    raw = value.strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - (now or datetime.now(UTC))).total_seconds())
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """AIMD rate control on top of :class:`TokenBucket`.
+
+    Throttling responses (429/503) cut the rate multiplicatively and, when the
+    server sends ``Retry-After``, pause every caller until that deadline.
+    Each success adds ``increase_rps`` back, capped at ``max_rate``.
+
+    A cut holds for ``cooldown`` seconds (or the ``Retry-After``, if longer):
+    the other in-flight requests of the same burst get throttled too, and
+    without the hold N of them would cut the rate N times, straight to the floor.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        *,
+        min_rate: float = 0.2,
+        decrease_factor: float = 0.5,
+        increase_rps: float = 0.05,
+        cooldown: float = 1.0,
+        on_rate_change: Callable[[float], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(rate, capacity, clock=clock)
+        self.max_rate = self.rate
+        self.min_rate = min(max(0.1, float(min_rate)), self.max_rate)
+        self.decrease_factor = min(max(float(decrease_factor), 0.05), 1.0)
+        self.increase_rps = max(0.0, float(increase_rps))
+        self.cooldown = max(0.0, float(cooldown))
+        self._paused_until = 0.0
+        self._hold_until = float("-inf")
+        self._on_rate_change = on_rate_change
+        if on_rate_change is not None:
+            on_rate_change(self.rate)
+
+    def _set_rate(self, rate: float) -> None:
+        now = self._clock()
+        self._refill(now)
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def on_success(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self._set_rate(self.rate + self.increase_rps)
+            rate = self.rate
+        if self._on_rate_change is not None:
+            self._on_rate_change(rate)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            now = self._clock()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                # No tokens accrue during the pause, so callers reserving meanwhile queue behind the deadline at
+                # the current rate instead of all leaving at once when it passes.
+                self._refill(now)
+                self._tokens = min(self._tokens, 0.0)
+                self._updated_at = max(self._updated_at, self._paused_until)
+            if now < self._hold_until:
+                return
+            self._set_rate(self.rate * self.decrease_factor)
+            self._hold_until = now + max(self.cooldown, retry_after or 0.0)
+            rate = self.rate
+        if self._on_rate_change is not None:
+            self._on_rate_change(rate)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from ...core.config import get_settings
+
+PACK_MAGIC = b"BRVCRPK1"
+INDEX_MAGIC = b"BRVCRIX1"
+PACK_FILE = "responses.pack"
+INDEX_FILE = "responses.idx"
+
+_RECORD_HEADER = struct.Struct(">32sI")  # sha256 key, compressed length
+_INDEX_HEADER = struct.Struct(">8sQQ")  # magic, pack size covered, entry count
+_INDEX_ENTRY = struct.Struct(">32sQI")  # sha256 key, record payload offset, compressed length
+
+
+def _iter_pack(pack_path: Path) -> Iterator[tuple[bytes, int, int]]:
+    with pack_path.open("rb") as fh:
+        if fh.read(len(PACK_MAGIC)) != PACK_MAGIC:
+            raise ValueError(f"not a VCR pack: {pack_path}")
+        while True:
+            header = fh.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            key, length = _RECORD_HEADER.unpack(header)
+            offset = fh.tell()
+            fh.seek(length, 1)
+            if fh.tell() - offset < length:
+                return  # truncated tail from an interrupted recording
+            yield key, offset, length
+
+
+def _write_index(index_path: Path, entries: dict[bytes, tuple[int, int]], pack_size: int) -> None:
+    tmp = index_path.with_suffix(".idx.tmp")
+    with tmp.open("wb") as fh:
+        fh.write(_INDEX_HEADER.pack(INDEX_MAGIC, pack_size, len(entries)))
+        for key in sorted(entries):
+            offset, length = entries[key]
+            fh.write(_INDEX_ENTRY.pack(key, offset, length))
+    tmp.replace(index_path)
+
+
+class PackVCRStore:
+    """VCR backend storing every recorded response in one append-only, zlib-compressed pack.
+
+    Replay binary-searches a sorted, memory-mapped key table (``responses.idx``)
+    and decompresses records straight out of the memory-mapped pack, so a replay
+    costs no per-request ``stat``/``open``. The index is rewritten on ``close()``
+    and rebuilt from the pack if it is missing or stale.
+    """
+
+    def __init__(self, base: Path | str | None = None, mode: str | None = None) -> None:
+        settings = get_settings()
+        self.mode = mode or settings.vcr_mode
+        self.base = Path(base or settings.vcr_dir)
+        self.base.mkdir(parents=True, exist_ok=True)
+        self.pack_path = self.base / PACK_FILE
+        self.index_path = self.base / INDEX_FILE
+        self._writer = None
+        self._pending: dict[bytes, tuple[int, int]] = {}
+        self._pack_map: mmap.mmap | None = None
+        self._index_map: mmap.mmap | None = None
+        self._index_count = 0
+
+    def _key(self, method: str, url: str, params: dict[str, Any] | None) -> str:
+        from .client import request_key
+
+        return request_key(method, url, params)
+
+    def _open_replay(self) -> None:
+        if self._pack_map is not None or not self.pack_path.exists():
+            return
+        pack_size = self.pack_path.stat().st_size
+        if not self._index_is_current(pack_size):
+            _write_index(self.index_path, {key: (offset, length) for key, offset, length in _iter_pack(self.pack_path)}, pack_size)
+        with self.pack_path.open("rb") as fh:
+            self._pack_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        with self.index_path.open("rb") as fh:
+            self._index_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        _magic, _covered, self._index_count = _INDEX_HEADER.unpack_from(self._index_map, 0)
+
+    def _index_is_current(self, pack_size: int) -> bool:
+        if not self.index_path.exists():
+            return False
+        with self.index_path.open("rb") as fh:
+            header = fh.read(_INDEX_HEADER.size)
+        if len(header) < _INDEX_HEADER.size:
+            return False
+        magic, covered, _count = _INDEX_HEADER.unpack(header)
+        return magic == INDEX_MAGIC and covered == pack_size
+
+    def _lookup(self, key: bytes) -> tuple[int, int] | None:
+        index = self._index_map
+        lo, hi = 0, self._index_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry_key, offset, length = _INDEX_ENTRY.unpack_from(index, _INDEX_HEADER.size + mid * _INDEX_ENTRY.size)
+            if entry_key < key:
+                lo = mid + 1
+            elif entry_key > key:
+                hi = mid
+            else:
+                return offset, length
+        return None
+
+    def maybe_load(self, method: str, url: str, params: dict[str, Any] | None) -> dict[str, Any] | None:
+        if self.mode != "replay":
+            return None
+        hex_key = self._key(method, url, params)
+        self._open_replay()
+        location = self._lookup(bytes.fromhex(hex_key)) if self._index_map is not None else None
+        if location is None:
+            raise FileNotFoundError(f"VCR replay miss: {hex_key}")
+        offset, length = location
+        return json.loads(zlib.decompress(self._pack_map[offset : offset + length]))
+
+    def maybe_save(self, method: str, url: str, params: dict[str, Any] | None, data: dict[str, Any]) -> None:
+        if self.mode != "record":
+            return
+        self.append(bytes.fromhex(self._key(method, url, params)), data)
+
+    def append(self, key: bytes, data: dict[str, Any]) -> None:
+        if self._writer is None:
+            if self.pack_path.exists() and self.pack_path.stat().st_size >= len(PACK_MAGIC):
+                self._pending = {k: (offset, length) for k, offset, length in _iter_pack(self.pack_path)}
+                self._writer = self.pack_path.open("ab")
+            else:
+                self._writer = self.pack_path.open("wb")
+                self._writer.write(PACK_MAGIC)
+        compressed = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+        self._writer.write(_RECORD_HEADER.pack(key, len(compressed)))
+        offset = self._writer.tell()
+        self._writer.write(compressed)
+        self._pending[key] = (offset, len(compressed))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+            pack_size = self._writer.tell()
+            self._writer.close()
+            self._writer = None
+            _write_index(self.index_path, self._pending, pack_size)
+        if self._pack_map is not None:
+            self._pack_map.close()
+            self._pack_map = None
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+
+
+def convert_directory_to_pack(src_dir: Path | str, dest_dir: Path | str) -> int:
+    """Pack a legacy one-JSON-file-per-request VCR directory; returns the number of records written."""
+    src = Path(src_dir)
+    store = PackVCRStore(dest_dir, mode="record")
+    written = 0
+    try:
+        for path in sorted(src.glob("*.json")):
+            try:
+                key = bytes.fromhex(path.stem)
+            except ValueError:
+                continue
+            if len(key) != 32:
+                continue
+            store.append(key, json.loads(path.read_text()))
+            written += 1
+    finally:
+        store.close()
+    return written
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
 import csv
 import io
-import json
 import random
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
 from typing import Any
 
 from ..core.config import get_settings
-from ..db.raw_store import RawStore
+from ..db.raw_store import RawStore, ValidatorStore
 from ..db.sql.models import JobState
-from ..graph.neo4j import Neo4jWriter
+from ..graph.neo4j import GraphWriteQueue, Neo4jWriter
 from ..ingest.camara.client import CamaraClient
+from ..ingest.camara.datasets import (
+    PROPOSICOES_DATE_KEYS,
+    PROPOSICOES_ID_KEYS,
+    VOTACOES_DATE_KEYS,
+    VOTACOES_ID_KEYS,
+    VOTACOES_VOTOS_ID_KEYS,
+    DatasetCache,
+)
 from ..ingest.camara.endpoints import (
     DEPUTADOS_ENDPOINT,
     PROPOSICOES_ENDPOINT,
@@ -30,6 +38,7 @@ from ..normalize.mappers import (
     normalize_vote_action,
     normalize_vote_event,
 )
+from .pipeline import Batcher, LowWaterMark, Pipeline, Stage, StageStats, Tally
 
 
 @dataclass
@@ -37,15 +46,17 @@ class JobContext:
     session: Any
     raw_store: RawStore
     client: CamaraClient
-    graph: Neo4jWriter
+    graph: GraphWriteQueue
 
 
 class IngestJobs:
     def __init__(self, session):
         self.session = session
-        self.raw_store = RawStore(session)
-        self.client = CamaraClient()
-        self.graph = Neo4jWriter()
+        validators = ValidatorStore()
+        self.raw_store = RawStore(session, validators=validators)
+        self.client = CamaraClient(validators=validators)
+        self.datasets = DatasetCache(self.client)
+        self.graph = GraphWriteQueue(Neo4jWriter())
         self._max_workers = max(1, get_settings().camara_max_concurrency)
 
     def close(self) -> None:
@@ -80,43 +91,158 @@ class IngestJobs:
         batch = self.raw_store.start_batch("camara", "camara:deputados:current")
 
         total = 0
+        unchanged = 0
+        # Validators turn the next run's fetch into a 304 that skips upsert_persons, so they wait for the graph.
+        self.raw_store.hold_validators()
         try:
             self.graph.ensure_constraints()
-            for status, body, params in self.client.paginated(DEPUTADOS_ENDPOINT, {"itens": 100, "pagina": start_page}, max_pages=max_pages):
-                self.raw_store.add_payload(
+            for status, body, params in self.client.paginated(
+                DEPUTADOS_ENDPOINT, {"itens": 100, "pagina": start_page}, max_pages=max_pages
+            ):
+                deps = [dep for dep in body.get("dados", []) if dep.get("id")]
+                detail_responses = self.client.fetch_many(
+                    [(deputado_details_endpoint(dep["id"]), {}) for dep in deps],
+                    max_workers=self._max_workers,
+                )
+                # One bulk insert per page: the listing first, then every detail.
+                raw_ids = self.raw_store.add_payloads(
                     batch=batch,
-                    endpoint=DEPUTADOS_ENDPOINT,
-                    params=params,
-                    primary_key=None,
-                    http_status=status,
-                    body_json=body,
+                    payloads=[
+                        {"endpoint": DEPUTADOS_ENDPOINT, "params": params, "primary_key": None, "http_status": status, "body_json": body},
+                        *(
+                            {
+                                "endpoint": deputado_details_endpoint(dep["id"]),
+                                "params": {},
+                                "primary_key": str(dep["id"]),
+                                "http_status": d_status,
+                                "body_json": d_body,
+                            }
+                            for dep, (d_status, d_body) in zip(deps, detail_responses, strict=True)
+                        ),
+                    ],
                 )
-                for dep in body.get("dados", []):
-                    dep_id = dep.get("id")
-                    if not dep_id:
+                persons = []
+                for dep, (d_status, d_body), raw_id in zip(deps, detail_responses, raw_ids[1:], strict=True):
+                    if d_status == 304:
+                        unchanged += 1
                         continue
-                    detail_endpoint = deputado_details_endpoint(dep_id)
-                    d_status, d_body = self.client.get(detail_endpoint)
-                    raw = self.raw_store.add_payload(
-                        batch=batch,
-                        endpoint=detail_endpoint,
-                        params={},
-                        primary_key=str(dep_id),
-                        http_status=d_status,
-                        body_json=d_body,
-                    )
-                    node = normalize_person(d_body.get("dados", dep))
-                    self.graph.upsert_person(node, raw.id)
-                    total += 1
+                    persons.append((normalize_person(d_body.get("dados", dep)), raw_id))
+                self.graph.upsert_persons(persons)
+                total += len(persons)
                 self._set_job_state(job_name, "running", {"page": params.get("pagina", start_page), "processed": total})
 
-            self.raw_store.finish_batch(batch, metadata={"item_count": total})
-            self._set_job_state(job_name, "success", {"processed": total})
-            return {"job": job_name, "status": "success", "processed": total, "batch_id": batch.id}
+            self.graph.flush()
+            self.raw_store.release_validators(self.raw_store.take_held_validators())
+            self._finish_batch(batch, metadata={"item_count": total, "unchanged": unchanged})
+            self._set_job_state(job_name, "success", {"processed": total, "unchanged": unchanged})
+            return {"job": job_name, "status": "success", "processed": total, "unchanged": unchanged, "batch_id": batch.id}
         except Exception as exc:
             self.raw_store.fail_batch(batch, str(exc))
             self._set_job_state(job_name, "failed", {"error": str(exc)})
             raise
+        finally:
+            self.raw_store.hold_validators(False)
+
+    def _checkpoint(self, job_name: str, marks: LowWaterMark) -> None:
+        """Commit the cursor and validators of the items the graph_write stage has acknowledged.
+
+        Items still in normalize, in the batcher or in graph_write keep theirs for a later checkpoint. Waiting for
+        the write-behind queue to acknowledge the settled items' batches (not to drain) then makes "acknowledged"
+        mean received (or dead-lettered) by the graph.
+        """
+        settled = marks.settle()
+        if not settled:
+            return
+        self.graph.wait_for(marks.ack)
+        self.raw_store.release_validators(row for _cursor, rows in settled for row in rows)
+        cursor = next((cursor for cursor, _rows in reversed(settled) if cursor is not None), None)
+        if cursor is not None:
+            self._set_job_state(job_name, "running", cursor)
+        self.raw_store.flush()
+        self.session.commit()
+
+    def _finish_batch(self, batch: Any, metadata: dict[str, Any]) -> None:
+        self.graph.flush()
+        self.raw_store.finish_batch(batch, metadata={**metadata, "graph": self.graph.graph_stats()})
+
+    def _record_failure(self, batch: Any, job_name: str, exc: Exception) -> None:
+        self.raw_store.fail_batch(batch, str(exc))
+        self._set_job_state(job_name, "failed", {"error": str(exc)})
+        if get_settings().ingest_checkpoint_every > 0:
+            # Earlier checkpoints are already committed; make the failure visible alongside them.
+            try:
+                self.graph.flush()
+            except RuntimeError:  # a batch lost meanwhile was logged by the queue; the job is failing regardless
+                pass
+            self.session.commit()
+
+    def _run_pipeline(
+        self,
+        name: str,
+        source: Iterable[Any],
+        *,
+        fetch: Callable[[Any], Iterable[Any] | None],
+        persist: Callable[[Any], Iterable[Any] | None],
+        normalize: Callable[[Any], Iterable[Any] | None],
+        write: Callable[[list[Any]], Iterable[Any] | None],
+        job_name: str,
+        cursor: Callable[[], dict[str, Any] | None],
+        fetch_workers: int | None = None,
+    ) -> dict[str, StageStats]:
+        """Run fetch → persist_raw → normalize → graph_write; ``write`` receives lists of normalized rows.
+
+        Rows are grouped into NEO4J_WRITE_BATCH_SIZE lists so each graph write is one
+        UNWIND statement; the rows ``normalize`` returns for one item stay together.
+        ``cursor`` is read after each persisted item; checkpoints commit the one recorded
+        with the last item whose rows, and those of every item before it, were written.
+        Validators are held the same way, so a later 304 never hides a row the graph missed.
+        """
+        settings = get_settings()
+        checkpoint_every = max(0, settings.ingest_checkpoint_every)
+        batcher = Batcher(settings.neo4j_write_batch_size)
+        marks = LowWaterMark()
+
+        def persist_item(item: Any) -> list[tuple[int, list[Any]]]:
+            outputs = list(persist(item) or ())
+            seq = marks.issue((cursor(), self.raw_store.take_held_validators()), done=not outputs)
+            return [(seq, outputs)] if outputs else []
+
+        def normalize_item(item: tuple[int, list[Any]]) -> list[list[Any]]:
+            seq, outputs = item
+            rows = [(seq, row) for output in outputs for row in normalize(output) or ()]
+            if not rows:
+                marks.done(seq)
+            return batcher.add(rows)
+
+        def write_rows(rows: list[tuple[int, Any]]) -> None:
+            write([row for _seq, row in rows])
+            # Read after the write, so it covers this batch's submissions (and possibly a few from other workers).
+            marks.done(*{seq for seq, _row in rows}, ack=self.graph.submitted)
+
+        self.raw_store.hold_validators()
+        pipeline = Pipeline(
+            name,
+            [
+                Stage("fetch", fetch, workers=max(1, fetch_workers or settings.ingest_pipeline_fetch_workers)),
+                # The SQL session is not thread-safe: raw persistence and its checkpoint commits stay on one worker.
+                Stage(
+                    "persist_raw",
+                    persist_item,
+                    checkpoint_every=checkpoint_every,
+                    checkpoint=(lambda: self._checkpoint(job_name, marks)) if checkpoint_every else None,
+                ),
+                Stage("normalize", normalize_item, flush=batcher.drain),
+                Stage("graph_write", write_rows, workers=max(1, settings.ingest_pipeline_graph_workers)),
+            ],
+            queue_size=settings.ingest_pipeline_queue_size,
+        )
+        try:
+            stats = pipeline.run(source)
+            # Everything was written; the caller's commit comes after a graph flush (checkpoint or batch close).
+            self.raw_store.release_validators(row for _cursor, rows in marks.settle() for row in rows)
+            return stats
+        finally:
+            self.raw_store.hold_validators(False)
 
     def ingest_bills_since(self, from_date: date, to_date: date | None = None, max_pages: int | None = None) -> dict[str, Any]:
         job_name = "ingest_bills_since"
@@ -124,10 +250,17 @@ class IngestJobs:
         self._set_job_state(job_name, "running", {"from": str(from_date), "to": str(end_date), "window_index": 0})
         batch = self.raw_store.start_batch("camara", f"camara:bills:{from_date.isoformat()}", from_date, end_date)
 
-        processed = 0
+        tally = Tally()
         coverage_gaps: list[dict[str, Any]] = []
         try:
             for window_index, (window_start, window_end) in enumerate(self._date_windows(from_date, end_date), start=1):
+                cursor = {
+                    "from": str(from_date),
+                    "to": str(end_date),
+                    "window_index": window_index,
+                    "window_start": str(window_start),
+                    "window_end": str(window_end),
+                }
                 try:
                     params = {
                         "dataInicio": window_start.isoformat(),
@@ -137,48 +270,8 @@ class IngestJobs:
                         "itens": 100,
                         "pagina": 1,
                     }
-                    for status, body, page_params in self.client.paginated(PROPOSICOES_ENDPOINT, params, max_pages=max_pages):
-                        self.raw_store.add_payload(
-                            batch=batch,
-                            endpoint=PROPOSICOES_ENDPOINT,
-                            params=page_params,
-                            primary_key=None,
-                            http_status=status,
-                            body_json=body,
-                        )
-
-                        props = [prop for prop in body.get("dados", []) if prop.get("id")]
-                        detail_requests = [(proposicao_details_endpoint(prop["id"]), {}) for prop in props]
-                        detail_responses = self.client.fetch_many(detail_requests, max_workers=self._max_workers)
-
-                        for prop, (d_status, d_body) in zip(props, detail_responses):
-                            prop_id = prop.get("id")
-                            detail_endpoint = proposicao_details_endpoint(prop_id)
-                            raw = self.raw_store.add_payload(
-                                batch=batch,
-                                endpoint=detail_endpoint,
-                                params={},
-                                primary_key=str(prop_id),
-                                http_status=d_status,
-                                body_json=d_body,
-                            )
-                            bill = normalize_bill(d_body.get("dados", prop))
-                            self.graph.upsert_bill(bill, raw.id)
-                            processed += 1
-
-                        self._set_job_state(
-                            job_name,
-                            "running",
-                            {
-                                "from": str(from_date),
-                                "to": str(end_date),
-                                "window_index": window_index,
-                                "window_start": str(window_start),
-                                "window_end": str(window_end),
-                                "page": page_params.get("pagina", 1),
-                                "processed": processed,
-                            },
-                        )
+                    self._ingest_bills_window(batch, job_name, params, max_pages, tally, cursor)
+                    self._set_job_state(job_name, "running", {**cursor, "processed": tally["processed"]})
                 except Exception as exc:
                     fallback_rows = self._ingest_bills_static_fallback(
                         batch=batch,
@@ -193,30 +286,74 @@ class IngestJobs:
                             "fallback_rows": fallback_rows,
                         }
                     )
-                    processed += fallback_rows
-                    self._set_job_state(
-                        job_name,
-                        "running",
-                        {
-                            "from": str(from_date),
-                            "to": str(end_date),
-                            "window_index": window_index,
-                            "window_start": str(window_start),
-                            "window_end": str(window_end),
-                            "processed": processed,
-                            "fallback": True,
-                        },
-                    )
+                    tally.add("processed", fallback_rows)
+                    self._set_job_state(job_name, "running", {**cursor, "processed": tally["processed"], "fallback": True})
                     continue
 
-            self.raw_store.finish_batch(batch, metadata={"processed": processed, "coverage_gaps": coverage_gaps})
-            self._set_job_state(job_name, "success", {"processed": processed})
-            return {"job": job_name, "status": "success", "processed": processed, "batch_id": batch.id}
+            processed, unchanged = tally["processed"], tally["unchanged"]
+            self._finish_batch(batch, metadata={"processed": processed, "unchanged": unchanged, "coverage_gaps": coverage_gaps})
+            self._set_job_state(job_name, "success", {"processed": processed, "unchanged": unchanged})
+            return {"job": job_name, "status": "success", "processed": processed, "unchanged": unchanged, "batch_id": batch.id}
         except Exception as exc:
-            self.raw_store.fail_batch(batch, str(exc))
-            self._set_job_state(job_name, "failed", {"error": str(exc)})
+            self._record_failure(batch, job_name, exc)
             raise
 
+    def _ingest_bills_window(
+        self,
+        batch: Any,
+        job_name: str,
+        params: dict[str, Any],
+        max_pages: int | None,
+        tally: Tally,
+        cursor: dict[str, Any],
+    ) -> None:
+        last_page = {"pagina": params.get("pagina", 1)}
+
+        def fetch(page: tuple[int, dict[str, Any], dict[str, Any]]) -> Iterator[tuple[Any, ...]]:
+            status, body, page_params = page
+            yield PROPOSICOES_ENDPOINT, page_params, None, status, body
+            props = {proposicao_details_endpoint(prop["id"]): prop for prop in body.get("dados", []) if prop.get("id")}
+            detail_requests = [(detail_endpoint, {}) for detail_endpoint in props]
+            for (detail_endpoint, _params), d_status, d_body in self.client.fetch_iter(detail_requests, max_workers=self._max_workers):
+                yield detail_endpoint, {}, props[detail_endpoint], d_status, d_body
+
+        def persist(item: tuple[Any, ...]) -> list[tuple[str, dict[str, Any]]] | None:
+            endpoint, item_params, prop, status, body = item
+            raw = self.raw_store.add_payload(
+                batch=batch,
+                endpoint=endpoint,
+                params=item_params,
+                primary_key=None if prop is None else str(prop["id"]),
+                http_status=status,
+                body_json=body,
+            )
+            if prop is None:
+                last_page["pagina"] = item_params.get("pagina", 1)
+                return None
+            if status == 304:
+                tally.add("unchanged")
+                return None
+            return [(raw.id, body.get("dados", prop))]
+
+        def normalize(item: tuple[str, dict[str, Any]]) -> list[tuple[dict[str, Any], str]]:
+            raw_id, data = item
+            return [(normalize_bill(data), raw_id)]
+
+        def write(rows: list[tuple[dict[str, Any], str]]) -> None:
+            self.graph.upsert_bills(rows)
+            tally.add("processed", len(rows))
+
+        self._run_pipeline(
+            "bills",
+            self.client.paginated(PROPOSICOES_ENDPOINT, params, max_pages=max_pages),
+            fetch=fetch,
+            persist=persist,
+            normalize=normalize,
+            write=write,
+            job_name=job_name,
+            cursor=lambda: {**cursor, "page": last_page["pagina"], "processed": tally["processed"]},
+        )
+
     def ingest_votes_since(
         self,
         from_date: date,
@@ -234,11 +371,18 @@ class IngestJobs:
         )
         batch = self.raw_store.start_batch("camara", f"camara:votes:{from_date.isoformat()}", from_date, end_date)
 
-        processed_events = 0
-        processed_actions = 0
+        tally = Tally()
         coverage_gaps: list[dict[str, Any]] = []
         try:
             for window_index, (window_start, window_end) in enumerate(self._date_windows(from_date, end_date), start=1):
+                cursor = {
+                    "from": str(from_date),
+                    "to": str(end_date),
+                    "window_index": window_index,
+                    "window_start": str(window_start),
+                    "window_end": str(window_end),
+                    "deputado_ids": sorted(selected_ids),
+                }
                 try:
                     params = {
                         "dataInicio": window_start.isoformat(),
@@ -248,97 +392,8 @@ class IngestJobs:
                         "itens": 100,
                         "pagina": 1,
                     }
-                    for status, body, page_params in self.client.paginated(VOTACOES_ENDPOINT, params, max_pages=max_pages):
-                        self.raw_store.add_payload(
-                            batch=batch,
-                            endpoint=VOTACOES_ENDPOINT,
-                            params=page_params,
-                            primary_key=None,
-                            http_status=status,
-                            body_json=body,
-                        )
-
-                        events = [event for event in body.get("dados", []) if event.get("id")]
-                        detail_requests = [(votacao_details_endpoint(event["id"]), {}) for event in events]
-                        nominal_requests = [(votacao_votos_endpoint(event["id"]), {}) for event in events]
-                        detail_responses = self.client.fetch_many(detail_requests, max_workers=self._max_workers)
-                        nominal_responses = self.client.fetch_many(
-                            nominal_requests,
-                            max_workers=self._max_workers,
-                            raise_for_status=False,
-                        )
-
-                        for voto_event, (d_status, d_body), (v_status, v_body) in zip(events, detail_responses, nominal_responses):
-                            votacao_id = voto_event.get("id")
-                            detail_endpoint = votacao_details_endpoint(votacao_id)
-                            raw_event = self.raw_store.add_payload(
-                                batch=batch,
-                                endpoint=detail_endpoint,
-                                params={},
-                                primary_key=str(votacao_id),
-                                http_status=d_status,
-                                body_json=d_body,
-                            )
-                            node = normalize_vote_event(d_body.get("dados", voto_event))
-                            self.graph.upsert_vote_event(node, raw_event.id)
-                            processed_events += 1
-
-                            votos_endpoint = votacao_votos_endpoint(votacao_id)
-                            normalized_v_body = v_body if isinstance(v_body, dict) else {"dados": []}
-                            if v_status != 200:
-                                metadata = dict(normalized_v_body.get("metadata", {}))
-                                metadata["error_type"] = self._nominal_vote_error_type(v_status)
-                                metadata["status_code"] = v_status
-                                normalized_v_body["metadata"] = metadata
-                                normalized_v_body.setdefault("dados", [])
-                                self.raw_store.add_payload(
-                                    batch=batch,
-                                    endpoint=votos_endpoint,
-                                    params={},
-                                    primary_key=str(votacao_id),
-                                    http_status=v_status,
-                                    body_json=normalized_v_body,
-                                )
-                                continue
-
-                            raw_votes = self.raw_store.add_payload(
-                                batch=batch,
-                                endpoint=votos_endpoint,
-                                params={},
-                                primary_key=str(votacao_id),
-                                http_status=v_status,
-                                body_json=normalized_v_body,
-                            )
-                            for voto in normalized_v_body.get("dados", []):
-                                deputado_id = voto.get("deputado_", {}).get("id") or voto.get("idDeputado")
-                                if not deputado_id:
-                                    continue
-                                try:
-                                    dep_id_int = int(deputado_id)
-                                except Exception:
-                                    continue
-                                if selected_ids and dep_id_int not in selected_ids:
-                                    continue
-                                person_node_id = f"camara:person:{deputado_id}"
-                                action = normalize_vote_action(voto, node["id"], person_node_id)
-                                self.graph.upsert_vote_action(action, raw_votes.id)
-                                processed_actions += 1
-
-                        self._set_job_state(
-                            job_name,
-                            "running",
-                            {
-                                "from": str(from_date),
-                                "to": str(end_date),
-                                "window_index": window_index,
-                                "window_start": str(window_start),
-                                "window_end": str(window_end),
-                                "page": page_params.get("pagina", 1),
-                                "events": processed_events,
-                                "actions": processed_actions,
-                                "deputado_ids": sorted(selected_ids),
-                            },
-                        )
+                    self._ingest_votes_window(batch, job_name, params, max_pages, selected_ids, tally, cursor)
+                    self._set_job_state(job_name, "running", {**cursor, "events": tally["events"], "actions": tally["actions"]})
                 except Exception as exc:
                     fb_events, fb_actions = self._ingest_votes_static_fallback(
                         batch=batch,
@@ -355,42 +410,176 @@ class IngestJobs:
                             "fallback_actions": fb_actions,
                         }
                     )
-                    processed_events += fb_events
-                    processed_actions += fb_actions
+                    tally.add("events", fb_events)
+                    tally.add("actions", fb_actions)
                     self._set_job_state(
                         job_name,
                         "running",
-                        {
-                            "from": str(from_date),
-                            "to": str(end_date),
-                            "window_index": window_index,
-                            "window_start": str(window_start),
-                            "window_end": str(window_end),
-                            "events": processed_events,
-                            "actions": processed_actions,
-                            "deputado_ids": sorted(selected_ids),
-                            "fallback": True,
-                        },
+                        {**cursor, "events": tally["events"], "actions": tally["actions"], "fallback": True},
                     )
                     continue
 
-            self.raw_store.finish_batch(
+            processed_events, processed_actions, unchanged = tally["events"], tally["actions"], tally["unchanged"]
+            self._finish_batch(
                 batch,
-                metadata={"events": processed_events, "actions": processed_actions, "coverage_gaps": coverage_gaps},
+                metadata={
+                    "events": processed_events,
+                    "actions": processed_actions,
+                    "unchanged": unchanged,
+                    "coverage_gaps": coverage_gaps,
+                },
+            )
+            self._set_job_state(
+                job_name,
+                "success",
+                {"events": processed_events, "actions": processed_actions, "unchanged": unchanged},
             )
-            self._set_job_state(job_name, "success", {"events": processed_events, "actions": processed_actions})
             return {
                 "job": job_name,
                 "status": "success",
                 "events": processed_events,
                 "actions": processed_actions,
+                "unchanged": unchanged,
                 "batch_id": batch.id,
             }
         except Exception as exc:
-            self.raw_store.fail_batch(batch, str(exc))
-            self._set_job_state(job_name, "failed", {"error": str(exc)})
+            self._record_failure(batch, job_name, exc)
             raise
 
+    def _ingest_votes_window(
+        self,
+        batch: Any,
+        job_name: str,
+        params: dict[str, Any],
+        max_pages: int | None,
+        selected_ids: set[int],
+        tally: Tally,
+        cursor: dict[str, Any],
+    ) -> None:
+        last_page = {"pagina": params.get("pagina", 1)}
+
+        def fetch(page: tuple[int, dict[str, Any], dict[str, Any]]) -> Iterator[tuple[Any, ...]]:
+            status, body, page_params = page
+            yield "listing", page_params, status, body
+            events = {str(event["id"]): event for event in body.get("dados", []) if event.get("id")}
+            owners = {votacao_details_endpoint(votacao_id): (votacao_id, "detail") for votacao_id in events}
+            nominal_endpoints = {votacao_votos_endpoint(votacao_id): (votacao_id, "votos") for votacao_id in events}
+            owners.update(nominal_endpoints)
+            halves: dict[str, dict[str, tuple[int, dict[str, Any]]]] = {}
+
+            # Details and nominal votes stream in together; an event moves on once both halves arrived.
+            for (endpoint, _params), r_status, r_body in self.client.fetch_iter(
+                [(endpoint, {}) for endpoint in owners],
+                max_workers=self._max_workers,
+                raise_for_status=lambda request: request[0] not in nominal_endpoints,
+            ):
+                votacao_id, kind = owners[endpoint]
+                half = halves.setdefault(votacao_id, {})
+                half[kind] = (r_status, r_body)
+                if len(half) == 2:
+                    del halves[votacao_id]
+                    yield "event", events[votacao_id], half["detail"], half["votos"]
+
+        def persist(item: tuple[Any, ...]) -> list[tuple[Any, ...]] | None:
+            if item[0] == "listing":
+                _kind, page_params, status, body = item
+                self.raw_store.add_payload(
+                    batch=batch,
+                    endpoint=VOTACOES_ENDPOINT,
+                    params=page_params,
+                    primary_key=None,
+                    http_status=status,
+                    body_json=body,
+                )
+                last_page["pagina"] = page_params.get("pagina", 1)
+                return None
+            _kind, voto_event, detail, nominal = item
+            return [self._persist_vote_event(batch, voto_event, detail, nominal, tally)]
+
+        def normalize(item: tuple[Any, ...]) -> list[tuple[Any, ...]]:
+            event_data, event_changed, raw_event_id, votos, raw_votes_id = item
+            node = normalize_vote_event(event_data)
+            actions = []
+            for voto in votos:
+                deputado_id = voto.get("deputado_", {}).get("id") or voto.get("idDeputado")
+                if not deputado_id:
+                    continue
+                try:
+                    dep_id_int = int(deputado_id)
+                except Exception:
+                    continue
+                if selected_ids and dep_id_int not in selected_ids:
+                    continue
+                actions.append(normalize_vote_action(voto, node["id"], f"camara:person:{deputado_id}"))
+            # The event row and its actions land in the same write batch, events first.
+            rows = [("event", node, raw_event_id)] if event_changed else []
+            return rows + [("action", action, raw_votes_id) for action in actions]
+
+        def write(rows: list[tuple[str, dict[str, Any], str]]) -> None:
+            events = [(node, raw_id) for kind, node, raw_id in rows if kind == "event"]
+            actions = [(node, raw_id) for kind, node, raw_id in rows if kind == "action"]
+            self.graph.upsert_vote_events(events)
+            self.graph.upsert_vote_actions(actions)
+            tally.add("events", len(events))
+            tally.add("actions", len(actions))
+
+        self._run_pipeline(
+            "votes",
+            self.client.paginated(VOTACOES_ENDPOINT, params, max_pages=max_pages),
+            fetch=fetch,
+            persist=persist,
+            normalize=normalize,
+            write=write,
+            job_name=job_name,
+            cursor=lambda: {**cursor, "page": last_page["pagina"], "events": tally["events"], "actions": tally["actions"]},
+        )
+
+    def _persist_vote_event(
+        self,
+        batch: Any,
+        voto_event: dict[str, Any],
+        detail: tuple[int, dict[str, Any]],
+        nominal: tuple[int, dict[str, Any]],
+        tally: Tally,
+    ) -> tuple[dict[str, Any], bool, str, list[dict[str, Any]], str | None]:
+        """Store the detail and nominal-votes payloads of one event; returns what the graph stages need."""
+        d_status, d_body = detail
+        v_status, v_body = nominal
+
+        votacao_id = voto_event.get("id")
+        raw_event = self.raw_store.add_payload(
+            batch=batch,
+            endpoint=votacao_details_endpoint(votacao_id),
+            params={},
+            primary_key=str(votacao_id),
+            http_status=d_status,
+            body_json=d_body,
+        )
+        event_changed = d_status != 304
+        if not event_changed:
+            tally.add("unchanged")
+        event_data = d_body.get("dados", voto_event)
+
+        normalized_v_body = v_body if isinstance(v_body, dict) else {"dados": []}
+        if v_status not in (200, 304):
+            metadata = dict(normalized_v_body.get("metadata", {}))
+            metadata["error_type"] = self._nominal_vote_error_type(v_status)
+            metadata["status_code"] = v_status
+            normalized_v_body["metadata"] = metadata
+            normalized_v_body.setdefault("dados", [])
+        raw_votes = self.raw_store.add_payload(
+            batch=batch,
+            endpoint=votacao_votos_endpoint(votacao_id),
+            params={},
+            primary_key=str(votacao_id),
+            http_status=v_status,
+            body_json=normalized_v_body,
+        )
+        if v_status == 304:
+            tally.add("unchanged")
+        votos = normalized_v_body.get("dados", []) if v_status == 200 else []
+        return event_data, event_changed, raw_event.id, votos, raw_votes.id
+
     @staticmethod
     def _date_windows(from_date: date, to_date: date, max_days: int = 90) -> list[tuple[date, date]]:
         windows: list[tuple[date, date]] = []
@@ -426,7 +615,7 @@ class IngestJobs:
         )
         batch = self.raw_store.start_batch("camara", f"camara:expenses:{from_date.isoformat()}", from_date, end_date)
 
-        processed = 0
+        tally = Tally()
         coverage_gaps: list[dict[str, Any]] = []
         fallback_rows = 0
 
@@ -445,43 +634,21 @@ class IngestJobs:
             if selected_ids:
                 current_deputado_ids = [dep_id for dep_id in current_deputado_ids if dep_id in selected_ids]
             current_deputado_ids = sorted(set(current_deputado_ids))
-            start_year = from_date.year
-            end_year = end_date.year
-
-            for dep_index, dep_id in enumerate(current_deputado_ids):
-                if dep_index < dep_cursor:
-                    continue
-                year_start = year_cursor if dep_index == dep_cursor else start_year
-                for year in range(year_start, end_year + 1):
-                    endpoint = despesas_endpoint(dep_id)
-                    try:
-                        for status, body, page_params in self.client.paginated(endpoint, {"ano": year, "itens": 100}, max_pages=None):
-                            raw = self.raw_store.add_payload(
-                                batch=batch,
-                                endpoint=endpoint,
-                                params=page_params,
-                                primary_key=f"{dep_id}:{year}:{page_params.get('pagina', 1)}",
-                                http_status=status,
-                                body_json=body,
-                            )
-                            for expense in body.get("dados", []):
-                                node = normalize_expense(expense, dep_id)
-                                self.graph.upsert_expense(node, raw.id)
-                                processed += 1
-                        self._set_job_state(
-                            job_name,
-                            "running",
-                            {
-                                "from": str(from_date),
-                                "to": str(end_date),
-                                "dep_index": dep_index,
-                                "year": year,
-                                "processed": processed,
-                                "deputado_ids": sorted(selected_ids),
-                            },
-                        )
-                    except Exception as exc:
-                        coverage_gaps.append({"deputado_id": dep_id, "year": year, "reason": str(exc)})
+            tasks = [
+                (dep_index, dep_id, year)
+                for dep_index, dep_id in enumerate(current_deputado_ids)
+                if dep_index >= dep_cursor
+                for year in range(year_cursor if dep_index == dep_cursor else from_date.year, end_date.year + 1)
+            ]
+            self._ingest_expenses_tasks(
+                batch,
+                job_name,
+                tasks,
+                tally,
+                coverage_gaps,
+                {"from": str(from_date), "to": str(end_date), "deputado_ids": sorted(selected_ids)},
+            )
+            processed, unchanged = tally["processed"], tally["unchanged"]
 
             if coverage_gaps:
                 fallback_rows = self._ingest_expenses_dataset_fallback(
@@ -492,15 +659,21 @@ class IngestJobs:
                     coverage_gaps=coverage_gaps,
                 )
 
-            self.raw_store.finish_batch(
+            self._finish_batch(
                 batch,
-                metadata={"processed": processed, "fallback_rows": fallback_rows, "coverage_gaps": coverage_gaps},
+                metadata={
+                    "processed": processed,
+                    "unchanged": unchanged,
+                    "fallback_rows": fallback_rows,
+                    "coverage_gaps": coverage_gaps,
+                },
             )
             self._set_job_state(
                 job_name,
                 "success",
                 {
                     "processed": processed,
+                    "unchanged": unchanged,
                     "fallback_rows": fallback_rows,
                     "coverage_gaps": len(coverage_gaps),
                     "deputado_ids": sorted(selected_ids),
@@ -512,15 +685,88 @@ class IngestJobs:
                 "job": job_name,
                 "status": "success",
                 "processed": processed,
+                "unchanged": unchanged,
                 "fallback_rows": fallback_rows,
                 "coverage_gaps": coverage_gaps,
                 "batch_id": batch.id,
             }
         except Exception as exc:
-            self.raw_store.fail_batch(batch, str(exc))
-            self._set_job_state(job_name, "failed", {"error": str(exc)})
+            self._record_failure(batch, job_name, exc)
             raise
 
+    def _ingest_expenses_tasks(
+        self,
+        batch: Any,
+        job_name: str,
+        tasks: list[tuple[int, int, int]],
+        tally: Tally,
+        coverage_gaps: list[dict[str, Any]],
+        cursor: dict[str, Any],
+    ) -> None:
+        # Deputado/year tasks finish out of order; the resume cursor only advances over a contiguous finished prefix.
+        finished: set[int] = set()
+        watermark = {"next": 0}
+
+        def fetch(task: tuple[int, int, int, int]) -> Iterator[tuple[str, tuple[int, int, int, int], Any]]:
+            _seq, _dep_index, dep_id, year = task
+            try:
+                for page in self.client.paginated(despesas_endpoint(dep_id), {"ano": year, "itens": 100}, max_pages=None):
+                    yield "page", task, page
+            except Exception as exc:
+                yield "gap", task, str(exc)
+            yield "done", task, None
+
+        def persist(item: tuple[str, tuple[int, int, int, int], Any]) -> list[tuple[str, int, list[dict[str, Any]]]] | None:
+            kind, (seq, _dep_index, dep_id, year), payload = item
+            if kind == "gap":
+                coverage_gaps.append({"deputado_id": dep_id, "year": year, "reason": payload})
+                return None
+            if kind == "done":
+                finished.add(seq)
+                while watermark["next"] in finished:
+                    finished.discard(watermark["next"])
+                    watermark["next"] += 1
+                return None
+            status, body, page_params = payload
+            raw = self.raw_store.add_payload(
+                batch=batch,
+                endpoint=despesas_endpoint(dep_id),
+                params=page_params,
+                primary_key=f"{dep_id}:{year}:{page_params.get('pagina', 1)}",
+                http_status=status,
+                body_json=body,
+            )
+            if status == 304:
+                tally.add("unchanged")
+                return None
+            return [(raw.id, dep_id, body.get("dados", []))]
+
+        def normalize(item: tuple[str, int, list[dict[str, Any]]]) -> list[tuple[dict[str, Any], str]]:
+            raw_id, dep_id, expenses = item
+            return [(normalize_expense(expense, dep_id), raw_id) for expense in expenses]
+
+        def write(rows: list[tuple[dict[str, Any], str]]) -> None:
+            self.graph.upsert_expenses(rows)
+            tally.add("processed", len(rows))
+
+        def task_cursor() -> dict[str, Any] | None:
+            if not watermark["next"]:
+                return None
+            dep_index, _dep_id, year = tasks[watermark["next"] - 1]
+            return {**cursor, "dep_index": dep_index, "year": year, "processed": tally["processed"]}
+
+        self._run_pipeline(
+            "expenses",
+            [(seq, *task) for seq, task in enumerate(tasks)],
+            fetch=fetch,
+            persist=persist,
+            normalize=normalize,
+            write=write,
+            job_name=job_name,
+            cursor=task_cursor,
+            fetch_workers=self._max_workers,
+        )
+
     def smoke_real(self, sample_size: int = 5) -> dict[str, Any]:
         today = date.today()
         from_date = today - timedelta(days=30)
@@ -549,31 +795,6 @@ class IngestJobs:
             return "upstream_error"
         return "nominal_votes_http_error"
 
-    @staticmethod
-    def _coerce_date(value: Any) -> date | None:
-        if value in (None, ""):
-            return None
-        raw = str(value).strip()
-        if not raw:
-            return None
-        if "T" in raw:
-            raw = raw.split("T", 1)[0]
-        try:
-            return date.fromisoformat(raw)
-        except ValueError:
-            return None
-
-    @staticmethod
-    def _iter_static_records(payload: Any) -> list[dict[str, Any]]:
-        if isinstance(payload, list):
-            return [row for row in payload if isinstance(row, dict)]
-        if isinstance(payload, dict):
-            if isinstance(payload.get("dados"), list):
-                return [row for row in payload["dados"] if isinstance(row, dict)]
-            if isinstance(payload.get("data"), list):
-                return [row for row in payload["data"] if isinstance(row, dict)]
-        return []
-
     def _ingest_bills_static_fallback(self, *, batch: Any, from_date: date, to_date: date) -> int:
         template = get_settings().camara_proposicoes_static_url_template.strip()
         if not template:
@@ -582,35 +803,29 @@ class IngestJobs:
         processed = 0
         for year in range(from_date.year, to_date.year + 1):
             url = template.format(year=year)
-            status, raw_text = self.client.get_text(url, raise_for_status=False)
+            status, index, cache_state = self.datasets.index(url, date_keys=PROPOSICOES_DATE_KEYS, id_keys=PROPOSICOES_ID_KEYS)
             raw = self.raw_store.add_payload(
                 batch=batch,
                 endpoint=f"/datasets/proposicoes/{year}",
                 params={"year": year, "url": url},
                 primary_key=str(year),
                 http_status=status,
-                body_json={"metadata": {"url": url, "year": year, "status_code": status}},
+                body_json={"metadata": {"url": url, "year": year, "status_code": status, "cache": cache_state}},
                 source="camara_dataset",
             )
-            if status != 200 or not raw_text.strip():
+            if index is None:
                 continue
-            try:
-                payload = json.loads(raw_text)
-            except Exception:
-                continue
-            for row in self._iter_static_records(payload):
-                row_date = self._coerce_date(row.get("dataApresentacao") or row.get("data"))
-                if row_date and (row_date < from_date or row_date > to_date):
-                    continue
+            bills = []
+            for row in index.between(from_date, to_date):
                 prop_id = row.get("id") or row.get("idProposicao")
                 if not prop_id:
                     continue
                 try:
-                    bill = normalize_bill(row if isinstance(row, dict) else {"id": prop_id})
-                    self.graph.upsert_bill(bill, raw.id)
-                    processed += 1
+                    bills.append((normalize_bill(row), raw.id))
                 except Exception:
                     continue
+            self.graph.upsert_bills(bills)
+            processed += len(bills)
         return processed
 
     def _ingest_votes_static_fallback(
@@ -633,32 +848,21 @@ class IngestJobs:
 
         for year in range(from_date.year, to_date.year + 1):
             event_node_by_votacao: dict[str, str] = {}
+            events: list[tuple[dict[str, Any], str]] = []
 
             votes_url = votes_template.format(year=year)
-            votes_status, votes_text = self.client.get_text(votes_url, raise_for_status=False)
+            votes_status, votes_index, votes_cache = self.datasets.index(votes_url, date_keys=VOTACOES_DATE_KEYS, id_keys=VOTACOES_ID_KEYS)
             raw_votes_year = self.raw_store.add_payload(
                 batch=batch,
                 endpoint=f"/datasets/votacoes/{year}",
                 params={"year": year, "url": votes_url},
                 primary_key=str(year),
                 http_status=votes_status,
-                body_json={"metadata": {"url": votes_url, "year": year, "status_code": votes_status}},
+                body_json={"metadata": {"url": votes_url, "year": year, "status_code": votes_status, "cache": votes_cache}},
                 source="camara_dataset",
             )
-            if votes_status == 200 and votes_text.strip():
-                try:
-                    votes_payload = json.loads(votes_text)
-                except Exception:
-                    votes_payload = []
-                for row in self._iter_static_records(votes_payload):
-                    row_date = self._coerce_date(
-                        row.get("data")
-                        or row.get("dataHoraRegistro")
-                        or row.get("dataVotacao")
-                        or row.get("dataHoraVotacao")
-                    )
-                    if row_date and (row_date < from_date or row_date > to_date):
-                        continue
+            if votes_index is not None:
+                for row in votes_index.between(from_date, to_date):
                     event_id = row.get("id") or row.get("idVotacao")
                     if not event_id:
                         continue
@@ -666,35 +870,32 @@ class IngestJobs:
                         node = normalize_vote_event(row)
                     except Exception:
                         continue
-                    self.graph.upsert_vote_event(node, raw_votes_year.id)
+                    events.append((node, raw_votes_year.id))
                     event_node_by_votacao[str(event_id)] = node["id"]
-                    events_count += 1
+                self.graph.upsert_vote_events(events)
+                events_count += len(events)
 
-            if not votes_nominal_template:
+            # Without events in the window there is nothing to attach votes to, so the (large) nominal file is not touched.
+            if not votes_nominal_template or not event_node_by_votacao:
                 continue
 
             nominal_url = votes_nominal_template.format(year=year)
-            nominal_status, nominal_text = self.client.get_text(nominal_url, raise_for_status=False)
+            nominal_status, nominal_index, nominal_cache = self.datasets.index(nominal_url, id_keys=VOTACOES_VOTOS_ID_KEYS)
             raw_nominal_year = self.raw_store.add_payload(
                 batch=batch,
                 endpoint=f"/datasets/votacoesVotos/{year}",
                 params={"year": year, "url": nominal_url},
                 primary_key=str(year),
                 http_status=nominal_status,
-                body_json={"metadata": {"url": nominal_url, "year": year, "status_code": nominal_status}},
+                body_json={"metadata": {"url": nominal_url, "year": year, "status_code": nominal_status, "cache": nominal_cache}},
                 source="camara_dataset",
             )
-            if nominal_status != 200 or not nominal_text.strip() or not event_node_by_votacao:
-                continue
-            try:
-                nominal_payload = json.loads(nominal_text)
-            except Exception:
+            if nominal_index is None:
                 continue
 
-            for row in self._iter_static_records(nominal_payload):
+            actions: list[tuple[dict[str, Any], str]] = []
+            for row in nominal_index.by_ids(event_node_by_votacao):
                 votacao_id = row.get("idVotacao") or row.get("id")
-                if not votacao_id:
-                    continue
                 event_node_id = event_node_by_votacao.get(str(votacao_id))
                 if not event_node_id:
                     continue
@@ -716,8 +917,9 @@ class IngestJobs:
                         event_node_id,
                         person_node_id,
                     )
-                self.graph.upsert_vote_action(action, raw_nominal_year.id)
-                actions_count += 1
+                actions.append((action, raw_nominal_year.id))
+            self.graph.upsert_vote_actions(actions)
+            actions_count += len(actions)
 
         return events_count, actions_count
 
@@ -756,6 +958,7 @@ class IngestJobs:
                 continue
 
             reader = csv.DictReader(io.StringIO(csv_text), delimiter=sep)
+            expenses: list[tuple[dict[str, Any], str]] = []
             for row in reader:
                 dep_id = self._dataset_dep_id(row)
                 if dep_id is None or dep_id not in dep_set:
@@ -763,9 +966,9 @@ class IngestJobs:
                 normalized = self._dataset_expense_to_camara_shape(row, dep_id, year)
                 if not normalized:
                     continue
-                node = normalize_expense(normalized, dep_id)
-                self.graph.upsert_expense(node, raw.id)
-                rows_processed += 1
+                expenses.append((normalize_expense(normalized, dep_id), raw.id))
+            self.graph.upsert_expenses(expenses)
+            rows_processed += len(expenses)
 
         return rows_processed
 
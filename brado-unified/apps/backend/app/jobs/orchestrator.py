@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator
 from datetime import date
 
 from sqlalchemy import select
 
+from ..core.config import get_settings
+from ..db.raw_store import (
+    archive_cold_blobs,
+    inclusion_proof,
+    iter_batch_export,
+    rebuild_missing_merkle_nodes,
+    rebuild_payload_stats,
+    verify_batches,
+)
 from ..db.sql import session_scope
 from ..db.sql.models import JobState, ReconcileReport
+from ..graph.neo4j import Neo4jWriter, collect_graph_stats, get_driver, replay_dead_letters
 from ..jobs.ingest_jobs import IngestJobs
 from ..jobs.profile_jobs import ProfileJobs
-from ..reconcile.service import ReconcileService
+from ..reconcile.service import ReconcileService, coverage_years
 
 
 class JobOrchestrator:
@@ -52,17 +64,62 @@ class JobOrchestrator:
             "expenses": self.ingest_expenses(from_date),
         }
 
-    def reconcile_all(self) -> dict:
+    def reconcile_all(self, incremental: bool = False) -> dict:
         with session_scope() as session:
             reconcile = ReconcileService(session)
             try:
-                result = reconcile.reconcile_all()
+                result = reconcile.reconcile_all(incremental=incremental)
                 if result.status != "success":
                     raise RuntimeError(result.report)
                 return result.report
             finally:
                 reconcile.close()
 
+    def check_graph_plans(self) -> dict:
+        with session_scope() as session:
+            reconcile = ReconcileService(session)
+            try:
+                return reconcile.check_query_plans()
+            finally:
+                reconcile.close()
+
+    def graph_stats(self, refresh: bool = False) -> dict:
+        return collect_graph_stats(get_driver(), expense_years=coverage_years(), refresh=refresh)
+
+    def archive_raw(self, older_than_days: int | None = None, limit: int | None = None) -> dict:
+        with session_scope() as session:
+            return archive_cold_blobs(session, older_than_days=older_than_days, limit=limit)
+
+    def rebuild_raw_stats(self) -> dict:
+        with session_scope() as session:
+            return rebuild_payload_stats(session)
+
+    def rebuild_merkle_nodes(self) -> dict:
+        with session_scope() as session:
+            return rebuild_missing_merkle_nodes(session)
+
+    def verify_batches(self, since: date | None = None, workers: int | None = None, use_threads: bool = False) -> dict:
+        with session_scope() as session:
+            return verify_batches(session, get_settings().database_url, since=since, workers=workers, use_threads=use_threads)
+
+    def batch_proof(self, batch_id: str, raw_payload_id: str) -> dict:
+        with session_scope() as session:
+            return inclusion_proof(session, batch_id, raw_payload_id)
+
+    def export_batch(self, batch_id: str) -> Iterator[str]:
+        """NDJSON lines of the batch export; the session stays open while the caller consumes them."""
+        with session_scope() as session:
+            for record in iter_batch_export(session, batch_id):
+                yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+    def replay_graph_dlq(self, limit: int | None = None) -> dict:
+        with session_scope() as session:
+            writer = Neo4jWriter()
+            try:
+                return replay_dead_letters(session, writer, limit=limit)
+            finally:
+                writer.close()
+
     def latest_reconcile_report(self) -> dict:
         with session_scope() as session:
             row = session.execute(select(ReconcileReport).order_by(ReconcileReport.run_at.desc()).limit(1)).scalar_one_or_none()
@@ -75,14 +132,10 @@ class JobOrchestrator:
         page_offset = max(0, offset)
         with session_scope() as session:
             states = (
-                session.execute(select(JobState).order_by(JobState.updated_at.desc()).offset(page_offset).limit(page_limit))
-                .scalars()
-                .all()
+                session.execute(select(JobState).order_by(JobState.updated_at.desc()).offset(page_offset).limit(page_limit)).scalars().all()
             )
             reports = (
-                session.execute(
-                    select(ReconcileReport).order_by(ReconcileReport.run_at.desc()).offset(page_offset).limit(page_limit)
-                )
+                session.execute(select(ReconcileReport).order_by(ReconcileReport.run_at.desc()).offset(page_offset).limit(page_limit))
                 .scalars()
                 .all()
             )
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import queue
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from typing import Any
+
+from ..core.observability.metrics import metrics_registry
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Stopped(Exception):
+    pass
+
+
+@dataclass
+class Stage:
+    """One pipeline step. ``fn`` takes an item and returns an iterable of items for the next stage (or None).
+
+    ``checkpoint`` runs on the stage's own worker thread every ``checkpoint_every``
+    items and once more when the stage drains, so a single-worker stage may use it
+    to commit state it owns (e.g. the SQL session). ``flush`` also runs once at
+    drain; its outputs go downstream like ``fn``'s (e.g. a partly filled batch).
+    """
+
+    name: str
+    fn: Callable[[Any], Iterable[Any] | None]
+    workers: int = 1
+    checkpoint_every: int = 0
+    checkpoint: Callable[[], None] | None = None
+    flush: Callable[[], Iterable[Any] | None] | None = None
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    emitted: int = 0
+    busy_seconds: float = 0.0
+
+
+class Batcher:
+    """Thread-safe grouping of rows into lists of at least ``size`` rows; one ``add`` call is never split."""
+
+    def __init__(self, size: int) -> None:
+        self.size = max(1, size)
+        self._lock = Lock()
+        self._rows: list[Any] = []
+
+    def add(self, rows: Iterable[Any] | None) -> list[list[Any]]:
+        with self._lock:
+            self._rows.extend(rows or ())
+            if len(self._rows) < self.size:
+                return []
+            full, self._rows = self._rows, []
+        return [full]
+
+    def drain(self) -> list[list[Any]]:
+        with self._lock:
+            rest, self._rows = self._rows, []
+        return [rest] if rest else []
+
+
+class Tally:
+    """Thread-safe named counters shared by stage callables."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counts: Counter[str] = Counter()
+
+    def add(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += amount
+
+    def __getitem__(self, key: str) -> int:
+        with self._lock:
+            return self._counts[key]
+
+
+class LowWaterMark:
+    """Items numbered in the order one single-worker stage saw them, finished in any order by later stages.
+
+    ``issue`` records a state with each item; ``settle`` returns, in order, the states of the items that
+    became safe since its last call: an item is safe once it and every item issued before it are done.
+    ``done`` may carry an ``ack`` (e.g. the graph write-behind sequence that covers the item); ``ack`` is
+    the highest one among the settled items.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._issued = 0
+        self._settled = 0
+        self._pending: set[int] = set()
+        self._states: dict[int, Any] = {}
+        self._acks: dict[int, int] = {}
+        self.ack = 0
+
+    def issue(self, state: Any, *, done: bool = False) -> int:
+        with self._lock:
+            self._issued += 1
+            self._states[self._issued] = state
+            if not done:
+                self._pending.add(self._issued)
+            return self._issued
+
+    def done(self, *seqs: int, ack: int = 0) -> None:
+        with self._lock:
+            self._pending.difference_update(seqs)
+            if ack:
+                self._acks.update((seq, ack) for seq in seqs)
+
+    def settle(self) -> list[Any]:
+        with self._lock:
+            safe = min(self._pending) - 1 if self._pending else self._issued
+            settled = range(self._settled + 1, safe + 1)
+            states = [self._states.pop(seq) for seq in settled]
+            self.ack = max([self.ack, *(self._acks.pop(seq, 0) for seq in settled)])
+            self._settled = max(self._settled, safe)
+        return states
+
+
+@dataclass
+class _StageRuntime:
+    stage: Stage
+    inbox: queue.Queue
+    stats: StageStats = field(default_factory=StageStats)
+    lock: Lock = field(default_factory=Lock)
+    remaining_workers: int = 0
+    since_checkpoint: int = 0
+
+
+class Pipeline:
+    """Stages connected by bounded queues; a full queue blocks the upstream stage (back-pressure).
+
+    The first exception raised by the source or any stage stops every stage and is
+    re-raised from ``run()``.
+    """
+
+    def __init__(self, name: str, stages: list[Stage], *, queue_size: int = 256) -> None:
+        if not stages:
+            raise ValueError("pipeline needs at least one stage")
+        self.name = name
+        self._runtimes = [_StageRuntime(stage, queue.Queue(maxsize=max(1, queue_size))) for stage in stages]
+        self._stop = Event()
+        self._error: BaseException | None = None
+        self._error_lock = Lock()
+
+    @property
+    def stats(self) -> dict[str, StageStats]:
+        return {runtime.stage.name: runtime.stats for runtime in self._runtimes}
+
+    def run(self, source: Iterable[Any]) -> dict[str, StageStats]:
+        threads = [Thread(target=self._feed, args=(source,), name=f"{self.name}:source", daemon=True)]
+        for index, runtime in enumerate(self._runtimes):
+            runtime.remaining_workers = max(1, runtime.stage.workers)
+            for worker in range(runtime.remaining_workers):
+                threads.append(Thread(target=self._work, args=(index,), name=f"{self.name}:{runtime.stage.name}:{worker}", daemon=True))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def _fail(self, exc: BaseException) -> None:
+        with self._error_lock:
+            if self._error is None:
+                self._error = exc
+        self._stop.set()
+
+    def _put(self, index: int, item: Any) -> None:
+        runtime = self._runtimes[index]
+        while True:
+            if self._stop.is_set():
+                raise _Stopped
+            try:
+                runtime.inbox.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        metrics_registry.set_ingest_queue_depth(self.name, runtime.stage.name, runtime.inbox.qsize())
+
+    def _get(self, index: int) -> Any:
+        runtime = self._runtimes[index]
+        while True:
+            if self._stop.is_set():
+                raise _Stopped
+            try:
+                item = runtime.inbox.get(timeout=_POLL_SECONDS)
+                break
+            except queue.Empty:
+                continue
+        metrics_registry.set_ingest_queue_depth(self.name, runtime.stage.name, runtime.inbox.qsize())
+        return item
+
+    def _close_stage_input(self, index: int) -> None:
+        for _ in range(max(1, self._runtimes[index].stage.workers)):
+            self._put(index, _DONE)
+
+    def _feed(self, source: Iterable[Any]) -> None:
+        try:
+            for item in source:
+                self._put(0, item)
+            self._close_stage_input(0)
+        except _Stopped:
+            return
+        except BaseException as exc:
+            self._fail(exc)
+
+    def _work(self, index: int) -> None:
+        runtime = self._runtimes[index]
+        stage = runtime.stage
+        last = index == len(self._runtimes) - 1
+        try:
+            while True:
+                item = self._get(index)
+                if item is _DONE:
+                    break
+                started = time.perf_counter()
+                outputs = stage.fn(item)
+                emitted = 0
+                try:
+                    for output in outputs or ():
+                        if not last:
+                            self._put(index + 1, output)
+                        emitted += 1
+                finally:
+                    close = getattr(outputs, "close", None)
+                    if close is not None:
+                        close()
+                elapsed = time.perf_counter() - started
+                metrics_registry.observe_ingest_stage(self.name, stage.name, elapsed)
+                self._after_item(runtime, emitted, elapsed)
+
+            with runtime.lock:
+                runtime.remaining_workers -= 1
+                drained = runtime.remaining_workers == 0
+            if drained:
+                if stage.flush is not None:
+                    for output in stage.flush() or ():
+                        if not last:
+                            self._put(index + 1, output)
+                if stage.checkpoint is not None:
+                    stage.checkpoint()
+                if not last:
+                    self._close_stage_input(index + 1)
+        except _Stopped:
+            return
+        except BaseException as exc:
+            self._fail(exc)
+
+    def _after_item(self, runtime: _StageRuntime, emitted: int, elapsed: float) -> None:
+        stage = runtime.stage
+        with runtime.lock:
+            runtime.stats.items += 1
+            runtime.stats.emitted += emitted
+            runtime.stats.busy_seconds += elapsed
+            runtime.since_checkpoint += 1
+            due = stage.checkpoint is not None and stage.checkpoint_every > 0 and runtime.since_checkpoint >= stage.checkpoint_every
+            if due:
+                runtime.since_checkpoint = 0
+                # Under the stage lock so checkpoints never overlap each other or interleave oddly.
+                stage.checkpoint()
@@ -4,6 +4,7 @@ from collections import defaultdict
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from ..db.sql.models import LegislatorProfile, PartyProfile, RawPayload
 from ..political_interview.constants import DIMENSIONS
@@ -46,6 +47,7 @@ class ProfileJobs:
             self.session.execute(
                 select(RawPayload)
                 .where(RawPayload.endpoint.like("%/votacoes/%/votos"))
+                .options(selectinload(RawPayload.blob))
                 .order_by(RawPayload.fetched_at.desc())
                 .limit(max(1, min(limit_payloads, 2000)))
             )
@@ -11,6 +11,7 @@ from .api.routers.observability import router as observability_router
 from .core.config import get_settings
 from .core.logging import configure_logging
 from .core.observability.middleware import RequestObservabilityMiddleware
+from .graph.neo4j import close_driver
 
 
 def create_app() -> FastAPI:
@@ -32,6 +33,7 @@ def create_app() -> FastAPI:
     app.include_router(auth_v1_router)
     app.include_router(admin_router)
     app.include_router(interview_router)
+    app.add_event_handler("shutdown", close_driver)
     return app
 
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
 import hashlib
+from datetime import UTC, datetime
 from typing import Any
 
 from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 
 from ..core.config import get_settings
 from ..db.sql import session_scope
@@ -18,7 +19,6 @@ from ..db.sql.models import (
     RawPayload,
 )
 from .budget import simulate_budget
-from .constants import DIMENSIONS
 from .question_bank import build_seed_questions, pick_next_question
 from .report_export import build_pdf_report, format_result_lines
 from .scoring import score_interview
@@ -73,8 +73,7 @@ class InterviewService:
                 session.flush()
 
             answered_count = int(
-                session.scalar(select(func.count(InterviewAnswer.id)).where(InterviewAnswer.session_id == session_id))
-                or 0
+                session.scalar(select(func.count(InterviewAnswer.id)).where(InterviewAnswer.session_id == session_id)) or 0
             )
 
             next_question = self._next_question(session, session_id=session_id)
@@ -117,7 +116,7 @@ class InterviewService:
                 existing.ranking_json = {"items": ranking}
 
             interview.status = "completed"
-            interview.completed_at = datetime.now(timezone.utc)
+            interview.completed_at = datetime.now(UTC)
             session.add(interview)
 
             return {
@@ -207,6 +206,7 @@ class InterviewService:
                 session.execute(
                     select(RawPayload)
                     .where(RawPayload.endpoint.like("%/proposicoes%"))
+                    .options(selectinload(RawPayload.blob))
                     .order_by(RawPayload.fetched_at.desc())
                     .limit(max(1, min(limit, 100)))
                 )
@@ -226,7 +226,7 @@ class InterviewService:
                             "ano": entry.get("ano"),
                         }
                     )
-            return {"items": items[: limit]}
+            return {"items": items[:limit]}
 
     def _ensure_question_bank(self, session) -> None:
         existing = session.scalar(select(func.count(InterviewQuestion.id))) or 0
@@ -239,12 +239,13 @@ class InterviewService:
 
     def _next_question(self, session, session_id: str) -> InterviewQuestion | None:
         answered_ids = {
-            row[0]
-            for row in session.execute(select(InterviewAnswer.question_id).where(InterviewAnswer.session_id == session_id)).all()
+            row[0] for row in session.execute(select(InterviewAnswer.question_id).where(InterviewAnswer.session_id == session_id)).all()
         }
-        all_questions = session.execute(
-            select(InterviewQuestion).where(InterviewQuestion.active == 1).order_by(InterviewQuestion.id.asc())
-        ).scalars().all()
+        all_questions = (
+            session.execute(select(InterviewQuestion).where(InterviewQuestion.active == 1).order_by(InterviewQuestion.id.asc()))
+            .scalars()
+            .all()
+        )
         unanswered = [
             {
                 "id": q.id,
@@ -264,14 +265,11 @@ class InterviewService:
         return session.get(InterviewQuestion, picked["id"])
 
     def _load_answers_with_dimensions(self, session, session_id: str) -> list[dict]:
-        rows = (
-            session.execute(
-                select(InterviewAnswer, InterviewQuestion)
-                .join(InterviewQuestion, InterviewQuestion.id == InterviewAnswer.question_id)
-                .where(InterviewAnswer.session_id == session_id)
-            )
-            .all()
-        )
+        rows = session.execute(
+            select(InterviewAnswer, InterviewQuestion)
+            .join(InterviewQuestion, InterviewQuestion.id == InterviewAnswer.question_id)
+            .where(InterviewAnswer.session_id == session_id)
+        ).all()
         return [
             {
                 "question_id": answer.question_id,
@@ -8,7 +8,7 @@ from .anchor import (
     anchor_root,
 )
 from .hashing import generate_salt, hash_value, sha256_json_canonical
-from .merkle import build_merkle, merkle_root
+from .merkle import MerkleFrontier, build_merkle, merkle_root
 
 __all__ = [
     "ANCHOR_FILE",
@@ -21,6 +21,7 @@ __all__ = [
     "generate_salt",
     "hash_value",
     "sha256_json_canonical",
+    "MerkleFrontier",
     "build_merkle",
     "merkle_root",
 ]
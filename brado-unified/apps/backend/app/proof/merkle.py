@@ -1,15 +1,16 @@
 import hashlib
-from typing import List, Dict, Any
+from collections.abc import Callable
+from typing import Any
 
 
-def merkle_root(leaves: List[str]) -> str:
+def merkle_root(leaves: list[str]) -> str:
     """Compute the Merkle root of a list of hexadecimal leaf hashes.
     Each leaf should be a hex string (without 0x prefix). If the number of
     leaves is odd, the last hash is duplicated. Hashes are concatenated
     and hashed with SHA‑256 at each level until one root remains.
     """
     if not leaves:
-        return ''
+        return ""
     layer = list(leaves)
     while len(layer) > 1:
         if len(layer) % 2 == 1:
@@ -17,13 +18,13 @@ def merkle_root(leaves: List[str]) -> str:
         next_layer = []
         for i in range(0, len(layer), 2):
             combined = layer[i] + layer[i + 1]
-            new_hash = hashlib.sha256(combined.encode('utf-8')).hexdigest()
+            new_hash = hashlib.sha256(combined.encode("utf-8")).hexdigest()
             next_layer.append(new_hash)
         layer = next_layer
     return layer[0]
 
 
-def build_merkle(leaves: List[str]) -> Dict[str, Any]:
+def build_merkle(leaves: list[str]) -> dict[str, Any]:
     """Build a Merkle tree representation.
 
     Returns a dictionary with the following keys:
@@ -40,3 +41,105 @@ def build_merkle(leaves: List[str]) -> Dict[str, Any]:
         "algorithm": "sha256",
         "duplicated_last_if_odd": True,
     }
+
+
+# Called with (level, position, digest) for every internal node once its value is final.
+NodeSink = Callable[[int, int, bytes], None]
+
+
+def _combine(left: bytes, right: bytes) -> bytes:
+    # Same node hash as ``merkle_root``: SHA-256 over the two hex digests concatenated.
+    return hashlib.sha256((left.hex() + right.hex()).encode("utf-8")).digest()
+
+
+class MerkleFrontier:
+    """Incremental form of ``merkle_root`` that keeps one pending node per level.
+
+    Leaves are appended one at a time and ``root()`` finishes the odd-node
+    duplication in O(log n), so the full leaf list is never held in memory.
+    Nodes are 32-byte digests; ``to_bytes``/``from_bytes`` persist the frontier
+    so an interrupted batch can keep appending.
+    """
+
+    def __init__(self, count: int = 0, nodes: list[bytes | None] | None = None) -> None:
+        self.count = count
+        self.nodes: list[bytes | None] = list(nodes or [])
+
+    def add(self, leaf_hex: str, on_node: NodeSink | None = None) -> None:
+        carry = bytes.fromhex(leaf_hex)
+        level = 0
+        while level < len(self.nodes) and self.nodes[level] is not None:
+            carry = _combine(self.nodes[level], carry)
+            self.nodes[level] = None
+            level += 1
+            if on_node is not None:
+                on_node(level, self.count >> level, carry)
+        if level == len(self.nodes):
+            self.nodes.append(carry)
+        else:
+            self.nodes[level] = carry
+        self.count += 1
+
+    def root(self, on_node: NodeSink | None = None) -> str:
+        """Close the tree; ``on_node`` receives the right-edge nodes that only exist for this leaf count."""
+        if self.count == 0:
+            return ""
+        carry: bytes | None = None
+        level = 0
+        while True:
+            width = -(-self.count // (1 << level))
+            node = self.nodes[level] if level < len(self.nodes) else None
+            if width == 1:
+                return (node or carry).hex()
+            if carry is None:
+                if node is not None:
+                    carry = _combine(node, node)
+            elif node is not None:
+                carry = _combine(node, carry)
+            else:
+                carry = _combine(carry, carry)
+            level += 1
+            if carry is not None and on_node is not None:
+                on_node(level, -(-self.count // (1 << level)) - 1, carry)
+
+    def to_bytes(self) -> bytes:
+        """Pending nodes from the lowest level up; which levels are set follows from ``count``'s bits."""
+        return b"".join(node for node in self.nodes if node is not None)
+
+    @classmethod
+    def from_bytes(cls, count: int, data: bytes | None) -> "MerkleFrontier":
+        data = data or b""
+        nodes: list[bytes | None] = []
+        offset = 0
+        for level in range(count.bit_length()):
+            if count >> level & 1:
+                nodes.append(data[offset : offset + 32])
+                offset += 32
+            else:
+                nodes.append(None)
+        if offset != len(data):
+            raise ValueError(f"merkle frontier holds {len(data)} bytes, expected {offset} for {count} leaves")
+        return cls(count, nodes)
+
+
+def proof_path(width: int, leaf_index: int) -> list[tuple[int, int]]:
+    """(level, position) of the sibling at each level for ``leaf_index`` in a tree of ``width`` leaves.
+
+    A position past the end of its level means the node is paired with itself.
+    """
+    path: list[tuple[int, int]] = []
+    level, position = 0, leaf_index
+    while width > 1:
+        sibling = position ^ 1
+        path.append((level, sibling if sibling < width else position))
+        level, position, width = level + 1, position >> 1, -(-width // 2)
+    return path
+
+
+def verify_proof(leaf_hex: str, proof: list[dict[str, str]], root: str) -> bool:
+    """Check an inclusion proof: each step is ``{"side": "left"|"right", "hash": <hex>}`` from the leaf up."""
+    current = leaf_hex
+    for step in proof:
+        combined = step["hash"] + current if step["side"] == "left" else current + step["hash"]
+        current = hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    return current == root
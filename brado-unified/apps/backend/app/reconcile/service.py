@@ -1,17 +1,70 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date, datetime, timezone
 import json
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from functools import partial
+from time import perf_counter
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 from sqlalchemy import func, or_, select
 
-from ..db.sql.models import IngestionBatch, JobState, RawPayload, ReconcileReport
+from ..core.config import get_settings
+from ..db.raw_store import expected_items, read_archived_body
+from ..db.sql.models import IngestionBatch, JobState, RawBlob, RawPayload, RawPayloadStat, ReconcileReport
 from ..graph.neo4j import Neo4jWriter
+from ..graph.neo4j.plans import label_scans
+from ..graph.neo4j.stats import GRAPH_STATS, UNIQUE_LABELS, collect_graph_stats, year_values
 from ..ingest.camara.client import CamaraClient
-from ..ingest.camara.endpoints import DEPUTADOS_ENDPOINT, PROPOSICOES_ENDPOINT, VOTACOES_ENDPOINT
+from ..ingest.camara.endpoints import DEPUTADOS_ENDPOINT, PROPOSICOES_ENDPOINT, VOTACOES_ENDPOINT, despesas_endpoint
+
+AUDIT_LABELS = ("Bill", "VoteEvent", "Expense")
+# Reconcile domains, named after the middle part of ingestion batch types ("camara:votes:2018-01-01").
+DOMAINS = ("deputados", "bills", "votes", "expenses")
+LABEL_DOMAINS = {
+    "Person": "deputados",
+    "Party": "deputados",
+    "State": "deputados",
+    "Bill": "bills",
+    "VoteEvent": "votes",
+    "VoteAction": "votes",
+    "Expense": "expenses",
+    "Organization": "expenses",
+}
+# name -> (domains whose batches can change it, orphan counter in GRAPH_STATS).
+INTEGRITY_CHECKS: dict[str, tuple[tuple[str, ...], str]] = {
+    "integrity_vote_action_has_event": (("votes",), "vote_actions_without_event"),
+    "integrity_vote_action_has_person": (("votes", "deputados"), "vote_actions_without_person"),
+    "integrity_expense_has_person": (("expenses", "deputados"), "expenses_without_person"),
+    "integrity_vote_event_bill_link": (("votes", "bills"), "vote_events_without_bill"),
+}
+
+# Every graph query reconcile runs; each must be answered from an index or the count store (see check_query_plans).
+# All counters come from the single GRAPH_STATS pass; only the audit samples read nodes.
+GRAPH_QUERIES: dict[str, str] = {
+    "graph_stats": GRAPH_STATS,
+    **{
+        f"audit_{label.lower()}": (
+            f"MATCH (n:{label}) WHERE n.id IS NOT NULL RETURN n.id as id, n.sourceId as sourceId, n.rawRefs as rawRefs, "
+            "n.rawRef as rawRef, n.ano as ano, n.numero as numero, n.dataHoraRegistro as dataHoraRegistro, "
+            "n.year as year, n.month as month LIMIT $limit"
+        )
+        for label in AUDIT_LABELS
+    },
+}
+
+# Representative parameters for EXPLAIN.
+_EXPLAIN_PARAMS: dict[str, dict[str, Any]] = {
+    "graph_stats": {"years": year_values(2018)},
+    **{f"audit_{label.lower()}": {"limit": 50} for label in AUDIT_LABELS},
+}
+
+
+def coverage_years() -> range:
+    return range(2018, datetime.now(UTC).year + 1)
 
 
 @dataclass
@@ -21,24 +74,28 @@ class ReconcileResult:
 
 
 class ReconcileService:
-    def __init__(self, session):
+    def __init__(self, session, *, max_workers: int | None = None):
         self.session = session
         self.client = CamaraClient()
         self.graph = Neo4jWriter()
+        self.max_workers = max(1, max_workers or get_settings().reconcile_max_workers)
 
     def close(self) -> None:
         self.client.close()
         self.graph.close()
 
-    def _scalar_graph(self, query: str, **params: Any) -> int:
-        with self.graph.client.driver.session() as neo_session:
-            row = neo_session.run(query, **params).single()
-            if row is None:
-                return 0
-            try:
-                return int(row["c"])
-            except Exception:
-                return 0
+    def check_query_plans(self) -> dict[str, Any]:
+        """EXPLAIN every reconcile graph query; any label scan means an index is missing or a query regressed."""
+        queries = {name: (query, _EXPLAIN_PARAMS.get(name, {})) for name, query in GRAPH_QUERIES.items()}
+        offenders = label_scans(self.graph.client.driver, queries)
+        return {"status": "ok" if not offenders else "label_scan", "queries": len(queries), "label_scans": offenders}
+
+    def _graph_stats(self) -> dict[str, Any]:
+        """Graph counters of this run: one GRAPH_STATS pass, or its cached copy while the graph version is unchanged."""
+        stats = getattr(self, "_stats", None)
+        if stats is None:
+            stats = self._stats = collect_graph_stats(self.graph.client.driver, expense_years=coverage_years())
+        return stats.result() if isinstance(stats, Future) else stats
 
     @staticmethod
     def _estimate_api_total(body: dict[str, Any], itens_per_page: int = 1) -> int:
@@ -73,21 +130,51 @@ class ReconcileService:
             "context": context or {},
         }
 
-    def _expenses_expected_from_raw(self, year: int) -> int:
-        rows = self.session.execute(select(RawPayload).where(RawPayload.endpoint.like("/deputados/%/despesas"))).scalars().all()
-        total = 0
-        for row in rows:
-            params = row.params_json or {}
-            body = row.body_json if isinstance(row.body_json, dict) else {}
-            if int(params.get("ano", -1)) != year:
-                continue
-            if int(row.http_status or 0) != 200:
+    def _in_scope(self, domain: str, year: int | None = None) -> bool:
+        """Whether a check must be re-evaluated; everything is in scope outside incremental runs."""
+        scope = getattr(self, "_scope", None)
+        if scope is None:
+            return True
+        if domain not in scope:
+            return False
+        years = scope[domain]
+        return years is None or year is None or year in years
+
+    def _incremental_scope(self) -> tuple[ReconcileReport | None, dict[str, set[int] | None] | None]:
+        """Latest report and the domain -> years touched by batches finished after it (years None = all).
+
+        A scope of None means a full run: there is no previous report, or a batch of an unknown type
+        finished since.
+        """
+        previous = self.session.execute(select(ReconcileReport).order_by(ReconcileReport.run_at.desc()).limit(1)).scalar_one_or_none()
+        if previous is None or not isinstance(previous.report_json, dict) or not previous.report_json.get("checks"):
+            return None, None
+        scope: dict[str, set[int] | None] = {}
+        rows = self.session.execute(
+            select(IngestionBatch.batch_type, IngestionBatch.range_start, IngestionBatch.range_end).where(
+                IngestionBatch.finished_at.is_not(None), IngestionBatch.finished_at > previous.run_at
+            )
+        )
+        for batch_type, range_start, range_end in rows:
+            parts = batch_type.split(":")
+            domain = parts[1] if len(parts) > 1 else ""
+            if domain not in DOMAINS:
+                return previous, None
+            if not range_start or not range_end or scope.get(domain, set()) is None:
+                scope[domain] = None
                 continue
-            dados = body.get("dados", []) if isinstance(body.get("dados", []), list) else []
-            total += len(dados)
-        return total
+            scope.setdefault(domain, set()).update(range(range_start.year, range_end.year + 1))
+        return previous, scope
 
-    def _coverage_checks(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    def _expenses_expected_from_raw(self, year: int) -> int:
+        """Expense rows stored from HTTP 200 /deputados/{id}/despesas pages with ano=year (from raw_payload_stats)."""
+        expected = getattr(self, "_expected_expenses", None)
+        if expected is None:
+            # One grouped read for every year, instead of a raw_payloads scan per year.
+            expected = self._expected_expenses = expected_items(self.session, despesas_endpoint("{id}"))
+        return expected.get(year, 0)
+
+    def _deputados_coverage(self, expense_people_gate: bool) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
         checks: list[dict[str, Any]] = []
         issues: list[dict[str, Any]] = []
 
@@ -97,7 +184,7 @@ class ReconcileService:
                 continue
             api_dep_count += len(body.get("dados", []))
 
-        graph_dep_count = self._scalar_graph("MATCH (n:Person) RETURN count(n) as c")
+        graph_dep_count = self._graph_stats()["persons"]
         dep_ok = graph_dep_count == api_dep_count and api_dep_count > 0
         dep_check = {
             "name": "coverage_deputados_current",
@@ -118,10 +205,7 @@ class ReconcileService:
                 )
             )
 
-        expense_people_count = self._scalar_graph(
-            "MATCH (p:Person)-[:HAS_EXPENSE]->(e:Expense) WHERE toInteger(coalesce(e.year, 0)) >= 2018 RETURN count(DISTINCT p) as c"
-        )
-        expense_people_gate = self._expense_people_coverage_gate_enabled()
+        expense_people_count = self._graph_stats()["expense_people"]
         expense_people_ok = expense_people_count >= api_dep_count and api_dep_count > 0
         dep_with_expense_check = {
             "name": "coverage_deputados_with_expenses_since_2018",
@@ -142,103 +226,41 @@ class ReconcileService:
                     counts_actual=expense_people_count,
                 )
             )
+        return checks, issues
 
-        current_year = datetime.now(timezone.utc).year
-        for year in range(2018, current_year + 1):
-            bills_gate = self._year_fully_covered_by_batches("camara:bills:", year)
-            votes_gate = self._year_fully_covered_by_batches("camara:votes:", year)
-            expenses_gate = self._year_fully_covered_by_batches("camara:expenses:", year)
-
-            try:
-                _, bills = self.client.get(PROPOSICOES_ENDPOINT, {"ano": year, "itens": 1})
-                api_bill_count = self._estimate_api_total(bills, itens_per_page=1)
-            except Exception:
-                api_bill_count = 0
-            graph_bill_count = self._scalar_graph(
-                "MATCH (b:Bill) WHERE toInteger(coalesce(b.ano, 0)) = $year RETURN count(b) as c",
-                year=year,
-            )
-            bills_ok = graph_bill_count >= api_bill_count and api_bill_count >= 0
-            bill_check = {
-                "name": "coverage_bills_year",
-                "domain": "bills",
-                "year": year,
-                "counts_expected": api_bill_count,
-                "counts_actual": graph_bill_count,
-                "ok": bills_ok,
-                "gate": bills_gate,
-            }
-            checks.append(bill_check)
-            if not bills_ok and bills_gate:
-                issues.append(
-                    self._issue(
-                        issue_type="coverage_bills_year",
-                        check_name=bill_check["name"],
-                        counts_expected=api_bill_count,
-                        counts_actual=graph_bill_count,
-                        context={"year": year},
-                    )
-                )
-
+    def _year_coverage(
+        self, domain: str, year: int, gate: bool, expected: int | None = None
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Coverage of one domain/year; ``expected`` (expenses only) comes from SQL, the rest from the API."""
+        name = f"coverage_{domain}_year"
+        check: dict[str, Any] = {"name": name, "domain": domain, "year": year}
+        actual = self._graph_stats()[f"{domain}_by_year"].get(str(year), 0)
+        if domain == "expenses":
+            expected = int(expected or 0)
+            ok = actual >= expected
+            check["justification"] = "expected derived from raw_payloads for year"
+        else:
+            endpoint = PROPOSICOES_ENDPOINT if domain == "bills" else VOTACOES_ENDPOINT
             try:
-                _, votes = self.client.get(VOTACOES_ENDPOINT, {"ano": year, "itens": 1})
-                api_vote_count = self._estimate_api_total(votes, itens_per_page=1)
+                _, body = self.client.get(endpoint, {"ano": year, "itens": 1})
+                expected = self._estimate_api_total(body, itens_per_page=1)
             except Exception:
-                api_vote_count = 0
-            graph_vote_count = self._scalar_graph(
-                "MATCH (v:VoteEvent) WHERE v.dataHoraRegistro STARTS WITH $prefix RETURN count(v) as c",
-                prefix=f"{year}-",
-            )
-            votes_ok = graph_vote_count >= api_vote_count and api_vote_count >= 0
-            vote_check = {
-                "name": "coverage_votes_year",
-                "domain": "votes",
-                "year": year,
-                "counts_expected": api_vote_count,
-                "counts_actual": graph_vote_count,
-                "ok": votes_ok,
-                "gate": votes_gate,
-            }
-            checks.append(vote_check)
-            if not votes_ok and votes_gate:
-                issues.append(
-                    self._issue(
-                        issue_type="coverage_votes_year",
-                        check_name=vote_check["name"],
-                        counts_expected=api_vote_count,
-                        counts_actual=graph_vote_count,
-                        context={"year": year},
-                    )
-                )
-
-            expected_expenses = self._expenses_expected_from_raw(year)
-            graph_expenses_year = self._scalar_graph(
-                "MATCH (e:Expense) WHERE toInteger(coalesce(e.year, 0)) = $year RETURN count(e) as c",
-                year=year,
+                expected = 0
+            ok = actual >= expected and expected >= 0
+        check.update({"counts_expected": expected, "counts_actual": actual, "ok": ok, "gate": gate})
+        issues = []
+        if not ok and gate:
+            issues.append(
+                self._issue(issue_type=name, check_name=name, counts_expected=expected, counts_actual=actual, context={"year": year})
             )
-            expenses_ok = graph_expenses_year >= expected_expenses
-            expense_check = {
-                "name": "coverage_expenses_year",
-                "domain": "expenses",
-                "year": year,
-                "counts_expected": expected_expenses,
-                "counts_actual": graph_expenses_year,
-                "ok": expenses_ok,
-                "gate": expenses_gate,
-                "justification": "expected derived from raw_payloads for year",
-            }
-            checks.append(expense_check)
-            if not expenses_ok and expenses_gate:
-                issues.append(
-                    self._issue(
-                        issue_type="coverage_expenses_year",
-                        check_name=expense_check["name"],
-                        counts_expected=expected_expenses,
-                        counts_actual=graph_expenses_year,
-                        context={"year": year},
-                    )
-                )
+        return [check], issues
 
+    def _coverage_checks(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        checks: list[dict[str, Any]] = []
+        issues: list[dict[str, Any]] = []
+        for unit_checks, unit_issues in self._run_units(self._check_units("coverage")):
+            checks.extend(unit_checks)
+            issues.extend(unit_issues)
         return checks, issues
 
     def _expense_people_coverage_gate_enabled(self) -> bool:
@@ -271,105 +293,114 @@ class ReconcileService:
                 return True
         return False
 
-    def _integrity_checks(self) -> list[dict[str, Any]]:
-        checks: list[dict[str, Any]] = []
-
-        orphan_vote_actions_no_event = self._scalar_graph(
-            "MATCH (va:VoteAction) WHERE NOT (va)-[:IN_EVENT]->(:VoteEvent) RETURN count(va) as c"
-        )
-        checks.append(
-            {
-                "name": "integrity_vote_action_has_event",
-                "issue_type": "referential_integrity",
-                "counts_expected": 0,
-                "counts_actual": orphan_vote_actions_no_event,
-                "orphans": orphan_vote_actions_no_event,
-                "ok": orphan_vote_actions_no_event == 0,
-                "gate": True,
-            }
-        )
-
-        orphan_vote_actions_no_person = self._scalar_graph(
-            "MATCH (va:VoteAction) WHERE NOT (:Person)-[:CAST]->(va) RETURN count(va) as c"
-        )
-        checks.append(
-            {
-                "name": "integrity_vote_action_has_person",
-                "issue_type": "referential_integrity",
-                "counts_expected": 0,
-                "counts_actual": orphan_vote_actions_no_person,
-                "orphans": orphan_vote_actions_no_person,
-                "ok": orphan_vote_actions_no_person == 0,
-                "gate": True,
-            }
-        )
-
-        orphan_expenses = self._scalar_graph("MATCH (e:Expense) WHERE NOT (:Person)-[:HAS_EXPENSE]->(e) RETURN count(e) as c")
-        checks.append(
-            {
-                "name": "integrity_expense_has_person",
-                "issue_type": "referential_integrity",
-                "counts_expected": 0,
-                "counts_actual": orphan_expenses,
-                "orphans": orphan_expenses,
-                "ok": orphan_expenses == 0,
-                "gate": True,
-            }
-        )
-
-        dangling_vote_events_bill = self._scalar_graph(
-            "MATCH (v:VoteEvent) WHERE v.billId IS NOT NULL AND NOT (v)-[:ON_BILL]->(:Bill) RETURN count(v) as c"
-        )
-        checks.append(
-            {
-                "name": "integrity_vote_event_bill_link",
-                "issue_type": "referential_integrity",
-                "counts_expected": 0,
-                "counts_actual": dangling_vote_events_bill,
-                "orphans": dangling_vote_events_bill,
-                "ok": dangling_vote_events_bill == 0,
-                "gate": True,
-            }
-        )
+    def _integrity_check(self, name: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        orphans = self._graph_stats()[INTEGRITY_CHECKS[name][1]]
+        check = {
+            "name": name,
+            "domain": INTEGRITY_CHECKS[name][0][0],
+            "issue_type": "referential_integrity",
+            "counts_expected": 0,
+            "counts_actual": orphans,
+            "orphans": orphans,
+            "ok": orphans == 0,
+            "gate": True,
+        }
+        return [check], []
 
-        return checks
+    def _integrity_checks(self) -> list[dict[str, Any]]:
+        return [check for unit_checks, _issues in self._run_units(self._check_units("integrity")) for check in unit_checks]
+
+    def _uniqueness_check(self, label: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        dup = self._graph_stats()["duplicates"][label]
+        check = {
+            "name": f"uniqueness_{label.lower()}",
+            "domain": LABEL_DOMAINS[label],
+            "issue_type": "uniqueness",
+            "counts_expected": 0,
+            "counts_actual": dup,
+            "ok": dup == 0,
+            "gate": True,
+        }
+        return [check], []
 
     def _uniqueness_checks(self) -> list[dict[str, Any]]:
-        checks: list[dict[str, Any]] = []
-        for label in ["Person", "Bill", "VoteEvent", "VoteAction", "Expense", "Organization", "Party", "State"]:
-            dup = self._scalar_graph(
-                f"MATCH (n:{label}) WITH n.id as id, count(*) as c WHERE c > 1 RETURN count(*) as c"
-            )
-            checks.append(
-                {
-                    "name": f"uniqueness_{label.lower()}",
-                    "issue_type": "uniqueness",
-                    "counts_expected": 0,
-                    "counts_actual": dup,
-                    "ok": dup == 0,
-                    "gate": True,
-                }
-            )
-        return checks
+        return [check for unit_checks, _issues in self._run_units(self._check_units("uniqueness")) for check in unit_checks]
+
+    def _coverage_inputs(self) -> dict[str, Any]:
+        """SQL-side inputs of the coverage checks (gates, expected counts); prepared on the session's thread."""
+        prepared = getattr(self, "_prepared_inputs", None)
+        if prepared is not None:
+            return prepared
+        years = coverage_years()
+        return {
+            "expense_people_gate": self._expense_people_coverage_gate_enabled(),
+            "gates": {
+                (domain, year): self._year_fully_covered_by_batches(f"camara:{domain}:", year)
+                for year in years
+                for domain in ("bills", "votes", "expenses")
+                if self._in_scope(domain, year)
+            },
+            "expected_expenses": {year: self._expenses_expected_from_raw(year) for year in years if self._in_scope("expenses", year)},
+        }
+
+    def _check_units(self, kind: str) -> list[tuple[str, Callable[[], Any]]]:
+        """Graph/API checks of one kind that are in scope, as (name, unit); each unit returns (checks, issues)."""
+        units: list[tuple[str, Callable[[], Any]]] = []
+        if kind == "coverage":
+            inputs = self._coverage_inputs()
+            if self._in_scope("deputados") or self._in_scope("expenses"):
+                units.append(("coverage_deputados", partial(self._deputados_coverage, inputs["expense_people_gate"])))
+            for year in coverage_years():
+                for domain in ("bills", "votes", "expenses"):
+                    if (domain, year) in inputs["gates"]:
+                        expected = inputs["expected_expenses"].get(year)
+                        units.append(
+                            (
+                                f"coverage_{domain}_{year}",
+                                partial(self._year_coverage, domain, year, inputs["gates"][(domain, year)], expected),
+                            )
+                        )
+        # Integrity and uniqueness read the cached GRAPH_STATS, so they are re-evaluated on every run: graph writes
+        # outside an ingestion batch (graph:replay-dlq, write-behind retries) never show up in the incremental scope.
+        elif kind == "integrity":
+            units.extend((name, partial(self._integrity_check, name)) for name in INTEGRITY_CHECKS)
+        elif kind == "uniqueness":
+            units.extend((f"uniqueness_{label.lower()}", partial(self._uniqueness_check, label)) for label in UNIQUE_LABELS)
+        return units
+
+    def _timed(self, name: str, check: Callable[..., Any], *args: Any) -> Any:
+        started = perf_counter()
+        try:
+            return check(*args)
+        finally:
+            timings = getattr(self, "_timings_ms", None)
+            if timings is not None:
+                timings[name] = round((perf_counter() - started) * 1000, 3)
+
+    def _run_units(self, units: list[tuple[str, Callable[[], Any]]]) -> list[Any]:
+        """Results in unit order; on the bounded pool during reconcile_all, inline otherwise."""
+        pool = getattr(self, "_pool", None)
+        if pool is None:
+            return [self._timed(name, unit) for name, unit in units]
+        futures = [pool.submit(self._timed, name, unit) for name, unit in units]
+        return [future.result() for future in futures]
 
     def _temporal_checks(self) -> list[dict[str, Any]]:
         checks: list[dict[str, Any]] = []
-        invalid_batches = 0
-        batches = self.session.execute(select(IngestionBatch)).scalars().all()
-        for batch in batches:
-            if not batch.range_start or not batch.range_end:
-                continue
-            out_of_range = self.session.scalar(
-                select(func.count(RawPayload.id)).where(
-                    RawPayload.batch_id == batch.id,
-                    or_(
-                        func.date(RawPayload.fetched_at) < batch.range_start,
-                        func.date(RawPayload.fetched_at) > batch.range_end,
-                    ),
-                )
-            ) or 0
-            if out_of_range > 0:
-                invalid_batches += 1
+        # One pass over raw_payloads joined to their batch, grouped by batch, instead of a COUNT per batch.
+        fetched_on = func.date(RawPayload.fetched_at)
+        out_of_range = (
+            select(RawPayload.batch_id)
+            .join(IngestionBatch, IngestionBatch.id == RawPayload.batch_id)
+            .where(
+                IngestionBatch.range_start.is_not(None),
+                IngestionBatch.range_end.is_not(None),
+                or_(fetched_on < IngestionBatch.range_start, fetched_on > IngestionBatch.range_end),
+            )
+            .group_by(RawPayload.batch_id)
+            .subquery()
+        )
+        invalid_batches = int(self.session.scalar(select(func.count()).select_from(out_of_range)) or 0)
         checks.append(
             {
                 "name": "temporal_batch_fetched_at_consistent",
@@ -383,17 +414,33 @@ class ReconcileService:
         return checks
 
     def _nominal_vote_availability_check(self) -> dict[str, Any]:
-        rows = self.session.execute(select(RawPayload).where(RawPayload.endpoint.like("/votacoes/%/votos"))).scalars().all()
+        # Only body_json.metadata.error_type is projected, and counted per (status, error_type) in SQL.
+        error_type = RawBlob.body_json["metadata"]["error_type"].as_string()
+        archived = RawBlob.body_json.is_(None)
+        rows = self.session.execute(
+            select(RawPayload.http_status, error_type, func.count())
+            .join(RawBlob, RawBlob.sha256 == RawPayload.sha256)
+            .where(RawPayload.endpoint.like("/votacoes/%/votos"), ~archived)
+            .group_by(RawPayload.http_status, error_type)
+        ).all()
+        # Archived bodies are not in the database; read only those, which are few and cold.
+        archived_rows = self.session.execute(
+            select(RawPayload.http_status, RawBlob.sha256)
+            .join(RawBlob, RawBlob.sha256 == RawPayload.sha256)
+            .where(RawPayload.endpoint.like("/votacoes/%/votos"), archived)
+        ).all()
+        for status, sha256 in archived_rows:
+            body = read_archived_body(self.session, sha256)
+            metadata = body.get("metadata") if isinstance(body, dict) else None
+            rows.append((status, metadata.get("error_type") if isinstance(metadata, dict) else None, 1))
+
         unavailable = 0
         undocumented_non_200 = 0
-        for row in rows:
-            body = row.body_json if isinstance(row.body_json, dict) else {}
-            metadata = body.get("metadata", {}) if isinstance(body.get("metadata", {}), dict) else {}
-            error_type = metadata.get("error_type")
-            if int(row.http_status or 0) != 200 and not error_type:
-                undocumented_non_200 += 1
-            if error_type == "nominal_votes_not_available":
-                unavailable += 1
+        for status, error_type_value, count in rows:
+            if int(status or 0) != 200 and not error_type_value:
+                undocumented_non_200 += int(count)
+            if error_type_value == "nominal_votes_not_available":
+                unavailable += int(count)
 
         return {
             "name": "coverage_nominal_votes_unavailable_documented",
@@ -445,33 +492,46 @@ class ReconcileService:
             return raw_body.get("dados", raw_body)
         return raw_body
 
+    def _raw_bodies(self, raw_ids: list[str]) -> dict[str, Any]:
+        """Bodies of the given raw_payloads in one IN-list query (archived bodies read from the archive)."""
+        if not raw_ids:
+            return {}
+        rows = self.session.execute(
+            select(RawPayload.id, RawBlob.body_json, RawBlob.sha256)
+            .join(RawBlob, RawBlob.sha256 == RawPayload.sha256)
+            .where(RawPayload.id.in_(sorted(set(raw_ids))))
+        )
+        return {raw_id: body if body is not None else read_archived_body(self.session, sha256) for raw_id, body, sha256 in rows}
+
+    def _audit_graph_rows(self, label: str, limit: int = 50) -> list[dict[str, Any]]:
+        with self.graph.client.driver.session() as neo_session:
+            rows = neo_session.run(GRAPH_QUERIES[f"audit_{label.lower()}"], limit=limit)
+            return [dict(row) for row in rows]
+
     def _audit_samples(self, label: str, limit: int = 50) -> dict[str, Any]:
         key_map = {
             "Bill": ["sourceId", "ano", "numero"],
             "VoteEvent": ["sourceId", "dataHoraRegistro"],
             "Expense": ["sourceId", "year", "month"],
         }
-        graph_rows: list[dict[str, Any]] = []
-        with self.graph.client.driver.session() as neo_session:
-            rows = neo_session.run(
-                f"MATCH (n:{label}) RETURN n.id as id, n.sourceId as sourceId, n.rawRefs as rawRefs, n.rawRef as rawRef, n.ano as ano, n.numero as numero, n.dataHoraRegistro as dataHoraRegistro, n.year as year, n.month as month LIMIT $limit",
-                limit=limit,
-            )
-            graph_rows = [dict(row) for row in rows]
+        prefetched = (getattr(self, "_audit_rows", None) or {}).get(label)
+        graph_rows = prefetched.result() if prefetched is not None else self._audit_graph_rows(label, limit)
 
         mismatches = 0
         checked = 0
         keys = key_map.get(label, ["sourceId"])
+        sampled = []
         for row in graph_rows:
             raw_ids = row.get("rawRefs") or ([] if row.get("rawRef") is None else [row.get("rawRef")])
-            if not raw_ids:
-                continue
-            raw = self.session.get(RawPayload, raw_ids[0])
-            if not raw:
+            if raw_ids:
+                sampled.append((row, raw_ids[0]))
+        bodies = self._raw_bodies([raw_id for _row, raw_id in sampled])
+        for row, raw_id in sampled:
+            if raw_id not in bodies:
                 mismatches += 1
                 checked += 1
                 continue
-            dados = self._extract_raw_dados(raw.body_json)
+            dados = self._extract_raw_dados(bodies[raw_id])
             if isinstance(dados, list) and dados:
                 dados = dados[0]
             if not isinstance(dados, dict):
@@ -487,7 +547,11 @@ class ReconcileService:
                     local_mismatch = True
                 elif key == "numero" and row.get("numero") is not None and str(row.get("numero")) != str(dados.get("numero")):
                     local_mismatch = True
-                elif key == "dataHoraRegistro" and row.get("dataHoraRegistro") and str(dados.get("dataHoraRegistro", "")) != str(row.get("dataHoraRegistro")):
+                elif (
+                    key == "dataHoraRegistro"
+                    and row.get("dataHoraRegistro")
+                    and str(dados.get("dataHoraRegistro", "")) != str(row.get("dataHoraRegistro"))
+                ):
                     local_mismatch = True
                 elif key == "year" and row.get("year") is not None and int(row.get("year")) != int(dados.get("ano", -1)):
                     local_mismatch = True
@@ -499,6 +563,7 @@ class ReconcileService:
         ok = checked == 0 or mismatches == 0
         return {
             "name": f"audit_sample_raw_vs_graph_{label.lower()}",
+            "domain": LABEL_DOMAINS[label],
             "issue_type": "audit",
             "counts_expected": 0,
             "counts_actual": mismatches,
@@ -509,33 +574,84 @@ class ReconcileService:
             "gate": True,
         }
 
-    def reconcile_all(self) -> ReconcileResult:
+    def reconcile_all(self, *, incremental: bool = False) -> ReconcileResult:
+        """Run every check; graph and API reads go to a bounded pool while SQL checks run on this thread.
+
+        With ``incremental`` only domains/years touched by batches finished since the last report are
+        re-evaluated, and that report's other checks are carried forward.
+        """
         checks: list[dict[str, Any]] = []
         issues: list[dict[str, Any]] = []
+        self._timings_ms = timings_ms = {}
 
-        coverage_checks, coverage_issues = self._coverage_checks()
-        checks.extend(coverage_checks)
-        issues.extend(coverage_issues)
-
-        checks.extend(self._integrity_checks())
-        checks.extend(self._uniqueness_checks())
-        checks.extend(self._temporal_checks())
-        checks.append(self._nominal_vote_availability_check())
-        checks.append(self._documented_expense_gap_check())
-
-        raw_count = self.session.scalar(select(func.count(RawPayload.id))) or 0
-        checks.append(
-            {
-                "name": "raw_payload_exists",
-                "issue_type": "raw",
-                "counts_expected": 1,
-                "counts_actual": int(raw_count),
-                "ok": raw_count > 0,
-                "gate": True,
-            }
-        )
+        previous, self._scope = self._incremental_scope() if incremental else (None, None)
+        try:
+            # The session is not thread-safe: SQL inputs and SQL checks stay on this thread, overlapping
+            # with the graph/API groups, which fan their units out to the bounded pool.
+            self._prepared_inputs = self._coverage_inputs()
+            audit_labels = [label for label in AUDIT_LABELS if self._in_scope(LABEL_DOMAINS[label])]
+            with (
+                ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="reconcile") as pool,
+                ThreadPoolExecutor(max_workers=3, thread_name_prefix="reconcile-group") as groups,
+            ):
+                self._pool = pool
+                # Submitted first, so units waiting on it never starve the pool.
+                self._stats = pool.submit(collect_graph_stats, self.graph.client.driver, expense_years=coverage_years())
+                self._audit_rows = {label: pool.submit(self._audit_graph_rows, label, 50) for label in audit_labels}
+                coverage = groups.submit(self._timed, "coverage", self._coverage_checks)
+                integrity = groups.submit(self._timed, "integrity", self._integrity_checks)
+                uniqueness = groups.submit(self._timed, "uniqueness", self._uniqueness_checks)
+
+                sql_checks: list[dict[str, Any]] = []
+                sql_checks.extend(self._timed("temporal", self._temporal_checks))
+                sql_checks.append(self._timed("nominal_votes", self._nominal_vote_availability_check))
+                sql_checks.append(self._timed("documented_expense_gaps", self._documented_expense_gap_check))
+                raw_count = self._timed("raw_payload_exists", self.session.scalar, select(func.count(RawPayload.id))) or 0
+                sql_checks.append(
+                    {
+                        "name": "raw_payload_exists",
+                        "issue_type": "raw",
+                        "counts_expected": 1,
+                        "counts_actual": int(raw_count),
+                        "ok": raw_count > 0,
+                        "gate": True,
+                    }
+                )
+                # Expected expense counts come from raw_payload_stats; empty stats over stored payloads would pass vacuously.
+                stat_rows = (
+                    self._timed("raw_payload_stats_present", self.session.scalar, select(func.count()).select_from(RawPayloadStat)) or 0
+                )
+                sql_checks.append(
+                    {
+                        "name": "raw_payload_stats_present",
+                        "issue_type": "raw",
+                        "counts_expected": 1 if raw_count else 0,
+                        "counts_actual": int(stat_rows),
+                        "ok": raw_count == 0 or stat_rows > 0,
+                        "gate": True,
+                        "justification": "run raw:rebuild-stats after upgrading past 010_raw_payload_stats",
+                    }
+                )
 
-        checks.extend([self._audit_samples("Bill", 50), self._audit_samples("VoteEvent", 50), self._audit_samples("Expense", 50)])
+                coverage_checks, coverage_issues = coverage.result()
+                checks.extend(coverage_checks)
+                issues.extend(coverage_issues)
+                checks.extend(integrity.result())
+                checks.extend(uniqueness.result())
+                checks.extend(sql_checks)
+                checks.extend(self._timed(f"audit_{label.lower()}", self._audit_samples, label, 50) for label in audit_labels)
+        finally:
+            scope = self._scope
+            self._scope = self._pool = self._prepared_inputs = self._audit_rows = self._timings_ms = self._stats = None
+
+        carried = 0
+        if previous is not None and scope is not None:
+            evaluated = {(check.get("name"), check.get("year")) for check in checks}
+            for check in previous.report_json.get("checks", []):
+                if (check.get("name"), check.get("year")) in evaluated:
+                    continue
+                checks.append({**check, "carried_from": check.get("carried_from") or previous.id})
+                carried += 1
 
         for check in checks:
             if check.get("ok", False):
@@ -548,19 +664,27 @@ class ReconcileService:
                     check_name=check.get("name", "unknown"),
                     counts_expected=check.get("counts_expected"),
                     counts_actual=check.get("counts_actual"),
-                    context={k: v for k, v in check.items() if k not in {"name", "issue_type", "counts_expected", "counts_actual", "ok", "gate"}},
+                    context={
+                        k: v for k, v in check.items() if k not in {"name", "issue_type", "counts_expected", "counts_actual", "ok", "gate"}
+                    },
                 )
             )
 
         status = "success" if not issues else "failed"
 
         report = {
-            "run_at": datetime.now(timezone.utc).isoformat(),
+            "run_at": datetime.now(UTC).isoformat(),
             "status": status,
             "checks": checks,
             "issues": issues,
             "coverage_gap": issues,
+            "timings_ms": timings_ms,
+            "mode": "incremental" if scope is not None else "full",
         }
+        if scope is not None:
+            report["previous_report_id"] = previous.id
+            report["scope"] = {domain: sorted(years) if years is not None else "all" for domain, years in sorted(scope.items())}
+            report["carried_forward"] = carried
 
         report_row = ReconcileReport(status=status, report_json=report)
         self.session.add(report_row)
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import argparse
-from datetime import date, timedelta
 import multiprocessing as mp
 import os
 import socket
 import time
 import traceback
+from datetime import date, timedelta
 from typing import Any
 from urllib.parse import urlparse
 
 from app.db.sql import session_scope
+from app.graph.neo4j import close_driver
 from app.jobs.ingest_jobs import IngestJobs
 
 
@@ -93,6 +94,9 @@ def _worker_run_job(queue: mp.Queue, job_kind: str, start: date, end: date, forc
                 jobs.close()
     except Exception as exc:
         queue.put({"ok": False, "error": str(exc), "traceback": traceback.format_exc()})
+    finally:
+        # Worker processes exit without running atexit hooks; release the pooled Neo4j connections here.
+        close_driver()
 
 
 def _run_with_watchdog(
@@ -114,10 +118,7 @@ def _run_with_watchdog(
         if proc.is_alive():
             proc.terminate()
             proc.join()
-            last_error = (
-                f"timeout after {timeout_seconds}s (attempt {attempt}/{retries}, "
-                f"{'serial' if force_serial else 'parallel'})"
-            )
+            last_error = f"timeout after {timeout_seconds}s (attempt {attempt}/{retries}, {'serial' if force_serial else 'parallel'})"
             print(f"[watchdog] {job_kind} {start}..{end} {last_error}", flush=True)
             time.sleep(min(5, attempt))
             continue
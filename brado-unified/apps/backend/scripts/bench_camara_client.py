@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    latency_seconds = 0.05
+
+    def do_GET(self) -> None:  # noqa: N802
+        time.sleep(self.latency_seconds)
+        body = json.dumps({"dados": {"path": self.path}, "links": []}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        return None
+
+
+def _start_server(latency_seconds: float) -> ThreadingHTTPServer:
+    _StandInHandler.latency_seconds = latency_seconds
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _configure(base_url: str, rps: float, concurrency: int) -> None:
+    os.environ["CAMARA_BASE_URL"] = base_url
+    os.environ["CAMARA_MAX_RPS"] = str(rps)
+    os.environ["CAMARA_MAX_CONCURRENCY"] = str(concurrency)
+    os.environ["VCR_MODE"] = "off"
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+
+
+def bench_sync(requests: list[tuple[str, dict | None]]) -> float:
+    from app.ingest.camara.client import CamaraClient
+
+    client = CamaraClient()
+    try:
+        start = time.perf_counter()
+        client.fetch_many(requests)
+        return len(requests) / (time.perf_counter() - start)
+    finally:
+        client.close()
+
+
+def bench_async(requests: list[tuple[str, dict | None]]) -> float:
+    from app.ingest.camara.async_client import AsyncCamaraClient
+
+    async def _run() -> float:
+        async with AsyncCamaraClient() as client:
+            start = time.perf_counter()
+            await client.fetch_many(requests)
+            return len(requests) / (time.perf_counter() - start)
+
+    return asyncio.run(_run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara CamaraClient vs AsyncCamaraClient contra um servidor local.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rps", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    server = _start_server(args.latency_ms / 1000.0)
+    try:
+        _configure(f"http://127.0.0.1:{server.server_port}", args.rps, args.concurrency)
+        requests = [(f"/proposicoes/{i}", None) for i in range(args.requests)]
+        sync_rps = bench_sync(requests)
+        async_rps = bench_async(requests)
+    finally:
+        server.shutdown()
+
+    print(f"budget: rps={args.rps} concurrency={args.concurrency} latency={args.latency_ms}ms requests={args.requests}")
+    print(f"sync  CamaraClient.fetch_many:      {sync_rps:8.1f} req/s")
+    print(f"async AsyncCamaraClient.fetch_many: {async_rps:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+
+class _StandInTx:
+    def __init__(self, driver: _StandInDriver) -> None:
+        self.driver = driver
+
+    def run(self, _statement: str, **params) -> _StandInTx:
+        # One round trip per statement plus a per-row server cost.
+        time.sleep(self.driver.rtt_seconds + self.driver.row_seconds * len(params.get("rows") or [None]))
+        return self
+
+    def consume(self) -> None:
+        return None
+
+    def __iter__(self):
+        # Hash lookups find nothing stored, so every row is written.
+        return iter(())
+
+
+class _StandInSession:
+    def __init__(self, driver: _StandInDriver) -> None:
+        self.driver = driver
+
+    def __enter__(self) -> _StandInSession:
+        return self
+
+    def __exit__(self, *_exc) -> bool:
+        return False
+
+    def execute_read(self, fn, *args):
+        return fn(_StandInTx(self.driver), *args)
+
+    def execute_write(self, fn, *args) -> None:
+        # BEGIN and COMMIT cost a round trip each.
+        time.sleep(self.driver.rtt_seconds)
+        fn(_StandInTx(self.driver), *args)
+        time.sleep(self.driver.rtt_seconds)
+
+
+class _StandInDriver:
+    """In-process stand-in for a Bolt server: every statement and commit pays the configured latency."""
+
+    def __init__(self, rtt_seconds: float, row_seconds: float) -> None:
+        self.rtt_seconds = rtt_seconds
+        self.row_seconds = row_seconds
+
+    def session(self) -> _StandInSession:
+        return _StandInSession(self)
+
+    def close(self) -> None:
+        return None
+
+
+class _StandInClient:
+    def __init__(self, driver: _StandInDriver) -> None:
+        self.driver = driver
+
+    def close(self) -> None:
+        return None
+
+
+def _vote_rows(count: int, run: str) -> list[tuple[dict, str]]:
+    return [
+        (
+            {
+                "id": f"bench:vote_action:{run}:{i}",
+                "voteEventId": "bench:vote_event:1",
+                "personId": f"bench:person:{i % 513}",
+                "vote": "Sim",
+            },
+            "bench-raw",
+        )
+        for i in range(count)
+    ]
+
+
+def bench(make_writer, count: int) -> tuple[float, float]:
+    # Distinct ids per measurement: unchanged nodes would otherwise be skipped by their content hash.
+    rows = _vote_rows(count, "per-node")
+    writer = make_writer()
+    start = time.perf_counter()
+    for node, raw_ref in rows:
+        writer.upsert_vote_action(node, raw_ref)
+    per_row = len(rows) / (time.perf_counter() - start)
+
+    rows = _vote_rows(count, "unwind")
+    writer = make_writer()
+    start = time.perf_counter()
+    writer.upsert_vote_actions(rows)
+    batched = len(rows) / (time.perf_counter() - start)
+    return per_row, batched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara upsert_vote_action (1 transação por nó) vs upsert_vote_actions (UNWIND).")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Stand-in only")
+    parser.add_argument("--row-us", type=float, default=20.0, help="Stand-in only")
+    parser.add_argument("--neo4j", action="store_true", help="Use NEO4J_URI/NEO4J_USER/NEO4J_PASSWORD instead of the stand-in")
+    args = parser.parse_args()
+
+    from app.graph.neo4j.writer import Neo4jWriter
+
+    if args.neo4j:
+        from app.graph.neo4j.driver import Neo4jClient
+
+        client = Neo4jClient()
+        target = "neo4j"
+    else:
+        client = _StandInClient(_StandInDriver(args.rtt_ms / 1000.0, args.row_us / 1_000_000.0))
+        target = f"stand-in rtt={args.rtt_ms}ms row={args.row_us}us"
+    try:
+        per_row, batched = bench(lambda: Neo4jWriter(client=client, batch_size=args.batch_size), args.rows)
+    finally:
+        client.close()
+
+    print(f"target: {target} rows={args.rows} batch_size={args.batch_size}")
+    print(f"upsert_vote_action  (per node): {per_row:10.1f} rows/s")
+    print(f"upsert_vote_actions (UNWIND):   {batched:10.1f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
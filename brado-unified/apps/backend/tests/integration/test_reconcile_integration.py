@@ -1,6 +1,6 @@
-import uuid
-from datetime import date, datetime, timedelta, timezone
 import time
+import uuid
+from datetime import UTC, date, datetime, timedelta
 
 import pytest
 
@@ -123,6 +123,19 @@ def test_integrity_checks_detect_orphans(db_session):
     writer.close()
 
 
+def test_reconcile_graph_queries_avoid_label_scans(db_session):
+    writer = Neo4jWriter()
+    writer.ensure_constraints()
+    with writer.client.driver.session() as neo_session:
+        neo_session.run("CALL db.awaitIndexes(60)").consume()
+
+    svc = ReconcileService(db_session)
+    report = svc.check_query_plans()
+    assert report["status"] == "ok", report["label_scans"]
+    svc.close()
+    writer.close()
+
+
 def test_temporal_checks_fail_when_raw_outside_batch_range(db_session):
     batch = IngestionBatch(
         id=str(uuid.uuid4()),
@@ -142,7 +155,7 @@ def test_temporal_checks_fail_when_raw_outside_batch_range(db_session):
         endpoint="/test",
         params_json={},
         primary_key_value="1",
-        fetched_at=datetime(2025, 2, 15, tzinfo=timezone.utc),
+        fetched_at=datetime(2025, 2, 15, tzinfo=UTC),
         http_status=200,
         url="/test",
         sha256="a" * 64,
@@ -179,7 +192,7 @@ def test_reconcile_all_persists_report_success(db_session):
         endpoint="/test",
         params_json={},
         primary_key_value="1",
-        fetched_at=datetime.now(timezone.utc),
+        fetched_at=datetime.now(UTC),
         http_status=200,
         url="/test",
         sha256="b" * 64,
@@ -252,7 +265,7 @@ def test_ingest_votes_nominal_fallback_persists_real_404_and_500(db_session):
 
     rows = (
         db_session.query(RawPayload)
-        .filter(RawPayload.endpoint.in_(( "/votacoes/9001/votos", "/votacoes/9002/votos")))
+        .filter(RawPayload.endpoint.in_(("/votacoes/9001/votos", "/votacoes/9002/votos")))
         .order_by(RawPayload.endpoint.asc())
         .all()
     )
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("sqlalchemy")
+
+from app.main import create_app
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    monkeypatch.setenv("ADMIN_API_KEY", "secret-key")
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+    return TestClient(create_app())
+
+
+def test_admin_batch_proof_maps_missing_batch_to_404(client, monkeypatch):
+    def missing(self, batch_id, raw_payload_id):
+        raise ValueError(f"batch not found: {batch_id}")
+
+    monkeypatch.setattr("app.api.routers.admin.JobOrchestrator.batch_proof", missing)
+
+    response = client.get("/admin/batches/b1/proof/r1", headers={"X-API-Key": "secret-key"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "batch not found: b1"
+
+
+def test_admin_batch_export_streams_ndjson(client, monkeypatch):
+    def export(self, batch_id):
+        yield json.dumps({"type": "batch", "batch_id": batch_id}) + "\n"
+        yield json.dumps({"type": "item", "leaf_index": 0}) + "\n"
+
+    monkeypatch.setattr("app.api.routers.admin.JobOrchestrator.export_batch", export)
+
+    response = client.get("/admin/batches/b1/export", headers={"X-API-Key": "secret-key"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["type"] for line in response.text.splitlines()] == ["batch", "item"]
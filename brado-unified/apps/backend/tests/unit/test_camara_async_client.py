@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+
+import httpx
+
+from app.core.observability.metrics import metrics_registry
+from app.ingest.camara.async_client import AsyncCamaraClient
+from app.ingest.camara.client import adaptive_bucket
+from app.ingest.camara.rate_limit import AdaptiveTokenBucket, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_spaces_reservations():
+    now = {"t": 0.0}
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=lambda: now["t"])
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == 0.5
+    assert waits[4] == 1.0
+
+
+def test_adaptive_bucket_cuts_once_per_burst_of_throttles():
+    now = {"t": 0.0}
+    changes: list[float] = []
+    bucket = AdaptiveTokenBucket(8.0, min_rate=0.2, increase_rps=0.5, cooldown=1.0, on_rate_change=changes.append, clock=lambda: now["t"])
+
+    for _ in range(6):  # every in-flight request of the burst comes back throttled
+        bucket.on_throttle(None)
+    assert bucket.rate == 4.0
+
+    bucket.on_throttle(3.0)  # inside the hold: only the pause moves
+    assert bucket.rate == 4.0
+    assert bucket.reserve() > 2.9
+
+    now["t"] = 1.5
+    bucket.on_throttle(2.0)
+    assert bucket.rate == 2.0
+    now["t"] = 3.0  # the Retry-After outlasts the cooldown, so it sets the hold
+    bucket.on_throttle(None)
+    assert bucket.rate == 2.0
+    now["t"] = 3.6
+    bucket.on_throttle(None)
+    assert bucket.rate == 1.0
+
+    bucket.on_success()
+    assert bucket.rate == 1.5
+    assert changes == [8.0, 4.0, 2.0, 1.0, 1.5]
+
+
+def test_reservations_during_a_pause_are_spaced_after_it():
+    now = {"t": 0.0}
+    bucket = AdaptiveTokenBucket(4.0, capacity=4, decrease_factor=0.5, cooldown=0.0, clock=lambda: now["t"])
+
+    bucket.on_throttle(3.0)  # rate 2 rps, paused until t=3
+    now["t"] = 1.0
+    waits = [bucket.reserve() for _ in range(4)]
+
+    # A full bucket would have released all four at t=3; they leave one every 1/rate seconds instead.
+    assert [round(1.0 + wait, 6) for wait in waits] == [3.5, 4.0, 4.5, 5.0]
+
+
+def test_effective_rps_gauge_sums_live_buckets_of_a_client_label():
+    def exported() -> list[str]:
+        return [line for line in metrics_registry.render_prometheus_text().splitlines() if 'client="gauge-test"' in line]
+
+    first, second = adaptive_bucket("gauge-test"), adaptive_bucket("gauge-test")
+    first.on_throttle(None)
+
+    assert exported() == [f'brado_camara_effective_rps{{client="gauge-test"}} {first.rate + second.rate}']
+
+    del first
+    gc.collect()
+    assert exported() == [f'brado_camara_effective_rps{{client="gauge-test"}} {second.rate}']
+
+
+def test_async_fetch_many_preserves_order_and_retries_429(monkeypatch):
+    calls: dict[str, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        calls[path] = calls.get(path, 0) + 1
+        if path.endswith("/3") and calls[path] < 2:
+            return httpx.Response(429, json={"detail": "throttled"})
+        return httpx.Response(200, json={"id": int(path.rsplit("/", 1)[-1])})
+
+    async def _no_throttle():
+        return None
+
+    async def _run():
+        client = AsyncCamaraClient(transport=httpx.MockTransport(handler))
+        client.max_concurrency = 8
+        monkeypatch.setattr(client, "_throttle", _no_throttle)
+        monkeypatch.setattr("app.ingest.camara.async_client.backoff_seconds", lambda _attempt: 0)
+        try:
+            return await client.fetch_many([(f"/resource/{i}", None) for i in range(10)], max_workers=8)
+        finally:
+            await client.close()
+
+    result = asyncio.run(_run())
+
+    assert [body["id"] for _status, body in result] == list(range(10))
+    assert all(status == 200 for status, _body in result)
+    assert calls["/api/v2/resource/3"] == 2
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 
@@ -25,6 +27,30 @@ def test_fetch_many_preserves_request_order(monkeypatch):
     client.close()
 
 
+def test_fetch_iter_yields_results_as_they_complete(monkeypatch):
+    client = CamaraClient()
+    client.max_concurrency = 4
+    seen_raise: dict[str, bool] = {}
+
+    def fake_get(endpoint, params=None, *, raise_for_status=True):
+        seen_raise[endpoint] = raise_for_status
+        if endpoint == "/resource/0":
+            time.sleep(0.2)
+        return 200, {"endpoint": endpoint}
+
+    monkeypatch.setattr(client, "get", fake_get)
+
+    requests = [(f"/resource/{i}", None) for i in range(4)]
+    streamed = [request[0] for request, _status, _body in client.fetch_iter(requests, raise_for_status=lambda r: r[0] != "/resource/3")]
+    assert seen_raise == {"/resource/0": True, "/resource/1": True, "/resource/2": True, "/resource/3": False}
+    ordered = [request[0] for request, _status, _body in client.fetch_iter(requests, ordered=True)]
+
+    assert streamed[-1] == "/resource/0"
+    assert sorted(streamed) == [r[0] for r in requests]
+    assert ordered == [r[0] for r in requests]
+    client.close()
+
+
 def test_get_retries_on_throttling_429(monkeypatch):
     client = CamaraClient()
     calls = {"n": 0}
@@ -47,3 +73,191 @@ def test_get_retries_on_throttling_429(monkeypatch):
     assert body["dados"][0]["id"] == 1
     assert calls["n"] == 3
     client.close()
+
+
+def test_get_halves_rate_and_honors_retry_after_on_throttling(monkeypatch):
+    from app.core.observability.metrics import metrics_registry
+
+    client = CamaraClient()
+    client._bucket.rate = client._bucket.max_rate = 4.0
+    sleeps: list[float] = []
+    calls = {"n": 0}
+
+    monkeypatch.setattr(client, "_throttle", lambda: None)
+    monkeypatch.setattr("app.ingest.camara.client.time.sleep", lambda s: sleeps.append(s))
+    throttled_before = metrics_registry.camara_throttle_events_total[("sync", 503)]
+
+    def fake_http_get(url, params=None):
+        calls["n"] += 1
+        request = httpx.Request("GET", url, params=params)
+        if calls["n"] == 1:
+            return httpx.Response(503, request=request, headers={"Retry-After": "2"}, json={})
+        return httpx.Response(200, request=request, json={"dados": []})
+
+    monkeypatch.setattr(client.client, "get", fake_http_get)
+
+    status, _body = client.get("/deputados")
+
+    assert status == 200
+    assert sleeps == []
+    assert client._bucket.rate == 2.0 + client._bucket.increase_rps
+    assert client._bucket.reserve() > 1.0
+    assert metrics_registry.camara_throttle_events_total[("sync", 503)] == throttled_before + 1
+    assert client._bucket.rate in [rps for (label, _source), rps in metrics_registry.camara_effective_rps.items() if label == "sync"]
+    client.close()
+
+
+def test_concurrent_identical_gets_share_one_upstream_call(monkeypatch):
+    client = CamaraClient()
+    calls = {"n": 0}
+    release = threading.Event()
+
+    monkeypatch.setattr(client, "_throttle", lambda: None)
+
+    def fake_http_get(url, params=None):
+        calls["n"] += 1
+        release.wait(timeout=2)
+        return httpx.Response(200, request=httpx.Request("GET", url, params=params), json={"dados": [{"id": 7}]})
+
+    monkeypatch.setattr(client.client, "get", fake_http_get)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(client.get, "/deputados", {"itens": 100, "pagina": 1}) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result(timeout=2) for future in futures]
+
+    assert calls["n"] == 1
+    assert all(body == {"dados": [{"id": 7}]} for _status, body in results)
+    assert len({id(body) for _status, body in results}) == 4
+    client.close()
+
+
+def test_plain_gets_do_not_share_a_conditional_leaders_304(monkeypatch):
+    class _Validators:
+        @staticmethod
+        def key(endpoint, params):
+            return endpoint
+
+        def conditional_headers(self, _key):
+            return {"If-None-Match": '"abc"'}
+
+        def previous_body(self, _key):
+            return {"dados": [{"id": 1}]}
+
+        def capture(self, *_args):
+            return None
+
+    conditional, plain = CamaraClient(validators=_Validators()), CamaraClient()
+    release = threading.Event()
+
+    def fake_http_get(url, params=None, headers=None):
+        release.wait(timeout=2)
+        status = 304 if headers else 200
+        return httpx.Response(
+            status, request=httpx.Request("GET", url, params=params), json={} if status == 304 else {"dados": [{"id": 2}]}
+        )
+
+    for client in (conditional, plain):
+        monkeypatch.setattr(client, "_throttle", lambda: None)
+        monkeypatch.setattr(client.client, "get", fake_http_get)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(conditional.get, "/deputados/77", {"x": 1})
+        time.sleep(0.05)
+        follower = pool.submit(plain.get, "/deputados/77", {"x": 1})
+        time.sleep(0.05)
+        release.set()
+        assert leader.result(timeout=2) == (304, {"dados": [{"id": 1}]})
+        assert follower.result(timeout=2) == (200, {"dados": [{"id": 2}]})
+    conditional.close()
+    plain.close()
+
+
+def test_single_flight_followers_get_a_snapshot_and_their_own_exception():
+    from app.ingest.camara.dedup import SingleFlight
+
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow(value):
+        started.set()
+        release.wait(2)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    for outcome in ({"dados": [1]}, RuntimeError("upstream down")):
+        started.clear()
+        release.clear()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            leader = pool.submit(flight.do, "k", lambda outcome=outcome: slow(outcome))
+            started.wait(2)
+            followers = [pool.submit(flight.do, "k", lambda: {"unexpected": True}) for _ in range(2)]
+            time.sleep(0.05)
+            release.set()
+            if isinstance(outcome, Exception):
+                errors = [future.exception(timeout=2) for future in [leader, *followers]]
+                assert errors[0] is outcome
+                assert all(
+                    type(error) is RuntimeError and error.args == outcome.args and error.__cause__ is outcome for error in errors[1:]
+                )
+                assert len({id(error) for error in errors}) == 3
+            else:
+                # The leader's caller owns its object; mutating it cannot reach the followers.
+                leader.result(timeout=2)["dados"].append(99)
+                assert [future.result(timeout=2) for future in followers] == [{"dados": [1]}, {"dados": [1]}]
+
+
+def test_response_cache_honors_per_endpoint_ttl():
+    from app.ingest.camara.dedup import ResponseCache
+
+    now = {"t": 0.0}
+    cache = ResponseCache([("/deputados", 60), ("/votacoes/*/votos", 0)], clock=lambda: now["t"])
+
+    cache.put("k1", "/deputados", (200, {"dados": [1]}))
+    cache.put("k2", "/votacoes/1/votos", (200, {"dados": [2]}))
+    hit = cache.get("k1")
+    hit[1]["dados"].append(99)
+
+    assert cache.get("k1") == (200, {"dados": [1]})
+    assert cache.get("k2") is None
+    now["t"] = 61.0
+    assert cache.get("k1") is None
+
+
+def test_get_sends_validators_and_reuses_stored_body_on_304(monkeypatch):
+    class _Validators:
+        def __init__(self):
+            self.captured = {}
+
+        @staticmethod
+        def key(endpoint, params):
+            return f"{endpoint}:{sorted((params or {}).items())}"
+
+        def conditional_headers(self, _key):
+            return {"If-None-Match": '"abc"'}
+
+        def previous_body(self, _key):
+            return {"dados": [{"id": 1}], "links": []}
+
+        def capture(self, key, etag, last_modified):
+            self.captured[key] = (etag, last_modified)
+
+    client = CamaraClient(validators=_Validators())
+    seen_headers = []
+
+    monkeypatch.setattr(client, "_throttle", lambda: None)
+
+    def fake_http_get(url, params=None, headers=None):
+        seen_headers.append(headers)
+        return httpx.Response(304, request=httpx.Request("GET", url, params=params))
+
+    monkeypatch.setattr(client.client, "get", fake_http_get)
+
+    status, body = client.get("/deputados/1")
+
+    assert status == 304
+    assert body == {"dados": [{"id": 1}], "links": []}
+    assert seen_headers == [{"If-None-Match": '"abc"'}]
+    client.close()
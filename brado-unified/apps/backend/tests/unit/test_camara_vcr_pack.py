@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.ingest.camara.client import CamaraClient, VCRStore, open_vcr_store, request_key
+from app.ingest.camara.vcr_pack import INDEX_FILE, PackVCRStore, convert_directory_to_pack
+
+URL = "https://dadosabertos.camara.leg.br/api/v2/deputados"
+
+
+def test_pack_store_round_trip_and_rebuilds_missing_index(tmp_path):
+    recorder = PackVCRStore(tmp_path, mode="record")
+    for page in range(1, 51):
+        recorder.maybe_save("GET", URL, {"pagina": page}, {"status": 200, "body": {"dados": [{"id": page}]}})
+    # Re-recording a key keeps the latest response.
+    recorder.maybe_save("GET", URL, {"pagina": 7}, {"status": 200, "body": {"dados": [{"id": 700}]}})
+    recorder.close()
+
+    replay = PackVCRStore(tmp_path, mode="replay")
+    assert replay.maybe_load("GET", URL, {"pagina": 1}) == {"status": 200, "body": {"dados": [{"id": 1}]}}
+    assert replay.maybe_load("GET", URL, {"pagina": 7})["body"]["dados"][0]["id"] == 700
+    with pytest.raises(FileNotFoundError):
+        replay.maybe_load("GET", URL, {"pagina": 99})
+    replay.close()
+
+    (tmp_path / INDEX_FILE).unlink()
+    rebuilt = PackVCRStore(tmp_path, mode="replay")
+    assert rebuilt.maybe_load("GET", URL, {"pagina": 50})["body"]["dados"][0]["id"] == 50
+    rebuilt.close()
+
+
+def test_convert_directory_layout_to_pack(tmp_path):
+    src = tmp_path / "vcr"
+    src.mkdir()
+    for page in (1, 2):
+        key = request_key("GET", URL, {"pagina": page})
+        (src / f"{key}.json").write_text(json.dumps({"status": 200, "body": {"pagina": page}}))
+    (src / "README.json").write_text("{}")
+
+    assert convert_directory_to_pack(src, tmp_path / "pack") == 2
+
+    replay = PackVCRStore(tmp_path / "pack", mode="replay")
+    assert replay.maybe_load("GET", URL, {"pagina": 2}) == {"status": 200, "body": {"pagina": 2}}
+    replay.close()
+
+
+def test_open_vcr_store_honours_backend_setting(monkeypatch, tmp_path):
+    monkeypatch.setenv("VCR_DIR", str(tmp_path))
+    monkeypatch.setenv("VCR_BACKEND", "pack")
+    get_settings.cache_clear()
+    try:
+        assert isinstance(open_vcr_store(), PackVCRStore)
+        monkeypatch.setenv("VCR_BACKEND", "dir")
+        get_settings.cache_clear()
+        assert isinstance(open_vcr_store(), VCRStore)
+    finally:
+        get_settings.cache_clear()
+
+
+def test_downloads_are_recorded_and_replayed(monkeypatch, tmp_path):
+    dataset_url = "https://dadosabertos.camara.leg.br/arquivos/votacoes/json/votacoes-2024.json"
+    monkeypatch.setenv("VCR_DIR", str(tmp_path / "vcr"))
+    monkeypatch.setenv("VCR_BACKEND", "pack")
+    monkeypatch.setenv("VCR_MODE", "record")
+    get_settings.cache_clear()
+    try:
+        recorder = CamaraClient()
+        recorder.client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, text='{"dados": []}')))
+        assert recorder.download(dataset_url, tmp_path / "recorded.json")[0] == 200
+        recorder.close()
+
+        monkeypatch.setenv("VCR_MODE", "replay")
+        get_settings.cache_clear()
+        replayer = CamaraClient()
+        replayer.client = httpx.Client(transport=httpx.MockTransport(lambda request: pytest.fail("replay went upstream")))
+        assert replayer.download(dataset_url, tmp_path / "replayed.json") == (200, {})
+        assert (tmp_path / "replayed.json").read_text(encoding="utf-8") == '{"dados": []}'
+        replayer.close()
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import httpx
+
+from app.ingest.camara.datasets import DatasetCache
+
+URL = "https://dadosabertos.camara.leg.br/arquivos/votacoes/json/votacoes-2024.json"
+ROWS = [
+    {"id": "v1", "data": "2024-01-10"},
+    {"id": "v2", "dataHoraRegistro": "2024-03-05T10:00:00"},
+    {"id": "v3"},
+    {"id": "v4", "data": "2024-01-20"},
+]
+
+
+class _FakeClient:
+    def __init__(self, status: int = 200, body: str = json.dumps({"dados": ROWS})):
+        self.status = status
+        self.body = body
+        self.calls: list[dict] = []
+
+    def download(self, url, dest, *, headers=None):
+        self.calls.append(dict(headers or {}))
+        if self.status == 0:
+            raise httpx.ConnectTimeout("timed out")
+        if self.status == 200 and (headers or {}).get("If-None-Match") == '"v1"':
+            return 304, {}
+        if self.status == 200:
+            dest.write_text(self.body, encoding="utf-8")
+            return 200, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        return self.status, {}
+
+
+def _index(cache: DatasetCache):
+    return cache.index(URL, date_keys=("data", "dataHoraRegistro"), id_keys=("id",))
+
+
+def test_dataset_is_downloaded_once_and_sliced_by_date_and_id(tmp_path):
+    client = _FakeClient()
+    cache = DatasetCache(client, root=tmp_path, revalidate_after=3600)
+
+    status, index, state = _index(cache)
+    assert (status, state) == (200, "downloaded")
+    # Undated rows cannot be placed in a window, so every window keeps them.
+    assert [row["id"] for row in index.between(date(2024, 1, 1), date(2024, 1, 15))] == ["v1", "v3"]
+    assert [row["id"] for row in index.by_ids(["v4", "v2", "missing"])] == ["v2", "v4"]
+    assert not list(tmp_path.rglob("*.part"))
+
+    _status, again, state = _index(cache)
+    assert state == "fresh"
+    assert len(client.calls) == 1
+    assert [row["id"] for row in again.between(date(2024, 3, 1), date(2024, 3, 31))] == ["v2", "v3"]
+
+
+def test_expired_dataset_is_revalidated_with_its_etag(tmp_path):
+    client = _FakeClient()
+    cache = DatasetCache(client, root=tmp_path, revalidate_after=0)
+    _index(cache)
+
+    status, index, state = _index(cache)
+
+    assert (status, state) == (200, "revalidated")
+    assert client.calls[-1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert len(index.between(date(2024, 1, 1), date(2024, 12, 31))) == 4
+
+
+def test_upstream_failure_serves_the_indexed_copy_as_stale(tmp_path):
+    client = _FakeClient()
+    cache = DatasetCache(client, root=tmp_path, revalidate_after=0)
+    _index(cache)
+    client.status = 503
+
+    status, index, state = _index(cache)
+
+    assert (status, state) == (503, "stale")
+    assert len(index.by_ids(["v1"])) == 1
+    assert DatasetCache(_FakeClient(status=404), root=tmp_path / "other").index(URL)[1:] == (None, "unavailable")
+
+
+def test_transport_errors_fall_back_like_an_upstream_failure(tmp_path):
+    client = _FakeClient()
+    cache = DatasetCache(client, root=tmp_path, revalidate_after=0)
+    _index(cache)
+    client.status = 0
+
+    status, index, state = _index(cache)
+
+    assert (status, state) == (0, "stale")
+    assert len(index.by_ids(["v1"])) == 1
+    assert not list(tmp_path.rglob("download.part"))
+    assert DatasetCache(_FakeClient(status=0), root=tmp_path / "other").index(URL) == (0, None, "unavailable")
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("neo4j")
+
+from app.graph.neo4j.stats import (
+    BY_YEAR,
+    COUNTERS,
+    GRAPH_STATS,
+    READ_GRAPH_META,
+    STORE_GRAPH_STATS,
+    UNIQUE_LABELS,
+    collect_graph_stats,
+)
+
+
+class _Result:
+    def __init__(self, row=None):
+        self.row = row
+
+    def single(self):
+        return self.row
+
+    def consume(self):
+        return None
+
+
+class _Session:
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def run(self, statement, **params):
+        self.graph.statements.append(statement)
+        if statement == READ_GRAPH_META:
+            meta = self.graph.meta
+            return _Result({"version": meta.get("version", 0), "stats": meta.get("stats"), "statsVersion": meta.get("statsVersion")})
+        if statement == STORE_GRAPH_STATS:
+            self.graph.meta.update(stats=params["stats"], statsVersion=params["version"])
+            return _Result()
+        assert statement == GRAPH_STATS
+        row = {counter: 0 for counter in COUNTERS} | {name: [] for name in BY_YEAR}
+        row |= {f"duplicates_{label.lower()}": 0 for label in UNIQUE_LABELS}
+        row |= {"persons": 513, "vote_actions": 10, "vote_actions_without_event": 1, "bills_by_year": [["2024", 3], ["2023", 1]]}
+        return _Result(row | {"duplicates_bill": 2})
+
+
+class _Driver:
+    def __init__(self):
+        self.meta = {"version": 7}
+        self.statements = []
+
+    def session(self):
+        return _Session(self)
+
+
+def test_stats_are_computed_in_one_pass_and_cached_until_the_version_moves():
+    driver = _Driver()
+
+    stats = collect_graph_stats(driver, expense_years=[2024, 2023])
+    assert stats["cached"] is False
+    assert (stats["persons"], stats["vote_actions_without_event"]) == (513, 1)
+    assert stats["bills_by_year"] == {"2024": 3, "2023": 1}
+    assert stats["duplicates"]["Bill"] == 2
+    assert driver.statements.count(GRAPH_STATS) == 1
+
+    cached = collect_graph_stats(driver, expense_years=[2023, 2024])
+    assert cached["cached"] is True and cached["version"] == 7
+    assert driver.statements.count(GRAPH_STATS) == 1
+
+    # A write bumps the version; other expense years or an explicit refresh also recompute.
+    driver.meta["version"] = 8
+    assert collect_graph_stats(driver, expense_years=[2023, 2024])["version"] == 8
+    assert collect_graph_stats(driver, expense_years=[2024])["cached"] is False
+    assert collect_graph_stats(driver, expense_years=[2024], refresh=True)["cached"] is False
+    assert driver.statements.count(GRAPH_STATS) == 4
+
+    # A cache written by an older version, with other counters, is not trusted.
+    driver.meta["stats"] = driver.meta["stats"].replace('"schema"', '"old_schema"')
+    assert collect_graph_stats(driver, expense_years=[2024])["cached"] is False
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from threading import Event
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("sqlalchemy")
+
+from neo4j.exceptions import TransientError
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.sql import Base
+from app.db.sql.models import GraphDeadLetter
+from app.graph.neo4j import GraphWriteQueue, node_provenance, replay_dead_letters
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'graph_dlq.db'}", future=True)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    yield factory
+    engine.dispose()
+
+
+class _FlakyWriter:
+    """Fails the first ``transient`` calls with a TransientError and always rejects ids in ``poison``."""
+
+    def __init__(self, transient=0, poison=()):
+        self.transient = transient
+        self.poison = set(poison)
+        self.written = []
+        self.closed = False
+        self.bumps = 0
+
+    def upsert_bills(self, rows):
+        self._write(rows)
+
+    def upsert_vote_events(self, rows):
+        self._write(rows)
+
+    def upsert_vote_actions(self, rows):
+        self._write(rows)
+
+    def _write(self, rows):
+        rows = list(rows)
+        if self.transient:
+            self.transient -= 1
+            raise TransientError("leader switch")
+        if any(node["id"] in self.poison for node, _raw_ref in rows):
+            raise ValueError("constraint violated")
+        self.written.extend(node["id"] for node, _raw_ref in rows)
+
+    def bump_version(self):
+        self.bumps += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_transient_errors_are_retried_and_batches_stay_in_order(session_factory):
+    writer = _FlakyWriter(transient=2)
+    graph = GraphWriteQueue(writer, session_factory=session_factory, maxsize=2, max_retries=3, backoff_seconds=0)
+
+    graph.upsert_vote_events([({"id": "event:1"}, "raw-1")])
+    graph.upsert_vote_actions([({"id": "action:1"}, "raw-1"), ({"id": "action:2"}, "raw-1")])
+    graph.flush()
+
+    assert writer.written == ["event:1", "action:1", "action:2"]
+    # One graph version bump per flush, not per written chunk.
+    assert writer.bumps == 1
+    assert graph.stats["retries"] == 2
+    assert graph.stats["dead_lettered"] == 0
+    graph.close()
+    assert writer.closed
+
+
+def test_poison_rows_go_to_dead_letters_and_can_be_replayed(session_factory):
+    writer = _FlakyWriter(poison={"action:2"})
+    graph = GraphWriteQueue(writer, session_factory=session_factory, max_retries=0, backoff_seconds=0)
+
+    graph.upsert_vote_actions([({"id": f"action:{i}"}, f"raw-{i}") for i in range(1, 4)])
+    graph.flush()
+    graph.close()
+
+    # Neighbours of the poison row are still written once the batch is split.
+    assert writer.written == ["action:1", "action:3"]
+    with session_factory() as session:
+        letters = session.execute(select(GraphDeadLetter)).scalars().all()
+        assert [(letter.operation, letter.node_json["id"], letter.raw_ref) for letter in letters] == [
+            ("upsert_vote_actions", "action:2", "raw-2")
+        ]
+        assert letters[0].error.startswith("ValueError")
+
+        assert replay_dead_letters(session, writer) == {"pending": 1, "replayed": 0, "failed": 1}
+        assert session.get(GraphDeadLetter, letters[0].id).attempts == 2
+
+        writer.poison.clear()
+        assert replay_dead_letters(session, writer) == {"pending": 1, "replayed": 1, "failed": 0}
+        assert session.get(GraphDeadLetter, letters[0].id).replayed_at is not None
+        assert replay_dead_letters(session, writer) == {"pending": 0, "replayed": 0, "failed": 0}
+    assert writer.written[-1] == "action:2"
+
+
+def test_exhausted_transient_retries_park_the_whole_batch(session_factory):
+    writer = _FlakyWriter(transient=10)
+    graph = GraphWriteQueue(writer, session_factory=session_factory, max_retries=1, backoff_seconds=0)
+
+    graph.upsert_vote_events([({"id": "event:1"}, "raw-1"), ({"id": "event:2"}, "raw-1")])
+    graph.flush()
+    graph.close()
+
+    assert writer.written == []
+    assert graph.stats["dead_lettered"] == 2
+    with session_factory() as session:
+        attempts = session.execute(select(GraphDeadLetter.attempts)).scalars().all()
+    assert attempts == [2, 2]
+
+
+def test_a_batch_that_cannot_be_parked_fails_the_next_flush(session_factory):
+    def broken_session_factory():
+        raise RuntimeError("postgres down")
+
+    writer = _FlakyWriter(poison={"event:1"})
+    graph = GraphWriteQueue(writer, session_factory=broken_session_factory, max_retries=0, backoff_seconds=0)
+
+    graph.upsert_vote_events([({"id": "event:1"}, "raw-1")])
+    with pytest.raises(RuntimeError, match="lost a batch") as lost:
+        graph.flush()
+    assert "postgres down" in str(lost.value.__cause__)
+
+    # Reported once; later batches flush normally.
+    graph.upsert_vote_events([({"id": "event:2"}, None)])
+    graph.flush()
+    assert writer.written == ["event:2"]
+    graph.close()
+
+
+def test_wait_for_returns_once_its_batches_are_written_while_later_ones_are_pending(session_factory):
+    release = Event()
+
+    class _GatedWriter(_FlakyWriter):
+        def upsert_vote_actions(self, rows):
+            release.wait(5)
+            self._write(rows)
+
+    writer = _GatedWriter()
+    graph = GraphWriteQueue(writer, session_factory=session_factory, backoff_seconds=0)
+
+    graph.upsert_vote_events([({"id": "event:1"}, "raw-1")])
+    checkpointed = graph.submitted
+    graph.upsert_vote_actions([({"id": "action:1"}, "raw-1")])
+
+    graph.wait_for(checkpointed)
+    assert writer.written == ["event:1"]
+    assert graph.acknowledged == checkpointed < graph.submitted
+
+    release.set()
+    graph.flush()
+    assert writer.written == ["event:1", "action:1"]
+    graph.close()
+
+
+def test_written_hot_nodes_are_indexed_in_graph_provenance(session_factory):
+    writer = _FlakyWriter()
+    graph = GraphWriteQueue(writer, session_factory=session_factory, backoff_seconds=0)
+
+    graph.upsert_bills([({"id": "camara:bill:1"}, "raw-1"), ({"id": "camara:bill:2"}, None)])
+    graph.upsert_bills([({"id": "camara:bill:1"}, "raw-2"), ({"id": "camara:bill:1"}, "raw-1")])
+    graph.upsert_vote_actions([({"id": "action:1"}, "raw-1")])
+    graph.flush()
+    graph.close()
+
+    with session_factory() as session:
+        assert sorted(item["raw_payload_id"] for item in node_provenance(session, "camara:bill:1")) == ["raw-1", "raw-2"]
+        assert node_provenance(session, "camara:bill:2") == []
+        # Vote actions keep their single rawRef on the node and are not indexed.
+        assert node_provenance(session, "action:1") == []
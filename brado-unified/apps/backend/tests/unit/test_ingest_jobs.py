@@ -7,6 +7,7 @@ import pytest
 pytest.importorskip("sqlalchemy")
 
 from app.db.sql.models import JobState
+from app.ingest.camara.datasets import DatasetCache
 from app.jobs.ingest_jobs import IngestJobs
 
 
@@ -24,6 +25,8 @@ class _FakeRawStore:
     def __init__(self):
         self.payloads = []
         self._seq = 0
+        self.held = None
+        self.released = []
 
     def start_batch(self, *_args, **_kwargs):
         return _FakeBatch("batch-1")
@@ -32,8 +35,26 @@ class _FakeRawStore:
         self._seq += 1
         raw = _FakeRaw(f"raw-{self._seq}")
         self.payloads.append({**kwargs, "raw_id": raw.id})
+        if self.held is not None and kwargs["http_status"] == 200:
+            self.held.append({"request_key": kwargs["endpoint"], "raw_payload_id": raw.id})
         return raw
 
+    def hold_validators(self, hold=True):
+        self.held = [] if hold else None
+
+    def take_held_validators(self):
+        rows, self.held = self.held or [], [] if self.held is not None else None
+        return rows
+
+    def release_validators(self, rows):
+        self.released.extend(rows)
+
+    def add_payloads(self, *, batch, payloads):
+        return [self.add_payload(batch=batch, **payload).id for payload in payloads]
+
+    def flush(self):
+        return None
+
     def finish_batch(self, *_args, **_kwargs):
         return None
 
@@ -51,6 +72,17 @@ class _FakeGraph:
     def close(self):
         return None
 
+    submitted = 0
+
+    def flush(self):
+        return None
+
+    def wait_for(self, _seq):
+        return None
+
+    def graph_stats(self):
+        return {}
+
     def ensure_constraints(self):
         return None
 
@@ -66,10 +98,26 @@ class _FakeGraph:
     def upsert_bill(self, node, _raw_ref=None):
         self.bills.append(node)
 
+    def upsert_expenses(self, rows):
+        self.expenses.extend(node for node, _raw_ref in rows)
+
+    def upsert_vote_events(self, rows):
+        self.vote_events.extend(node for node, _raw_ref in rows)
+
+    def upsert_vote_actions(self, rows):
+        self.vote_actions.extend(node for node, _raw_ref in rows)
+
+    def upsert_bills(self, rows):
+        self.bills.extend(node for node, _raw_ref in rows)
+
+    def upsert_persons(self, rows):
+        return None
+
 
 class _FakeSession:
     def __init__(self):
         self.states = {}
+        self.commits = 0
 
     def get(self, model, key):
         if model is JobState:
@@ -83,6 +131,9 @@ class _FakeSession:
     def flush(self):
         return None
 
+    def commit(self):
+        self.commits += 1
+
 
 class _FakeClient:
     def __init__(
@@ -94,6 +145,7 @@ class _FakeClient:
         fail_votes: bool = False,
         dataset_csv: str = "",
         static_texts: dict[str, tuple[int, str]] | None = None,
+        unchanged_endpoints: set[str] | None = None,
     ):
         self.dep_pages = dep_pages
         self.nominal_statuses = nominal_statuses or {}
@@ -102,7 +154,9 @@ class _FakeClient:
         self.fail_votes = fail_votes
         self.dataset_csv = dataset_csv
         self.static_texts = static_texts or {}
+        self.unchanged_endpoints = unchanged_endpoints or set()
         self.expense_calls: list[tuple[str, dict]] = []
+        self.downloads: list[str] = []
 
     def close(self):
         return None
@@ -155,28 +209,44 @@ class _FakeClient:
             return self.static_texts[url]
         return 200, self.dataset_csv
 
+    def download(self, url, dest, *, headers=None):
+        self.downloads.append(url)
+        status, text = self.static_texts.get(url, (404, ""))
+        if status == 200:
+            dest.write_text(text, encoding="utf-8")
+        return status, {"ETag": '"v1"'} if status == 200 else {}
+
     def fetch_many(self, requests, *, max_workers=None, raise_for_status=True):
         response = []
         for endpoint, _params in requests:
             if endpoint.startswith("/proposicoes/"):
                 prop_id = int(endpoint.split("/")[2])
-                response.append((200, {"dados": {"id": prop_id, "ano": 2024, "numero": prop_id}}))
+                status = 304 if endpoint in self.unchanged_endpoints else 200
+                response.append((status, {"dados": {"id": prop_id, "ano": 2024, "numero": prop_id}}))
             elif endpoint.startswith("/votacoes/") and endpoint.endswith("/votos"):
                 votacao_id = int(endpoint.split("/")[2])
                 response.append(self.nominal_statuses[votacao_id])
             elif endpoint.startswith("/votacoes/"):
                 votacao_id = int(endpoint.split("/")[2])
                 response.append((200, {"dados": {"id": votacao_id, "idProposicao": None}}))
+            elif endpoint.startswith("/deputados/"):
+                response.append((200, {"dados": {"id": int(endpoint.split("/")[2])}}))
             else:
                 raise AssertionError(f"Unexpected fetch endpoint: {endpoint}")
         return response
 
+    def fetch_iter(self, requests, *, max_workers=None, raise_for_status=True, ordered=False):
+        # Complete in reverse order to exercise consumers that must not rely on submission order.
+        responses = self.fetch_many(requests, max_workers=max_workers)
+        yield from reversed([(request, status, body) for request, (status, body) in zip(requests, responses, strict=True)])
+
 
-def _build_jobs(fake_client: _FakeClient):
+def _build_jobs(fake_client: _FakeClient, dataset_root=None):
     jobs = IngestJobs.__new__(IngestJobs)
     jobs.session = _FakeSession()
     jobs.raw_store = _FakeRawStore()
     jobs.client = fake_client
+    jobs.datasets = DatasetCache(fake_client, root=dataset_root or "data/dataset-cache")
     jobs.graph = _FakeGraph()
     jobs._max_workers = 8
     return jobs
@@ -223,9 +293,7 @@ def test_ingest_votes_since_stores_real_http_status_for_nominal_fallbacks():
     assert result["events"] == 2
     assert result["actions"] == 0
 
-    nominal_payloads = [
-        p for p in jobs.raw_store.payloads if p["endpoint"].startswith("/votacoes/") and p["endpoint"].endswith("/votos")
-    ]
+    nominal_payloads = [p for p in jobs.raw_store.payloads if p["endpoint"].startswith("/votacoes/") and p["endpoint"].endswith("/votos")]
     status_by_endpoint = {payload["endpoint"]: payload["http_status"] for payload in nominal_payloads}
     assert status_by_endpoint["/votacoes/10/votos"] == 404
     assert status_by_endpoint["/votacoes/11/votos"] == 500
@@ -276,7 +344,60 @@ def test_ingest_expenses_since_uses_dataset_fallback_when_api_has_gaps(monkeypat
     assert len(jobs.graph.expenses) == 1
 
 
-def test_ingest_bills_since_uses_static_fallback_when_api_fails(monkeypatch):
+def test_ingest_bills_since_skips_graph_upsert_for_not_modified_details():
+    jobs = _build_jobs(_FakeClient(dep_pages=[[1]], unchanged_endpoints={"/proposicoes/99"}))
+
+    result = jobs.ingest_bills_since(date(2024, 1, 1), to_date=date(2024, 1, 31))
+
+    assert result["processed"] == 0
+    assert result["unchanged"] == 1
+    assert jobs.graph.bills == []
+    detail_payload = next(p for p in jobs.raw_store.payloads if p["endpoint"] == "/proposicoes/99")
+    assert detail_payload["http_status"] == 304
+
+
+def test_checkpoints_commit_validators_only_for_rows_the_graph_received(monkeypatch):
+    monkeypatch.setenv("INGEST_CHECKPOINT_EVERY", "1")
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+    jobs = _build_jobs(_FakeClient(dep_pages=[[1]]))
+
+    def graph_down(_rows):
+        raise RuntimeError("neo4j down")
+
+    jobs.graph.upsert_bills = graph_down
+    result = jobs.ingest_bills_since(date(2024, 1, 1), to_date=date(2024, 1, 31))
+
+    assert result["processed"] == 0
+    assert jobs.session.commits >= 1
+    released = {row["request_key"] for row in jobs.raw_store.released}
+    # The listing page has no graph rows and may be committed; the detail never reached the graph.
+    assert "/proposicoes" in released
+    assert "/proposicoes/99" not in released
+    get_settings.cache_clear()
+
+
+def test_deputados_validators_wait_for_the_graph_flush():
+    jobs = _build_jobs(_FakeClient(dep_pages=[[1, 2]]))
+    jobs.ingest_deputados_current()
+    assert {row["request_key"] for row in jobs.raw_store.released} == {"/deputados", "/deputados/1", "/deputados/2"}
+
+    jobs = _build_jobs(_FakeClient(dep_pages=[[1, 2]]))
+
+    def lost_write():
+        raise RuntimeError("graph write-behind lost a batch")
+
+    jobs.graph.flush = lost_write
+    with pytest.raises(RuntimeError, match="lost a batch"):
+        jobs.ingest_deputados_current()
+    # Nothing that would turn the next run into 304s for the lost people is kept.
+    assert jobs.raw_store.released == []
+    assert jobs.raw_store.held is None
+    assert jobs.session.states["ingest_deputados_current"].status == "failed"
+
+
+def test_ingest_bills_since_uses_static_fallback_when_api_fails(monkeypatch, tmp_path):
     monkeypatch.setenv(
         "CAMARA_PROPOSICOES_STATIC_URL_TEMPLATE",
         "https://dadosabertos.camara.leg.br/arquivos/proposicoes/json/proposicoes-{year}.json",
@@ -291,7 +412,8 @@ def test_ingest_bills_since_uses_static_fallback_when_api_fails(monkeypatch):
             dep_pages=[[1]],
             fail_bills=True,
             static_texts={static_url: (200, static_payload)},
-        )
+        ),
+        dataset_root=tmp_path,
     )
 
     result = jobs.ingest_bills_since(date(2024, 1, 1), to_date=date(2024, 1, 31))
@@ -303,7 +425,7 @@ def test_ingest_bills_since_uses_static_fallback_when_api_fails(monkeypatch):
     assert len(jobs.graph.bills) == 1
 
 
-def test_ingest_votes_since_uses_static_fallback_when_api_fails(monkeypatch):
+def test_ingest_votes_since_uses_static_fallback_when_api_fails(monkeypatch, tmp_path):
     monkeypatch.setenv(
         "CAMARA_VOTACOES_STATIC_URL_TEMPLATE",
         "https://dadosabertos.camara.leg.br/arquivos/votacoes/json/votacoes-{year}.json",
@@ -327,7 +449,8 @@ def test_ingest_votes_since_uses_static_fallback_when_api_fails(monkeypatch):
                 votes_url: (200, votes_payload),
                 votes_votos_url: (200, votes_votos_payload),
             },
-        )
+        ),
+        dataset_root=tmp_path,
     )
 
     result = jobs.ingest_votes_since(date(2024, 1, 1), to_date=date(2024, 1, 31))
@@ -339,4 +462,9 @@ def test_ingest_votes_since_uses_static_fallback_when_api_fails(monkeypatch):
     dataset_actions_payload = next(p for p in jobs.raw_store.payloads if p["endpoint"] == "/datasets/votacoesVotos/2024")
     assert dataset_events_payload["http_status"] == 200
     assert dataset_actions_payload["http_status"] == 200
+    assert dataset_events_payload["body_json"]["metadata"]["cache"] == "downloaded"
+
+    # A second window over the same year reads the indexed copy instead of downloading the file again.
+    jobs.ingest_votes_since(date(2024, 2, 1), to_date=date(2024, 2, 29))
+    assert jobs.client.downloads == [votes_url, votes_votos_url]
     get_settings.cache_clear()
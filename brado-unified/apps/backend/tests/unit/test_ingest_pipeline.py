@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.jobs.pipeline import Batcher, LowWaterMark, Pipeline, Stage, Tally
+
+
+def test_pipeline_runs_stages_with_bounded_queues_and_checkpoints():
+    tally = Tally()
+    written: list[int] = []
+    checkpoints: list[int] = []
+    persist_threads: set[str] = set()
+
+    def fetch(item):
+        yield item
+        yield item + 100
+
+    def persist(item):
+        persist_threads.add(threading.current_thread().name)
+        tally.add("persisted")
+        return [item]
+
+    def write(item):
+        time.sleep(0.001)
+        written.append(item)
+
+    pipeline = Pipeline(
+        "test",
+        [
+            Stage("fetch", fetch, workers=3),
+            Stage("persist_raw", persist, checkpoint_every=10, checkpoint=lambda: checkpoints.append(tally["persisted"])),
+            Stage("graph_write", write, workers=2),
+        ],
+        queue_size=2,
+    )
+    stats = pipeline.run(range(25))
+
+    assert sorted(written) == sorted(list(range(25)) + [i + 100 for i in range(25)])
+    assert stats["fetch"].items == 25 and stats["fetch"].emitted == 50
+    assert stats["graph_write"].items == 50
+    assert len(persist_threads) == 1
+    # Every 10 items plus one final checkpoint when the stage drains.
+    assert checkpoints == [10, 20, 30, 40, 50, 50]
+
+
+def test_pipeline_stops_all_stages_and_reraises_first_error():
+    def source():
+        yield from range(10_000)
+
+    def fail_on_five(item):
+        if item == 5:
+            raise RuntimeError("boom")
+        return [item]
+
+    pipeline = Pipeline("test", [Stage("fetch", fail_on_five, workers=2), Stage("graph_write", lambda item: None)], queue_size=1)
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline.run(source())
+
+
+def test_batcher_groups_rows_and_flushes_remainder_at_drain():
+    batcher = Batcher(4)
+    batches: list[list[str]] = []
+
+    def normalize(item):
+        # One item's rows (an event and its actions) must never be split across batches.
+        return batcher.add([f"{item}:event", f"{item}:action"])
+
+    pipeline = Pipeline(
+        "batched",
+        [Stage("normalize", normalize, flush=batcher.drain), Stage("graph_write", batches.append)],
+    )
+    pipeline.run(range(5))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert all(batch[i].split(":")[0] == batch[i + 1].split(":")[0] for batch in batches for i in range(0, len(batch), 2))
+
+
+def test_low_water_mark_settles_only_a_contiguous_done_prefix():
+    marks = LowWaterMark()
+    first, second, third = (marks.issue(f"cursor-{i}") for i in range(3))
+    fourth = marks.issue("cursor-3", done=True)
+
+    marks.done(second, third)
+    assert marks.settle() == []
+
+    marks.done(first)
+    assert marks.settle() == ["cursor-0", "cursor-1", "cursor-2", "cursor-3"]
+    assert fourth == 4
+    assert marks.settle() == []
+
+
+def test_low_water_mark_acks_cover_only_settled_items():
+    marks = LowWaterMark()
+    first, second = marks.issue("cursor-0"), marks.issue("cursor-1")
+
+    marks.done(second, ack=7)
+    marks.done(first, ack=3)
+    assert marks.settle() == ["cursor-0", "cursor-1"]
+    assert marks.ack == 7
+
+    third = marks.issue("cursor-2")
+    marks.done(third)
+    assert marks.settle() == ["cursor-2"]
+    assert marks.ack == 7
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("neo4j")
+
+from app.core.observability.metrics import metrics_registry
+from app.graph.neo4j import driver as driver_module
+from app.graph.neo4j.driver import Neo4jClient, close_driver, get_driver
+
+
+class _FakeSession:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def run(self, statement, **params):
+        return statement
+
+
+class _FakeDriver:
+    def __init__(self, uri, **kwargs):
+        self.uri = uri
+        self.kwargs = kwargs
+        self.closed = 0
+
+    def session(self, **_kwargs):
+        return _FakeSession()
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture()
+def fake_driver(monkeypatch):
+    created = []
+
+    def _driver(uri, **kwargs):
+        created.append(_FakeDriver(uri, **kwargs))
+        return created[-1]
+
+    close_driver()
+    monkeypatch.setattr(driver_module.GraphDatabase, "driver", _driver)
+    monkeypatch.setattr(driver_module.atexit, "register", lambda _fn: None)
+    yield created
+    close_driver()
+
+
+def test_clients_share_one_pooled_driver(fake_driver):
+    first, second = Neo4jClient(), Neo4jClient()
+    first.close()
+
+    assert len(fake_driver) == 1
+    assert first.driver is second.driver is get_driver()
+    assert {"max_connection_pool_size", "max_connection_lifetime", "connection_acquisition_timeout"} <= set(fake_driver[0].kwargs)
+    assert fake_driver[0].closed == 0
+
+    close_driver()
+    close_driver()
+    assert fake_driver[0].closed == 1
+    assert get_driver() is not first.driver
+    assert len(fake_driver) == 2
+
+
+def test_sessions_are_tracked_and_forked_children_get_their_own_driver(fake_driver, monkeypatch):
+    shared = get_driver()
+    opened, active = metrics_registry.neo4j_sessions_total, metrics_registry.neo4j_sessions_active
+    with shared.session() as session:
+        assert session.run("RETURN 1") == "RETURN 1"
+        assert metrics_registry.neo4j_sessions_active == active + 1
+    assert metrics_registry.neo4j_sessions_total == opened + 1
+    assert metrics_registry.neo4j_sessions_active == active
+
+    monkeypatch.setattr(driver_module.os, "getpid", lambda: -1)
+    assert get_driver() is not shared
+    assert fake_driver[0].closed == 0
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+pytest.importorskip("neo4j")
+
+from app.graph.neo4j.stats import BUMP_GRAPH_VERSION
+from app.graph.neo4j.writer import (
+    ENSURE_DIMENSIONS,
+    LINK_PERSON_PARTIES,
+    LINK_PERSON_STATES,
+    TOUCH_LAST_SEEN,
+    UPSERT_BILLS,
+    UPSERT_PERSONS,
+    UPSERT_VOTE_ACTIONS,
+    UPSERT_VOTE_EVENTS,
+    Neo4jWriter,
+)
+
+
+class _FakeTx:
+    # Endpoint keys a row links to; the hash statements only store the hash when all of them exist.
+    LINKS = ("vote_event_id", "person_id", "organization_id", "bill_id")
+
+    def __init__(self, driver, calls):
+        self.driver = driver
+        self.calls = calls
+
+    def run(self, statement, **params):
+        self.calls.append((statement, params))
+        if "ids" in params:
+            # FETCH_HASHES / TOUCH_LAST_SEEN: answer with the hashes "stored" so far.
+            return _FakeResult(
+                {"id": node_id, "hash": self.driver.hashes[node_id]} for node_id in params["ids"] if node_id in self.driver.hashes
+            )
+        rows = params.get("rows", [])
+        if re.search(r"MERGE \(\w+:\w+ \{id: row\.id\}\)", statement):
+            self.driver.nodes.update(row["id"] for row in rows)
+        hashed = []
+        if "contentHash = row.hash" in statement:
+            for row in rows:
+                if all(row.get(key) is None or row[key] in self.driver.nodes for key in self.LINKS):
+                    self.driver.hashes[row["id"]] = row["hash"]
+                    hashed.append({"id": row["id"]})
+        return _FakeResult(hashed)
+
+
+class _FakeResult(list):
+    def consume(self):
+        return None
+
+
+class _FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        self.driver.sessions += 1
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def execute_read(self, fn, *args):
+        calls = []
+        result = fn(_FakeTx(self.driver, calls), *args)
+        self.driver.reads.append(calls)
+        return result
+
+    def execute_write(self, fn, *args):
+        calls = []
+        result = fn(_FakeTx(self.driver, calls), *args)
+        self.driver.transactions.append(calls)
+        return result
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.sessions = 0
+        self.transactions = []
+        self.reads = []
+        self.hashes = {}
+        self.nodes = set()
+
+    def session(self):
+        return _FakeSession(self)
+
+    def close(self):
+        return None
+
+
+class _FakeClient:
+    def __init__(self):
+        self.driver = _FakeDriver()
+
+    def close(self):
+        return None
+
+
+def test_vote_actions_are_sent_as_unwind_chunks_in_write_transactions():
+    writer = Neo4jWriter(client=_FakeClient(), batch_size=500)
+    rows = [
+        ({"id": f"camara:vote_action:{i}", "voteEventId": "camara:vote_event:1", "personId": f"camara:person:{i}"}, "raw-1")
+        for i in range(1200)
+    ]
+
+    writer.upsert_vote_actions(rows)
+
+    driver = writer.client.driver
+    assert driver.sessions == 1
+    assert [len(tx[0][1]["rows"]) for tx in driver.transactions] == [500, 500, 200]
+    statement, params = driver.transactions[0][0]
+    assert statement == UPSERT_VOTE_ACTIONS and statement.lstrip().startswith("UNWIND $rows AS row")
+    assert params["rows"][0]["props"]["rawRef"] == "raw-1"
+    assert params["rows"][0]["person_id"] == "camara:person:0"
+
+
+def test_person_rows_carry_party_and_state_links_in_one_transaction():
+    writer = Neo4jWriter(client=_FakeClient(), batch_size=500)
+
+    writer.upsert_person({"id": "camara:person:1", "party": "ABC", "state": "SP"}, "raw-9")
+    writer.upsert_persons([])
+
+    [calls] = writer.client.driver.transactions
+    assert [statement for statement, _params in calls] == [
+        ENSURE_DIMENSIONS.format(label="Party"),
+        ENSURE_DIMENSIONS.format(label="State"),
+        UPSERT_PERSONS,
+        LINK_PERSON_PARTIES,
+        LINK_PERSON_STATES,
+    ]
+    assert calls[0][1]["rows"] == [{"id": "camara:party:ABC", "props": {"sigla": "ABC"}}]
+    statement, params = calls[2]
+    row = params["rows"][0]
+    assert (row["party_id"], row["state_id"], row["raw_ref"]) == ("camara:party:ABC", "camara:state:SP", "raw-9")
+    # rawRefs is a bounded ring of recent refs; the full history goes to graph_provenance.
+    assert params["keep"] == writer.raw_refs_keep
+    assert "[-$keep..]" in statement
+
+
+def test_unchanged_nodes_are_skipped_and_only_touched():
+    client = _FakeClient()
+    rows = [({"id": f"camara:bill:{i}", "title": f"PL {i}"}, f"raw-{i}") for i in range(3)]
+    Neo4jWriter(client=client, batch_size=500).upsert_bills(rows)
+    driver = client.driver
+    assert [statement for statement, _params in driver.transactions[0]] == [UPSERT_BILLS]
+
+    # A new run (fresh writer) re-reads the stored hashes once, rewrites only the changed bill and touches the rest.
+    driver.transactions.clear()
+    writer = Neo4jWriter(client=client, batch_size=500)
+    rows[1] = ({"id": "camara:bill:1", "title": "PL 1 (emendado)"}, "raw-new")
+    writer.upsert_bills([(node, "raw-refetched") for node, _raw_ref in rows])
+    written, touched = driver.transactions
+    assert [row["id"] for row in written[0][1]["rows"]] == ["camara:bill:1"]
+    assert touched[0][0] == TOUCH_LAST_SEEN.format(label="Bill")
+    assert sorted(touched[0][1]["ids"]) == ["camara:bill:0", "camara:bill:2"]
+    assert (writer.stats["written"], writer.stats["unchanged"]) == (1, 2)
+
+    # Within the run the cache answers without another read.
+    reads = len(driver.reads)
+    writer.upsert_bill(rows[0][0], "raw-again")
+    assert len(driver.reads) == reads
+
+    # The graph version moves once for the whole run, and only if something was written.
+    driver.transactions.clear()
+    writer.bump_version()
+    writer.bump_version()
+    assert [[statement for statement, _params in calls] for calls in driver.transactions] == [[BUMP_GRAPH_VERSION]]
+
+
+def test_vote_actions_without_last_seen_are_not_touched():
+    client = _FakeClient()
+    client.driver.nodes.update({"camara:vote_event:1", "camara:person:1"})
+    rows = [({"id": "camara:vote_action:1", "voteEventId": "camara:vote_event:1", "personId": "camara:person:1"}, "raw-1")]
+    Neo4jWriter(client=client).upsert_vote_actions(rows)
+    client.driver.transactions.clear()
+
+    Neo4jWriter(client=client).upsert_vote_actions(rows)
+    assert client.driver.transactions == []
+
+
+def test_dimension_nodes_are_merged_once_per_run():
+    writer = Neo4jWriter(client=_FakeClient(), batch_size=2)
+    expense = {"personId": "camara:person:1", "organizationId": "camara:org:gol", "supplierName": "GOL"}
+    rows = [({**expense, "id": f"camara:expense:{i}"}, "raw-1") for i in range(5)]
+    rows.append(({**expense, "id": "camara:expense:5", "organizationId": "camara:org:azul", "supplierName": "AZUL"}, "raw-1"))
+
+    writer.upsert_expenses(rows)
+
+    ensured = [
+        [row["id"] for row in params["rows"]]
+        for calls in writer.client.driver.transactions
+        for statement, params in calls
+        if statement == ENSURE_DIMENSIONS.format(label="Organization")
+    ]
+    assert ensured == [["camara:org:gol"], ["camara:org:azul"]]
+    assert (writer.stats["dimension_merges"], writer.stats["dimension_merges_avoided"]) == (2, 4)
+
+
+def test_vote_action_written_before_its_event_is_linked_on_the_next_run():
+    client = _FakeClient()
+    client.driver.nodes.add("camara:person:1")
+    rows = [({"id": "camara:vote_action:1", "voteEventId": "camara:vote_event:1", "personId": "camara:person:1"}, "raw-1")]
+
+    writer = Neo4jWriter(client=client)
+    writer.upsert_vote_actions(rows)
+    assert "camara:vote_action:1" not in client.driver.hashes
+    assert writer.stats["unlinked"] == 1
+
+    # Same run, event arrives, action repeats: it is rewritten (and linked), not skipped as unchanged.
+    writer.upsert_vote_event({"id": "camara:vote_event:1"}, "raw-2")
+    client.driver.transactions.clear()
+    writer.upsert_vote_actions(rows)
+    [calls] = client.driver.transactions
+    assert calls[0][0] == UPSERT_VOTE_ACTIONS
+    assert "camara:vote_action:1" in client.driver.hashes
+    # action (unlinked), event, action again
+    assert (writer.stats["written"], writer.stats["unchanged"]) == (3, 0)
+
+    client.driver.transactions.clear()
+    Neo4jWriter(client=client).upsert_vote_actions(rows)
+    assert client.driver.transactions == []
+
+
+def test_vote_event_hash_waits_for_its_bill():
+    client = _FakeClient()
+    event = {"id": "camara:vote_event:1", "billId": "camara:bill:7"}
+
+    Neo4jWriter(client=client).upsert_vote_event(event, "raw-1")
+    assert "camara:vote_event:1" not in client.driver.hashes
+
+    Neo4jWriter(client=client).upsert_bill({"id": "camara:bill:7"}, "raw-2")
+    client.driver.transactions.clear()
+    Neo4jWriter(client=client).upsert_vote_event(event, "raw-1")
+    assert client.driver.transactions[0][0][0] == UPSERT_VOTE_EVENTS
+    assert "camara:vote_event:1" in client.driver.hashes
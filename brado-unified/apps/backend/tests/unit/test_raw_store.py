@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, delete, func, inspect, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.raw_store import (
+    RawArchive,
+    RawStore,
+    ValidatorStore,
+    archive_cold_blobs,
+    expected_items,
+    inclusion_proof,
+    iter_batch_export,
+    read_archived_body,
+    rebuild_missing_merkle_nodes,
+    rebuild_payload_stats,
+    verify_batches,
+)
+from app.db.sql import Base
+from app.db.sql.models import BatchItem, HttpValidator, IngestionBatch, MerkleNode, RawBlob, RawBlobArchive, RawPayload, RawPayloadStat
+from app.proof.merkle import build_merkle, verify_proof
+
+
+@pytest.fixture()
+def session_factory(monkeypatch, tmp_path):
+    monkeypatch.setenv("ANCHOR_PROVIDER", "postgres")
+    engine = create_engine(f"sqlite:///{tmp_path / 'raw_store.db'}", future=True)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, future=True)
+    yield factory
+    engine.dispose()
+
+
+def test_not_modified_payload_references_previous_raw(session_factory):
+    validators = ValidatorStore(session_factory=session_factory)
+    params = {"itens": 100, "pagina": 1}
+    body = {"dados": [{"id": 1}], "links": []}
+
+    with session_factory() as session:
+        store = RawStore(session, validators=validators)
+        batch = store.start_batch("camara", "camara:deputados:current")
+        validators.capture(validators.key("/deputados", params), '"v1"', None)
+        first = store.add_payload(batch=batch, endpoint="/deputados", params=params, primary_key=None, http_status=200, body_json=body)
+        store.finish_batch(batch)
+        session.commit()
+        first_id = first.id
+
+    key = validators.key("/deputados", params)
+    assert ValidatorStore(session_factory=session_factory).conditional_headers(key) == {"If-None-Match": '"v1"'}
+
+    with session_factory() as session:
+        store = RawStore(session, validators=ValidatorStore(session_factory=session_factory))
+        batch = store.start_batch("camara", "camara:deputados:current")
+        again = store.add_payload(batch=batch, endpoint="/deputados", params=params, primary_key=None, http_status=304, body_json=body)
+        assert "blob" not in inspect(again).dict  # referencing the previous version does not load its body
+        store.finish_batch(batch)
+        session.commit()
+
+        assert again.id == first_id
+        assert session.scalar(select(func.count(RawPayload.id))) == 1
+        items = session.execute(select(BatchItem).where(BatchItem.batch_id == batch.id)).scalars().all()
+        assert [(item.raw_payload_id, item.leaf_index) for item in items] == [(first_id, 0)]
+        assert session.get(HttpValidator, key).raw_payload_id == first_id
+        assert store.get_body(first_id) == body
+
+
+def test_held_validators_are_written_only_once_released(session_factory):
+    validators = ValidatorStore(session_factory=session_factory)
+
+    with session_factory() as session:
+        store = RawStore(session, validators=validators)
+        batch = store.start_batch("camara", "camara:bills")
+        store.hold_validators()
+        for endpoint in ("/proposicoes/1", "/proposicoes/2"):
+            validators.capture(validators.key(endpoint, {}), f'"{endpoint}"', None)
+            store.add_payload(batch=batch, endpoint=endpoint, params={}, primary_key=None, http_status=200, body_json={"dados": {}})
+        first, second = store.take_held_validators()
+        store.release_validators([first])
+        store.hold_validators(False)
+        store.flush()
+
+        assert session.get(HttpValidator, validators.key("/proposicoes/1", {})) is not None
+        assert session.get(HttpValidator, validators.key("/proposicoes/2", {})) is None
+        assert second["raw_payload_id"]
+
+
+def test_add_payloads_bulk_inserts_with_sequential_leaves(session_factory):
+    validators = ValidatorStore(session_factory=session_factory)
+    with session_factory() as session:
+        store = RawStore(session, validators=validators)
+        batch = store.start_batch("camara", "camara:deputados:current")
+        first = store.add_payload(
+            batch=batch, endpoint="/deputados", params={"pagina": 1}, primary_key=None, http_status=200, body_json={"dados": []}
+        )
+        validators.capture(validators.key("/deputados/2", {}), '"e2"', None)
+        ids = store.add_payloads(
+            batch=batch,
+            payloads=[
+                {
+                    "endpoint": f"/deputados/{dep_id}",
+                    "params": {},
+                    "primary_key": str(dep_id),
+                    "http_status": 200,
+                    "body_json": {"dados": {"id": dep_id}},
+                }
+                for dep_id in range(1, 6)
+            ],
+        )
+        session.commit()
+
+        # A second store on the same batch seeds its counter from the table once.
+        resumed = RawStore(session)
+        last = resumed.add_payload(
+            batch=batch, endpoint="/deputados", params={"pagina": 2}, primary_key=None, http_status=200, body_json={}
+        )
+        resumed.finish_batch(batch)
+        session.commit()
+
+        leaves = dict(session.execute(select(BatchItem.raw_payload_id, BatchItem.leaf_index).where(BatchItem.batch_id == batch.id)).all())
+        assert [leaves[raw_id] for raw_id in [first.id, *ids, last.id]] == list(range(7))
+        assert batch.item_count == 7
+        assert session.get(HttpValidator, validators.key("/deputados/2", {})).raw_payload_id == ids[1]
+
+
+def test_streamed_merkle_root_matches_build_merkle_across_resumes(session_factory):
+    with session_factory() as session:
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:expenses:2024")
+        for dep_id in range(5):
+            store.add_payload(
+                batch=batch,
+                endpoint=f"/deputados/{dep_id}/despesas",
+                params={},
+                primary_key=str(dep_id),
+                http_status=200,
+                body_json={"id": dep_id},
+            )
+        store.flush()
+        session.commit()
+        batch_id = batch.id
+
+    with session_factory() as session:
+        # A new process resumes from the persisted frontier.
+        batch = session.get(IngestionBatch, batch_id)
+        store = RawStore(session)
+        store.add_payloads(
+            batch=batch,
+            payloads=[
+                {"endpoint": "/despesas", "params": {"pagina": page}, "http_status": 200, "body_json": {"pagina": page}}
+                for page in range(6)
+            ],
+        )
+        store.add_payload(
+            batch=batch, endpoint="/despesas", params={"pagina": 99}, primary_key=None, http_status=200, body_json={"pagina": 99}
+        )
+        store.flush()
+        # Batches written before the frontier existed are replayed from batch_items.
+        batch.merkle_frontier = None
+        RawStore(session).finish_batch(batch)
+        session.commit()
+
+        leaves = session.scalars(select(BatchItem.item_sha256).where(BatchItem.batch_id == batch_id).order_by(BatchItem.leaf_index)).all()
+        assert len(leaves) == batch.item_count == 12
+        assert batch.merkle_root == build_merkle(leaves)["root"]
+
+
+def test_inclusion_proofs_and_export_verify_against_root(session_factory):
+    with session_factory() as session:
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:votes:2024-01-01")
+        raw_ids = store.add_payloads(
+            batch=batch,
+            payloads=[{"endpoint": f"/votacoes/{vote}", "http_status": 200, "body_json": {"id": vote}} for vote in range(11)],
+        )
+        store.finish_batch(batch)
+        session.commit()
+
+        proof = inclusion_proof(session, batch.id, raw_ids[10])
+        assert proof["leaf_index"] == 10 and proof["merkle_root"] == batch.merkle_root
+        assert verify_proof(proof["item_sha256"], proof["proof"], batch.merkle_root)
+
+        header, *items = iter_batch_export(session, batch.id, block_size=4)
+        assert header["leaf_count"] == 11
+        assert [item["payload"] for item in items] == [{"id": vote} for vote in range(11)]
+        assert all(verify_proof(item["sha256"], item["proof"], header["merkle_root"]) for item in items)
+        with pytest.raises(ValueError):
+            inclusion_proof(session, batch.id, "missing")
+
+
+def test_batches_without_stored_nodes_are_rebuilt_from_their_leaves(session_factory):
+    with session_factory() as session:
+        store = RawStore(session)
+        batches = []
+        for year in (2023, 2024):
+            batch = store.start_batch("camara", f"camara:votes:{year}-01-01")
+            store.add_payloads(
+                batch=batch,
+                payloads=[{"endpoint": f"/votacoes/{year}{vote}", "http_status": 200, "body_json": {"id": vote}} for vote in range(7)],
+            )
+            store.finish_batch(batch)
+            batches.append(batch)
+        stored = session.scalar(select(func.count()).select_from(MerkleNode).where(MerkleNode.batch_id == batches[0].id))
+        # As for batches finished before merkle_nodes existed.
+        session.execute(delete(MerkleNode))
+        session.commit()
+
+        header, *items = iter_batch_export(session, batches[0].id, block_size=2)
+        assert all(verify_proof(item["sha256"], item["proof"], header["merkle_root"]) for item in items)
+        assert session.scalar(select(func.count()).select_from(MerkleNode).where(MerkleNode.batch_id == batches[0].id)) == stored
+
+        assert rebuild_missing_merkle_nodes(session) == {"batches": 1, "nodes": stored, "failed": {}}
+        assert rebuild_missing_merkle_nodes(session)["batches"] == 0
+
+        session.execute(delete(MerkleNode).where(MerkleNode.batch_id == batches[1].id))
+        session.execute(
+            update(BatchItem).where(BatchItem.batch_id == batches[1].id, BatchItem.leaf_index == 0).values(item_sha256="0" * 64)
+        )
+        session.commit()
+        with pytest.raises(ValueError, match="do not reproduce merkle_root"):
+            next(iter_batch_export(session, batches[1].id))
+
+
+def test_verify_batches_reports_tampered_leaves(session_factory, tmp_path):
+    with session_factory() as session:
+        store = RawStore(session)
+        batch_ids = []
+        for year in (2023, 2024):
+            batch = store.start_batch("camara", f"camara:expenses:{year}")
+            store.add_payloads(
+                batch=batch,
+                payloads=[
+                    {
+                        "endpoint": "/despesas",
+                        "params": {"ano": year, "pagina": page},
+                        "http_status": 200,
+                        "body_json": {"ano": year, "pagina": page},
+                    }
+                    for page in range(9)
+                ],
+            )
+            store.finish_batch(batch)
+            batch_ids.append(batch.id)
+        session.commit()
+
+    database_url = f"sqlite:///{tmp_path / 'raw_store.db'}"
+    with session_factory() as session:
+        clean = verify_batches(session, database_url, workers=2, use_threads=True)
+        assert (clean["status"], clean["batches"], clean["leaves"]) == ("ok", 2, 18)
+        # 9 leaves split into aligned subtrees (full shards plus a lifted tail) give the same roots.
+        for shard_leaves in (1, 2, 4, 8, 16):
+            sharded = verify_batches(session, database_url, workers=3, use_threads=True, shard_leaves=shard_leaves)
+            assert (sharded["status"], sharded["leaves"]) == ("ok", 18)
+
+        session.execute(update(BatchItem).where(BatchItem.batch_id == batch_ids[1], BatchItem.leaf_index == 4).values(item_sha256="0" * 64))
+        session.commit()
+        report = verify_batches(session, database_url, workers=2, use_threads=True)
+        assert report["status"] == "mismatch"
+        assert [(item["batch_id"], item["problems"]) for item in report["mismatches"]] == [(batch_ids[1], ["merkle_root mismatch"])]
+        sharded = verify_batches(session, database_url, workers=3, use_threads=True, shard_leaves=4)
+        assert [(item["batch_id"], item["problems"]) for item in sharded["mismatches"]] == [(batch_ids[1], ["merkle_root mismatch"])]
+
+        session.execute(delete(BatchItem).where(BatchItem.batch_id == batch_ids[0], BatchItem.leaf_index == 3))
+        session.commit()
+        gapped = verify_batches(session, database_url, workers=3, use_threads=True, shard_leaves=4)
+        assert {item["batch_id"]: item["problems"] for item in gapped["mismatches"]}[batch_ids[0]] == [
+            "leaf_index sequence broken at 3",
+            "item_count 9 != 8 stored leaves",
+        ]
+
+        assert verify_batches(session, database_url, since=date(2999, 1, 1), use_threads=True)["batches"] == 0
+
+
+def test_identical_bodies_share_one_blob(session_factory):
+    body = {"dados": [{"id": 1, "nome": "Fulano"}], "links": []}
+    with session_factory() as session:
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:deputados:current")
+        first = store.add_payload(
+            batch=batch, endpoint="/deputados", params={"pagina": 1}, primary_key=None, http_status=200, body_json=body
+        )
+        store.finish_batch(batch)
+        session.commit()
+        first_id = first.id
+
+    with session_factory() as session:
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:deputados:current")
+        [second_id] = store.add_payloads(
+            batch=batch,
+            payloads=[{"endpoint": "/deputados", "params": {"pagina": 1}, "primary_key": None, "http_status": 200, "body_json": body}],
+        )
+        store.finish_batch(batch)
+        session.commit()
+
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(RawBlob)) == 1
+        assert session.scalar(select(func.count(RawPayload.id))) == 2
+        assert session.get(RawPayload, first_id).body_json == body
+        assert session.get(RawPayload, second_id).body_json == body
+
+
+def test_archive_moves_cold_bodies_and_reads_them_back(session_factory, tmp_path):
+    archive = RawArchive(tmp_path / "archive")
+    cold_body = {"dados": [{"id": 10, "voto": "Sim"}]}
+    hot_body = {"dados": [{"id": 11, "voto": "Não"}]}
+    with session_factory() as session:
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:votes:2019-01-01")
+        cold = store.add_payload(
+            batch=batch, endpoint="/votacoes/10/votos", params={}, primary_key="10", http_status=200, body_json=cold_body
+        )
+        hot = store.add_payload(
+            batch=batch, endpoint="/votacoes/11/votos", params={}, primary_key="11", http_status=200, body_json=hot_body
+        )
+        store.flush()
+        session.execute(update(RawPayload).where(RawPayload.id == cold.id).values(fetched_at=datetime(2019, 1, 1, tzinfo=UTC)))
+        store.finish_batch(batch)
+        session.commit()
+        cold_id, hot_id = cold.id, hot.id
+
+    with session_factory() as session:
+        result = archive_cold_blobs(session, older_than_days=30, archive=archive)
+        assert result["archived"] == 1
+        assert all(path.endswith((".ndjson.zst", ".ndjson.gz")) for path in result["files"])
+
+    with session_factory() as session:
+        blobs = dict(session.execute(select(RawBlob.sha256, RawBlob.body_json)).all())
+        cold_sha = session.get(RawPayload, cold_id).sha256
+        assert blobs[cold_sha] is None
+        assert session.get(RawBlobArchive, cold_sha) is not None
+        # Transparent read path: model attribute and RawStore both fall back to the archive.
+        assert read_archived_body(session, cold_sha, archive) == cold_body
+        assert session.get(RawPayload, hot_id).body_json == hot_body
+
+    with session_factory() as session:
+        # Re-ingesting the same content re-warms the hot copy.
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:votes:2019-01-01")
+        store.add_payload(batch=batch, endpoint="/votacoes/10/votos", params={}, primary_key="10", http_status=200, body_json=cold_body)
+        store.finish_batch(batch)
+        session.commit()
+        assert session.get(RawBlob, cold_sha).body_json == cold_body
+
+
+def test_payload_stats_are_tallied_at_write_time_and_rebuildable(session_factory, tmp_path):
+    def expense_page(dep_id, year, count, status=200):
+        return {
+            "endpoint": f"/deputados/{dep_id}/despesas",
+            "params": {"ano": year, "pagina": 1},
+            "primary_key": f"{dep_id}:{year}:1",
+            "http_status": status,
+            "body_json": {"dados": [{"codDocumento": f"{dep_id}-{year}-{i}"} for i in range(count)]},
+        }
+
+    with session_factory() as session:
+        store = RawStore(session)
+        batch = store.start_batch("camara", "camara:expenses:2019")
+        store.add_payloads(batch=batch, payloads=[expense_page(1, 2019, 3), expense_page(2, 2019, 2), expense_page(1, 2020, 4)])
+        store.add_payload(batch=batch, **{**expense_page(3, 2019, 0, status=500), "params": {"ano": 2019, "pagina": 1}})
+        store.add_payload(
+            batch=batch, endpoint="/deputados", params={"pagina": 1}, primary_key=None, http_status=200, body_json={"dados": [{}]}
+        )
+        store.finish_batch(batch)
+        session.commit()
+
+        assert expected_items(session, "/deputados/{id}/despesas") == {2019: 5, 2020: 4}
+        assert expected_items(session, "/deputados/{id}/despesas", http_status=500) == {2019: 0}
+        before = sorted((s.domain, s.year, s.endpoint, s.http_status, s.payloads, s.items) for s in session.scalars(select(RawPayloadStat)))
+
+        assert rebuild_payload_stats(session, archive=RawArchive(tmp_path)) == {"payloads": 5, "groups": 4}
+        session.commit()
+        after = sorted((s.domain, s.year, s.endpoint, s.http_status, s.payloads, s.items) for s in session.scalars(select(RawPayloadStat)))
+        assert after == before
+        assert ("despesas", 2019, "/deputados/{id}/despesas", 200, 2, 5) in after
@@ -1,10 +1,48 @@
+import threading
+from datetime import UTC, date, datetime, timedelta
+
 import pytest
 
 pytest.importorskip("sqlalchemy")
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.sql import Base
+from app.db.sql.models import IngestionBatch, RawBlob, RawPayload, RawPayloadStat
+from app.graph.neo4j.stats import BY_YEAR, COUNTERS, GRAPH_STATS, UNIQUE_LABELS
 from app.reconcile.service import ReconcileService
 
 
+@pytest.fixture()
+def db_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reconcile.db'}", future=True)
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda _conn, _cursor, statement, *_args: statements.append(statement))
+    with sessionmaker(bind=engine, autoflush=False, future=True)() as session:
+        session.statements = statements
+        yield session
+    engine.dispose()
+
+
+def _add_raw(session, raw_id, batch, body, *, endpoint="/proposicoes/1", status=200, fetched_at=None):
+    session.merge(RawBlob(sha256=raw_id.ljust(64, "0"), body_json=body))
+    session.add(
+        RawPayload(
+            id=raw_id,
+            source="camara",
+            endpoint=endpoint,
+            params_json={},
+            http_status=status,
+            url=f"https://example.test{endpoint}",
+            sha256=raw_id.ljust(64, "0"),
+            batch_id=batch.id,
+            fetched_at=fetched_at or datetime(2024, 6, 1, tzinfo=UTC),
+        )
+    )
+
+
 class _FakeResult:
     def __init__(self, single_row=None, rows=None):
         self._single_row = single_row
@@ -16,6 +54,15 @@ class _FakeResult:
     def __iter__(self):
         return iter(self._rows)
 
+    def consume(self):
+        return None
+
+
+def _stats_row(**counters):
+    row = {counter: 0 for counter in COUNTERS} | {name: [] for name in BY_YEAR}
+    row |= {f"duplicates_{label.lower()}": 0 for label in UNIQUE_LABELS}
+    return row | counters
+
 
 class _FakeNeoSession:
     def __init__(self, handler):
@@ -49,11 +96,6 @@ class _FakeGraph:
         self.client = type("Client", (), {"driver": _FakeDriver(handler)})()
 
 
-class _FakeRawPayload:
-    def __init__(self, body_json):
-        self.body_json = body_json
-
-
 class _FakeDbSession:
     def __init__(self, raw_map=None):
         self.raw_map = raw_map or {}
@@ -62,10 +104,10 @@ class _FakeDbSession:
         return self.raw_map.get(key)
 
 
-def _build_service(graph_handler, raw_map=None):
+def _build_service(graph_handler, session=None):
     svc = ReconcileService.__new__(ReconcileService)
     svc.graph = _FakeGraph(graph_handler)
-    svc.session = _FakeDbSession(raw_map)
+    svc.session = session or _FakeDbSession()
     return svc
 
 
@@ -80,7 +122,7 @@ def test_estimate_api_total_with_last_link():
     assert ReconcileService._estimate_api_total(body, itens_per_page=1) == 37
 
 
-def test_audit_samples_detects_match_and_mismatch():
+def test_audit_samples_detects_match_and_mismatch(db_session):
     def handler(query, params):
         if "MATCH (n:Bill)" in query:
             return _FakeResult(
@@ -111,17 +153,49 @@ def test_audit_samples_detects_match_and_mismatch():
             )
         return _FakeResult(single_row={"c": 0})
 
-    raw_map = {
-        "raw_ok": _FakeRawPayload({"dados": {"id": 1, "ano": 2024, "numero": 100}}),
-        "raw_bad": _FakeRawPayload({"dados": {"id": 2, "ano": 2024, "numero": 999}}),
-    }
+    batch = IngestionBatch(source="camara", batch_type="camara:bills:2024", status="success")
+    db_session.add(batch)
+    db_session.flush()
+    _add_raw(db_session, "raw_ok", batch, {"dados": {"id": 1, "ano": 2024, "numero": 100}})
+    _add_raw(db_session, "raw_bad", batch, {"dados": {"id": 2, "ano": 2024, "numero": 999}})
+    db_session.flush()
+    db_session.statements.clear()
 
-    svc = _build_service(handler, raw_map)
+    svc = _build_service(handler, db_session)
     audit = svc._audit_samples("Bill", limit=50)
 
     assert audit["checked"] == 2
     assert audit["mismatches"] == 1
     assert audit["ok"] is False
+    # Both sampled payloads come from one IN-list query.
+    assert len(db_session.statements) == 1
+
+
+def test_temporal_and_nominal_checks_are_single_aggregates(db_session):
+    in_range = IngestionBatch(source="camara", batch_type="camara:votes:2024", range_start=date(2024, 1, 1), range_end=date(2024, 12, 31))
+    stale = IngestionBatch(source="camara", batch_type="camara:votes:2023", range_start=date(2023, 1, 1), range_end=date(2023, 1, 31))
+    open_ended = IngestionBatch(source="camara", batch_type="camara:deputados")
+    db_session.add_all([in_range, stale, open_ended])
+    db_session.flush()
+    votos = "/votacoes/1/votos"
+    _add_raw(db_session, "v1", in_range, {"dados": []}, endpoint=votos)
+    _add_raw(
+        db_session, "v2", in_range, {"dados": [], "metadata": {"error_type": "nominal_votes_not_available"}}, endpoint=votos, status=404
+    )
+    _add_raw(db_session, "v3", stale, {"dados": []}, endpoint=votos, status=500)
+    _add_raw(db_session, "v4", stale, {"dados": []}, endpoint=votos, status=200)
+    _add_raw(db_session, "d1", open_ended, {"dados": []}, endpoint="/deputados")
+    db_session.flush()
+    db_session.statements.clear()
+
+    svc = _build_service(lambda _query, _params: _FakeResult(), db_session)
+    [temporal] = svc._temporal_checks()
+    nominal = svc._nominal_vote_availability_check()
+
+    assert (temporal["counts_actual"], temporal["ok"]) == (1, False)
+    assert (nominal["counts_actual"], nominal["unavailable_count"]) == (1, 1)
+    # One grouped query for the temporal check; the nominal check adds one aggregate plus one archived-rows lookup.
+    assert len(db_session.statements) == 3
 
 
 def test_reconcile_gate_fails_with_coverage_gap():
@@ -155,6 +229,7 @@ def test_reconcile_gate_fails_with_coverage_gap():
     result = svc.reconcile_all()
     assert result.status == "failed"
     assert result.report["coverage_gap"]
+    assert {"coverage", "temporal", "audit_bill"} <= set(result.report["timings_ms"])
 
 
 def test_expense_people_coverage_gate_enabled_only_for_full_backfill():
@@ -205,3 +280,107 @@ def test_documented_expense_gap_check_fails_when_batch_notes_has_gaps():
     assert check["name"] == "coverage_expenses_documented_gaps"
     assert check["ok"] is False
     assert check["counts_actual"] == 1
+
+
+def test_check_query_plans_flags_label_scans():
+    class _Summary:
+        def __init__(self, plan):
+            self.plan = plan
+
+    def handler(query, _params):
+        assert query.startswith("EXPLAIN ")
+        if "MATCH (b:Bill)" in query:
+            leaf = {"operatorType": "NodeByLabelScan@neo4j", "children": []}
+        else:
+            leaf = {"operatorType": "NodeIndexSeek@neo4j", "children": []}
+        plan = {"operatorType": "ProduceResults@neo4j", "children": [{"operatorType": "EagerAggregation@neo4j", "children": [leaf]}]}
+        return type("R", (), {"consume": lambda self: _Summary(plan)})()
+
+    report = _build_service(handler).check_query_plans()
+
+    assert report["status"] == "label_scan"
+    assert report["label_scans"] == {"graph_stats": ["NodeByLabelScan"]}
+
+
+def test_incremental_reconcile_rechecks_only_touched_domains_and_years(db_session):
+    graph_threads = set()
+
+    def handler(query, _params):
+        graph_threads.add(threading.current_thread().name)
+        return _FakeResult(single_row=_stats_row(persons=1) if query == GRAPH_STATS else None, rows=[])
+
+    class _Client:
+        def __init__(self):
+            self.gets = []
+
+        def paginated(self, _endpoint, _params=None):
+            yield 200, {"dados": [{"id": 1}]}, {}
+
+        def get(self, endpoint, params=None):
+            self.gets.append((endpoint, params["ano"]))
+            return 200, {"dados": [], "links": []}
+
+    svc = _build_service(handler, db_session)
+    svc.client = _Client()
+    svc.max_workers = 4
+
+    full = svc.reconcile_all()
+    assert full.report["mode"] == "full"
+    assert any(name.startswith("reconcile") for name in graph_threads)
+    assert {"coverage", "coverage_bills_2018", "uniqueness_bill", "temporal"} <= set(full.report["timings_ms"])
+
+    batch = IngestionBatch(
+        source="camara",
+        batch_type="camara:votes:2024-01-01",
+        range_start=date(2024, 1, 1),
+        range_end=date(2024, 12, 31),
+        status="success",
+        finished_at=datetime.now(UTC) + timedelta(minutes=1),
+    )
+    db_session.add(batch)
+    db_session.flush()
+    svc.client.gets.clear()
+
+    result = svc.reconcile_all(incremental=True)
+
+    report = result.report
+    assert (report["mode"], report["scope"], report["previous_report_id"]) == ("incremental", {"votes": [2024]}, full.report["id"])
+    assert svc.client.gets == [("/votacoes", 2024)]
+    by_key = {(check["name"], check.get("year")): check for check in report["checks"]}
+    assert "carried_from" not in by_key[("coverage_votes_year", 2024)]
+    assert "carried_from" not in by_key[("uniqueness_voteevent", None)]
+    assert by_key[("coverage_votes_year", 2023)]["carried_from"] == full.report["id"]
+    # Graph-wide checks come from the cached stats and are never carried forward.
+    assert "carried_from" not in by_key[("uniqueness_bill", None)]
+    assert "carried_from" not in by_key[("integrity_expense_has_person", None)]
+    assert len(report["checks"]) == len(full.report["checks"])
+    assert report["carried_forward"] > 0
+
+
+def test_stored_payloads_without_payload_stats_fail_reconcile(db_session):
+    class _Client:
+        def paginated(self, _endpoint, _params=None):
+            yield 200, {"dados": []}, {}
+
+        def get(self, _endpoint, params=None):
+            return 200, {"dados": [], "links": []}
+
+    batch = IngestionBatch(source="camara", batch_type="camara:expenses:2024", range_start=date(2024, 1, 1), range_end=date(2024, 12, 31))
+    db_session.add(batch)
+    db_session.flush()
+    _add_raw(db_session, "e1", batch, {"dados": [{"codDocumento": 1}]}, endpoint="/deputados/1/despesas")
+    db_session.flush()
+    svc = _build_service(lambda query, _params: _FakeResult(single_row=_stats_row() if query == GRAPH_STATS else None), db_session)
+    svc.client = _Client()
+    svc.max_workers = 2
+
+    # As right after upgrading past 010_raw_payload_stats, before raw:rebuild-stats.
+    report = svc.reconcile_all().report
+    [check] = [check for check in report["checks"] if check["name"] == "raw_payload_stats_present"]
+    assert (check["ok"], check["counts_actual"]) == (False, 0)
+    assert "raw_payload_stats_present" in {issue["check_name"] for issue in report["issues"]}
+
+    db_session.add(RawPayloadStat(domain="despesas", year=2024, endpoint="/deputados/{id}/despesas", http_status=200, payloads=1, items=1))
+    db_session.flush()
+    report = svc.reconcile_all().report
+    assert next(check for check in report["checks"] if check["name"] == "raw_payload_stats_present")["ok"]